@@ -0,0 +1,247 @@
+# ==============================
+# ADMISSION CONTROL: Rate limits + concurrency caps para sa mabibigat na routes
+# ==============================
+# Ang ZIP download, batch delete, delete-all, "show all" search at card upload
+# ay kayang ubusin ang lahat ng workers kung ilang clients lang ang sabay na
+# mag-spam. Bawat mabigat na route ay may policy:
+#
+#   client=10/60      token bucket per client IP (10 requests per 60s, burst 10)
+#   route=60/60       token bucket para sa buong route (lahat ng clients)
+#   concurrency=2     ilan ang sabay na tumatakbo per worker
+#   queue=4           ilan ang puwedeng maghintay ng slot; lampas = 503 agad
+#   wait=10           max seconds na paghihintay sa queue bago 503
+#
+# Mabilis ang pagtanggi: 429 (rate) o 503 (busy) na may Retry-After.
+#
+# Configurable per policy via env, e.g.:
+#   ADMISSION_ZIP_DOWNLOAD="client=3/60,route=20/60,concurrency=1,queue=2,wait=15"
+#   ADMISSION_ENABLED=0   (patayin lahat)
+#
+# NOTE: Per-process ang buckets at slots (gaya ng metrics). Sa N gunicorn
+# workers, ang route/concurrency limits ay N beses ng nakasulat dito.
+import os
+import time
+import threading
+from functools import wraps
+from collections import OrderedDict
+
+from flask import jsonify, request
+
+import metrics
+import logging_setup
+
+log = logging_setup.get_logger('admission')
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") not in ("0", "false", "no")
+# Ilang reverse proxy ang nasa harap (para sa X-Forwarded-For). 0 = remote_addr lang.
+TRUSTED_PROXIES = int(os.getenv("ADMISSION_TRUSTED_PROXIES", "0"))
+MAX_TRACKED_CLIENTS = int(os.getenv("ADMISSION_MAX_TRACKED_CLIENTS", "10000"))
+
+ADMISSION_DECISIONS = metrics.REGISTRY.counter(
+    'admission_decisions_total', 'Admission decisions per policy (admitted, rate_limited, queue_full, queue_timeout).',
+    ('policy', 'result'))
+ADMISSION_ACTIVE = metrics.REGISTRY.gauge(
+    'admission_active_requests', 'Requests holding a concurrency slot per policy.', ('policy', 'pid'))
+ADMISSION_QUEUED = metrics.REGISTRY.gauge(
+    'admission_queued_requests', 'Requests waiting for a concurrency slot per policy.', ('policy', 'pid'))
+ADMISSION_WAIT = metrics.REGISTRY.histogram(
+    'admission_queue_wait_seconds', 'Time spent waiting for a concurrency slot.', ('policy',))
+
+
+class Rejected(Exception):
+    def __init__(self, status, result, reason, retry_after):
+        super().__init__(reason)
+        self.status = status
+        self.result = result
+        self.reason = reason
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+# ==============================
+# TOKEN BUCKETS
+# ==============================
+class TokenBucket:
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate, burst):
+        self.rate = rate          # tokens per second
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now):
+        """(True, 0) kung may token; (False, seconds bago magkaroon) kung wala."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, 0.0
+        return False, (1 - self.tokens) / self.rate
+
+
+class BucketSet:
+    """Isang bucket per key (client IP). LRU-bounded para hindi lumaki ang memory."""
+
+    def __init__(self, rate, burst, max_keys=MAX_TRACKED_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    def take(self, key, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take(now)
+
+
+def parse_rate(spec):
+    """'10/60' -> (rate per second, burst). '10/60:20' -> burst 20."""
+    amount, _, rest = spec.partition('/')
+    period, _, burst = rest.partition(':')
+    amount, period = float(amount), float(period or 1)
+    return amount / period, float(burst or amount)
+
+
+# ==============================
+# POLICY
+# ==============================
+class Policy:
+    def __init__(self, name, client=None, route=None, concurrency=None, queue=0, wait=10.0, when=None):
+        self.name = name
+        self.when = when
+        self._lock = threading.Lock()
+
+        overrides = _parse_overrides(os.getenv(f"ADMISSION_{name.upper()}", ""))
+        client = overrides.get('client', client)
+        route = overrides.get('route', route)
+        concurrency = overrides.get('concurrency', concurrency)
+        self.queue = int(overrides.get('queue', queue))
+        self.wait = float(overrides.get('wait', wait))
+
+        self.client_buckets = BucketSet(*parse_rate(client)) if client else None
+        self.route_bucket = TokenBucket(*parse_rate(route)) if route else None
+        self.concurrency = int(concurrency) if concurrency else None
+        self._slots = threading.BoundedSemaphore(self.concurrency) if self.concurrency else None
+        self._waiting = 0
+
+    def check_rate(self, client_key):
+        now = time.monotonic()
+        with self._lock:
+            if self.client_buckets is not None:
+                ok, retry_after = self.client_buckets.take(client_key, now)
+                if not ok:
+                    raise Rejected(429, 'rate_limited', 'Too many requests from this client', retry_after)
+            if self.route_bucket is not None:
+                ok, retry_after = self.route_bucket.take(now)
+                if not ok:
+                    raise Rejected(429, 'rate_limited', 'Too many requests for this endpoint', retry_after)
+
+    def acquire(self):
+        """Kunin ang concurrency slot (o maghintay sa bounded queue). False kung walang cap."""
+        if self._slots is None:
+            return False
+        if self._slots.acquire(blocking=False):
+            return True
+
+        with self._lock:
+            if self._waiting >= self.queue:
+                raise Rejected(503, 'queue_full', 'Server busy, queue full', self.wait)
+            self._waiting += 1
+        pid = os.getpid()
+        ADMISSION_QUEUED.inc(policy=self.name, pid=pid)
+        start = time.perf_counter()
+        try:
+            acquired = self._slots.acquire(timeout=self.wait)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+            ADMISSION_QUEUED.dec(policy=self.name, pid=pid)
+            ADMISSION_WAIT.observe(time.perf_counter() - start, policy=self.name)
+        if not acquired:
+            raise Rejected(503, 'queue_timeout', 'Server busy, timed out waiting in queue', self.wait)
+        return True
+
+    def release(self):
+        self._slots.release()
+
+
+def _parse_overrides(raw):
+    overrides = {}
+    for part in raw.split(','):
+        key, sep, value = part.strip().partition('=')
+        if sep:
+            overrides[key.strip()] = value.strip()
+    return overrides
+
+
+def client_key():
+    if TRUSTED_PROXIES and request.access_route:
+        route = request.access_route
+        return route[-min(TRUSTED_PROXIES, len(route))]
+    return request.remote_addr or 'unknown'
+
+
+def _reject(policy, error):
+    ADMISSION_DECISIONS.inc(policy=policy.name, result=error.result)
+    log.warning(f"Rejected {request.method} {request.path} ({policy.name}): {error.reason}")
+    response = jsonify({'success': False, 'message': error.reason, 'retry_after': error.retry_after})
+    response.status_code = error.status
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+# ==============================
+# DECORATOR
+# ==============================
+def admission_policy(name, **kwargs):
+    """
+    @app.route('/api/storage/download-zip', methods=['POST'])
+    @admission_policy('zip_download', client='3/60', concurrency=2, queue=4)
+    def download_zip(): ...
+
+    when=callable -> policy lang kapag True (e.g. "show all" search lang).
+    streaming=True -> hawak ang concurrency slot hanggang matapos ang streamed
+    response (SSE), hindi lang hanggang mag-return ang view.
+    """
+    streaming = kwargs.pop('streaming', False)
+    policy = Policy(name, **kwargs)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kw):
+            if not ADMISSION_ENABLED or (policy.when is not None and not policy.when()):
+                return view(*args, **kw)
+            try:
+                policy.check_rate(client_key())
+                holding = policy.acquire()
+            except Rejected as e:
+                return _reject(policy, e)
+
+            ADMISSION_DECISIONS.inc(policy=name, result='admitted')
+            if not holding:
+                return view(*args, **kw)
+            pid = os.getpid()
+            ADMISSION_ACTIVE.inc(policy=name, pid=pid)
+
+            def release():
+                ADMISSION_ACTIVE.dec(policy=name, pid=pid)
+                policy.release()
+
+            try:
+                response = view(*args, **kw)
+            except BaseException:
+                release()
+                raise
+            if streaming and getattr(response, 'is_streamed', False):
+                response.call_on_close(release)
+            else:
+                release()
+            return response
+        wrapper._admission_policy = policy
+        return wrapper
+    return decorator
@@ -1,17 +1,46 @@
 # ==============================
 # Imports & Environment Setup
 # ==============================
+import startup     # una sa lahat: dito nagsisimula ang startup timer
 import os
 import re
-import io         # ADDED: Needed for image stream handling
+import time
 import base64     # ADDED: Needed for base64 decoding
 import tempfile   # ADDED: Needed for temporary file handling
-import zipfile    # ADDED: Needed for ZIP file creation (For Celphone Download)
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, redirect, url_for, jsonify, send_file # ADDED: send_file
+from flask import Flask, render_template, request, redirect, url_for, jsonify, send_file, Response # ADDED: send_file
 from dotenv import load_dotenv
-from supabase import create_client, Client
-from werkzeug.utils import secure_filename # ADDED: FIX FOR UPLOAD ERROR
+import metrics
+import health
+import logging_setup
+import http_cache
+from http_cache import cache_policy
+import signature_registry
+from signature_registry import SignatureRegistry
+from signature_store import SignatureStore
+import card_cache
+from card_cache import CardCache
+import delta_sync
+import events
+import shared_cache
+import singleflight
+import upserts
+import member_search
+import direct_upload
+import image_proxy
+import bootstrap
+import member_facets
+import member_query
+import profiling
+from admission import admission_policy
+
+# Bihirang gamitin = import sa unang gamit lang (cold start).
+# signature_normalize / photo_ingest -> PIL (signature / photo saves lang);
+# archive_cache -> zipfile + thread pool (ZIP download lang)
+signature_normalize = startup.lazy_module('signature_normalize')
+photo_ingest = startup.lazy_module('photo_ingest')
+archive_cache = startup.lazy_module('archive_cache')
+startup.mark('imports')
 
 # ==============================
 # Load Environment Variables
@@ -22,6 +51,7 @@ SUPAB_SERVICE_KEY = os.getenv("SUPAB_SERVICE_KEY")
 
 if not SUPAB_URL or not SUPAB_SERVICE_KEY:
     raise ValueError("SUPAB_URL and SUPAB_SERVICE_KEY must be set in .env file")
+startup.mark('config')
 
 # ==============================
 # Flask App Initialization
@@ -29,67 +59,137 @@ if not SUPAB_URL or not SUPAB_SERVICE_KEY:
 app = Flask(__name__)
 # Optional: Secret key for session management if needed later
 app.secret_key = os.getenv("SECRET_KEY", "supersecretkey") 
+# Request body limits (413 kapag lumampas). Ang file parts ng multipart ay
+# naka-stream sa temp file ng Werkzeug; ang MAX_FORM_MEMORY_SIZE ay para sa
+# text fields (hal. lumang inline base64 photo / pirma / QR). Default = kapareho
+# ng MAX_CONTENT_LENGTH: ang lumang add_member form ay nagpapadala pa rin ng
+# base64 photo bilang text field, kaya hindi ito dapat mas mababa.
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv("MAX_CONTENT_LENGTH", str(16 * 1024 * 1024)))
+app.config['MAX_FORM_MEMORY_SIZE'] = int(os.getenv("MAX_FORM_MEMORY_SIZE", str(app.config['MAX_CONTENT_LENGTH'])))
+
+# Structured JSON logs + X-Request-ID (see logging_setup.py)
+logging_setup.init_app(app)
+log = logging_setup.get_logger('app')
+# High-volume paths (card save, batch delete, zip) - sinusunod ang LOG_SAMPLE_RATE
+hot_log = logging_setup.get_logger('app.hot', sampled=True)
+
+# Per-route latency / status / payload size (see /metrics)
+metrics.init_app(app)
+
+# gzip/brotli + ETag/304 + Cache-Control per route (see @cache_policy)
+http_cache.init_app(app)
+
+# Opt-in sampling profiler (X-Profile header / PROFILE_SAMPLE_RATE; see profiling.py)
+profiling.init_app(app)
+startup.mark('app_init')
 
 # ==============================
 # 🆕 STANDALONE SIGNATURE PAD SETUP
 # ==============================
 SIGN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'signatures')
-os.makedirs(SIGN_DIR, exist_ok=True)
-
-def last_signature_path():
-    files = [f for f in os.listdir(SIGN_DIR) if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
-    if not files:
-        return None
-    files.sort(key=lambda x: os.path.getmtime(os.path.join(SIGN_DIR, x)), reverse=True)
-    return os.path.join(SIGN_DIR, files[0])
+# SQLite-indexed: unique ids, O(1) latest, retention (see signature_store.py)
+# Lazy: ang folder + index ay ginagawa sa unang upload/delete, hindi sa boot
+signature_store = startup.LazyProxy(lambda: SignatureStore(SIGN_DIR), 'signature_store')
 
 # ==============================
 # Supabase Client
 # ==============================
-supabase: Client = create_client(SUPAB_URL, SUPAB_SERVICE_KEY)
+# Naka-wrap para ma-time bawat db.from_(...) at storage call (see metrics.py)
+# Lazy: ang `supabase` package (~0.5s import) at ang client ay ginagawa sa unang
+# query. Per worker ito kahit --preload, kaya hindi nagsha-share ng sockets.
+def _create_supabase():
+    from supabase import create_client
+    return metrics.instrument_client(create_client(SUPAB_URL, SUPAB_SERVICE_KEY))
+
+supabase = startup.LazyProxy(_create_supabase, 'supabase_client')
 
 def get_db():
     return supabase
 
+# ==============================
+# SHARED CACHE NAMESPACES (cross-worker; see shared_cache.py)
+# ==============================
+# bump() sa write routes = invalidate sa lahat ng workers
+settings_cache = shared_cache.namespace('settings', ttl=300)
+layout_cache = shared_cache.namespace('layouts', ttl=300)
+member_cache = shared_cache.namespace('members', ttl=60)
+storage_cache = shared_cache.namespace('storage', ttl=60)
+forms_cache = shared_cache.namespace('admin_forms', ttl=300)
+maintenance_cache = shared_cache.namespace('maintenance', ttl=600)
+
+def cards_changed():
+    """
+    Card files / card columns lang ang nagbago (hindi ang member fields).
+    Hindi bina-bump ang member_cache: ang cached keys na may card columns ay
+    may kasamang card_version() sa key, kaya ang lumang entries ay hindi na
+    mababasa at mag-e-expire na lang (maliit na, walang photos).
+    """
+    storage_cache.bump()
+
+def card_version():
+    return storage_cache.version()
+
+# Cached name index + lazy signature images (see signature_registry.py)
+signature_cache = shared_cache.namespace('signatures', ttl=30)
+signatures = SignatureRegistry(get_db, cache=signature_cache)
+
+# Resized card/photo images mula sa disk LRU (see image_proxy.py)
+images = image_proxy.ImageProxy(lambda: supabase.storage)
+
+# Prebuilt ZIPs para sa batch downloads (see archive_cache.py)
+archives = startup.LazyProxy(lambda: archive_cache.ArchiveCache(lambda: supabase.storage, get_db), 'archive_cache')
+
+def card_files_changed(*paths):
+    """Na-save / na-delete ang card files sa storage -> tanggalin sa disk caches."""
+    images.invalidate(*paths)
+    try:
+        archives.invalidate(*paths)
+    except Exception as e:
+        log.warning(f"Archive invalidation failed: {e}")
+
+# Fingerprint-based card freshness + LRU/budget eviction (see card_cache.py)
+cards = CardCache(get_db, on_removed=lambda paths: card_files_changed(*paths))
+startup.mark('services')
+
 # ================================
-# UTILITY: VB6 STYLE REPLACE (Sanitization)
+# UTILITY: SIGNATURE NORMALIZATION (On ingest)
 # ================================
-def vb6_replace(text):
+def normalize_signature(data_url):
     """
-    Simple sanitization to remove SQL injection chars or HTML symbols.
-    NOTE: This is basic. Ideally, use parameterized queries or ORM sanitization.
+    Trim + scale + palette quantize ng pirma bago i-save (see signature_normalize.py).
+    Kung pumalya, ang original ang isi-save para hindi masira ang request.
     """
-    if not text:
-        return ""
-    return (
-        text.strip()
-            .replace("'", "")
-            .replace('"', "")
-            .replace(";", "")
-            .replace("--", "")
-            .replace("<", "") # Added basic HTML tag prevention
-            .replace(">", "")
-    )
+    if not data_url:
+        return data_url
+    try:
+        return signature_normalize.normalize_data_url(data_url)
+    except Exception as e:
+        log.warning(f"Signature normalization skipped: {e}")
+        return data_url
 
 # ==============================
 # 🆕 CAPTION CHANGER UTILITY
 # ==============================
+def _load_system_settings():
+    db = get_db()
+    response = db.from_('system_settings').select('*').eq('id',1).execute()
+    if response.data:
+        return response.data[0]
+    else:
+        # Default fallback kung walang laman
+        return {
+            'main_title': 'UGBROMOVE App',
+            'sub_title': 'Placeholder',
+            'company_name': 'No Company',
+            'logo_url': ''
+        }
+
 def get_system_settings():
+    # Tinatawag sa BAWAT template render (context processor) - kaya naka-shared cache
     try:
-        db = get_db()
-        response = db.from_('system_settings').select('*').eq('id',1).execute()
-        if response.data:
-            return response.data[0]
-        else:
-            # Default fallback kung walang laman
-            return {
-                'main_title': 'UGBROMOVE App',
-                'sub_title': 'Placeholder',
-                'company_name': 'No Company',
-                'logo_url': ''
-            }
+        return settings_cache.get_or_set('system_settings', _load_system_settings)
     except Exception as e:
-        print(f"Error getting settings: {e}")
+        log.error(f"Error getting settings: {e}")
         return {}
 
 # 🆕 CONTEXT PROCESSOR: Makes 'settings' available in ALL HTML templates
@@ -98,32 +198,37 @@ def inject_settings():
     return dict(settings=get_system_settings())
 
 # ==============================
-# 🆕 AUTO CLEANUP SCANNER (13H INTERVAL + STORAGE CLEANUP)
+# 🆕 AUTO CLEANUP SCANNER (13H INTERVAL + STORAGE BUDGET)
 # ==============================
 @app.before_request
 def cleanup_old_cards_scanner():
     """
     Automatic Scanner.
     1. Check if 13 hours passed since last cleanup.
-    2. If Yes: Delete cards older than 24 hours.
-    3. Also: Delete associated files from Supabase Storage.
-    4. Update last cleanup time.
+    2. If Yes: Evict least-recently-used cards kung lampas na sa CARD_STORAGE_BUDGET_MB.
+       (Dati: lahat ng > 24 hours, kahit walang nagbago sa member.)
+    3. Update last cleanup time.
+    Ang stale cards ay hindi na dito binubura - sa add_member / save_layout na (see card_cache.py).
     """
     # Huwag scan sa static files (css, js) para mabilis
     if request.path.startswith('/static'): return
+    # Huwag din sa health checks / metrics scrape - hindi dapat mag-dagdag ng load sa Supabase
+    if request.path.startswith(('/health', '/metrics')): return
 
     try:
         db = get_db()
 
         # 1. KUNIN ANG LAST CLEANUP TIME SA 'idgenerate' TABLE
         # FIXED: Sort by id desc to ensure we hit controller row
-        response = db.from_('idgenerate').select('last_card_cleanup').order('id', desc=True).limit(1).execute()
-        
-        last_cleanup = None
-        if response.data and response.data[0]:
-            raw_time = response.data[0].get('last_card_cleanup')
-            if raw_time:
-                last_cleanup = datetime.fromisoformat(raw_time)
+        # Naka-shared cache: dati ay isang query ito sa BAWAT request
+        def load_last_cleanup():
+            response = db.from_('idgenerate').select('last_card_cleanup').order('id', desc=True).limit(1).execute()
+            if response.data and response.data[0]:
+                return response.data[0].get('last_card_cleanup')
+            return None
+
+        raw_time = maintenance_cache.get_or_set('last_card_cleanup', load_last_cleanup)
+        last_cleanup = datetime.fromisoformat(raw_time) if raw_time else None
 
         # 2. CALCULATE INTERVAL
         now = datetime.now()
@@ -136,64 +241,32 @@ def cleanup_old_cards_scanner():
         if time_since_last_cleanup < timedelta(hours=13):
             return # Fresh pa ang scan, huwag gumulo sa system.
 
-        print(f">>> SCANNING OLD CARDS... Last scan was {time_since_last_cleanup} ago.")
-
-        # 4. DELETE LOGIC: DELETE ANG > 24 HOURS + STORAGE CLEANUP
-        # Yung '2 hours pa lang' ay hindi dito mapupunta.
-        expiry_time = now - timedelta(hours=24)
-
-        # === NEW: SELECT MUNA PARA MAKUHA NG FILENAME (RULE #6) ===
-        to_delete_response = db.from_('members').select('id', 'generated_card_image') \
-            .lt('generated_at', expiry_time.isoformat()).execute()
-        
-        if to_delete_response.data:
-            ids_to_clear = []
-            files_to_remove = []
-            
-            for record in to_delete_response.data:
-                url = record.get('generated_card_image')
-                db_id = record.get('id')
-                
-                if db_id: ids_to_clear.append(db_id)
-                
-                # EXTRACT FILENAME FROM URL
-                # URL Example: https://xyz.supabase.co/storage/v1/object/public/public_id_cards/guardian_ids/123_2023.png
-                if url:
-                    try:
-                        if '/public_id_cards/' in url:
-                            filename = url.split(f'/public_id_cards/')[-1]
-                            if filename: files_to_remove.append(filename)
-                    except:
-                        pass
+        log.info(f">>> SCANNING CARD STORAGE... Last scan was {time_since_last_cleanup} ago.")
 
-            # === ACTION 1: DELETE FROM SUPABASE STORAGE ===
-            if files_to_remove:
-                try:
-                    # Automatic deletion mula sa Storage
-                    supabase.storage.from_('public_id_cards').remove(files_to_remove)
-                    print(f">>> DELETED {len(files_to_remove)} FILES FROM STORAGE.")
-                except Exception as e:
-                    print(f">>> Error deleting from storage: {e}")
+        # 4. EVICTION: LRU hanggang bumaba sa storage budget
+        evicted = cards.evict_over_budget(supabase)
+        if evicted:
+            log.info(f">>> EVICTED {evicted} LEAST-RECENTLY-USED CARDS (Database + Storage).")
+            cards_changed()
 
-            # === ACTION 2: UPDATE DATABASE (NULLIFY) ===
-            if ids_to_clear:
-                db.from_('members').update({
-                    'generated_card_image': None,
-                    'generated_at': None
-                }).in_('id', ids_to_clear).execute()
-                
-                print(f">>> CLEANED UP {len(ids_to_clear)} EXPIRED CARDS (Database + Storage).")
+        # 5. DELTA SYNC: Purge ng lumang tombstones (ang mas lumang cursor ay magfu-full sync)
+        try:
+            delta_sync.purge_tombstones(db)
+        except Exception as e:
+            log.warning(f">>> Tombstone purge failed: {e}")
 
-        # 5. UPDATE LAST CLEANUP TIME (Reset Clock ng Scanner)
+        # 6. UPDATE LAST CLEANUP TIME (Reset Clock ng Scanner)
         db.from_('idgenerate').update({'last_card_cleanup': now.isoformat()}).execute()
+        maintenance_cache.set('last_card_cleanup', now.isoformat())
 
     except Exception as e:
-        print(f"Auto-cleanup error: {e}")
+        log.error(f"Auto-cleanup error: {e}")
 
 # ==============================
 # Routes - Home & Navigation
 # ==============================
 @app.route('/')
+@cache_policy()
 def home():
     return render_template('placeholder_members.html')
 
@@ -202,6 +275,7 @@ def members_redirect():
     return redirect(url_for('home'))
 
 @app.route('/about')
+@cache_policy()
 def about():
     return render_template('about.html')
 
@@ -293,6 +367,7 @@ def admin_login_route():
 # ==============================
 # NAGBAGO: Binago ko ang route sa '/signature.html' para tumugma sa tawag ng window.open sa admin.html
 @app.route('/signature.html')
+@cache_policy()
 def officer_signature():
     """Tawagin ito kapag napili ang 'Officer Signature' sa Admin Forms."""
     return render_template('signature.html')
@@ -301,6 +376,7 @@ def officer_signature():
 # NEW: ROUTE FOR MODE OF PAYMENT
 # ==============================
 @app.route('/mode_payment.html')
+@cache_policy()
 def mode_payment():
     """Tawagin ito kapag napili ang 'Mode of Payment' sa Admin Forms."""
     return render_template('mode_payment.html')
@@ -309,6 +385,7 @@ def mode_payment():
 # NEW: ROUTE FOR CAPTION CHANGER
 # ==============================
 @app.route('/caption_changer.html')
+@cache_policy()
 def caption_changer():
     """Tawagin ito kapag napili ang 'Caption Changer' sa Admin Forms."""
     return render_template('caption_changer.html')
@@ -317,53 +394,39 @@ def caption_changer():
 # SEARCH ROUTES
 # ==============================
 @app.route("/search")
+@cache_policy()
 def search_form():
     return render_template("search_form.html")
 
 @app.route("/search-members", methods=["POST"])
+# "Show all" (walang search term) lang ang mabigat: buong members table
+@admission_policy('search_all', client='20/60', concurrency=4, queue=8, wait=5,
+                  when=lambda: not (request.form.get('search_term') or '').strip())
 def search_members():
     """
     Handles form submission (Server-side rendering).
     Highlights search terms.
+    UPDATED: Ranked full-text + trigram search sa database (see member_search.py),
+    parameterized na (wala nang string-built .or_() filter), paginated.
     """
     try:
         db = get_db()
-        raw_search = request.form.get("search_term")
+        search_term = (request.form.get("search_term") or "").strip()
         search_type = request.form.get("search_type") or "all"
-        search_term = vb6_replace(raw_search).lower()
+        if search_type not in member_search.FIELDS:
+            search_type = "all"
+        page = max(1, request.form.get("page", 1, type=int) or 1)
 
         # Default Logic: Show all if empty
         if not search_term:
-            response = db.from_('members').select('*').order('name', desc=False).execute()
-            members = response.data if response.data else []
-            return render_template("search_results.html", members=members, total_results=len(members))
+            members = _all_members()
+            return render_template("search_results.html", members=members, search_term="",
+                                   search_type=search_type, total_results=len(members),
+                                   page=1, page_size=len(members) or 1)
 
-        # Construct Supabase OR Logic
-        or_logic = ""
-        
-        if search_type == "all":
-            or_logic = ",".join([
-                f"name.ilike.%{search_term}%",
-                f"chapter.ilike.%{search_term}%",
-                f"designation.ilike.%{search_term}%",
-                f"contact_no.ilike.%{search_term}%",
-                f"blood_type.ilike.%{search_term}%",
-                f"home_address.ilike.%{search_term}%",
-                f"pseudo_name.ilike.%{search_term}%"
-            ])
-        elif search_type == "name":
-            or_logic = f"name.ilike.%{search_term}%,pseudo_name.ilike.%{search_term}%"
-        elif search_type == "chapter":
-            or_logic = f"chapter.ilike.%{search_term}%"
-        elif search_type == "designation":
-            or_logic = f"designation.ilike.%{search_term}%"
-        elif search_type == "contact":
-            or_logic = f"contact_no.ilike.%{search_term}%"
-        else:
-            or_logic = f"name.ilike.%{search_term}%"
-
-        response = db.from_('members').select('*').or_(or_logic).order('name', desc=False).execute()
-        members = response.data if response.data else []
+        page_size = member_search.SEARCH_PAGE_SIZE
+        members, total = member_search.search(db, search_term, search_type,
+                                              limit=page_size, offset=(page - 1) * page_size)
 
         # Highlight Function (Regex)
         def highlight(text):
@@ -386,86 +449,311 @@ def search_members():
             members=members,
             search_term=search_term,
             search_type=search_type,
-            total_results=len(members)
+            total_results=total,
+            page=page,
+            page_size=page_size
         )
 
     except Exception as e:
-        print(f"Search Error: {e}")
+        log.error(f"Search Error: {e}")
         return f"Error loading members: {str(e)}", 500
 
 # ==============================
 # MEMBER API ROUTES
 # ==============================
+def _members_data_version():
+    """
+    Mura na 'version' ng members table: bilang ng rows + pinaka-latest na updated_at.
+    Isang row lang ang kinukuha kaya mabilis ang 304 kahit malaki ang table.
+    """
+    def load_version():
+        response = get_db().from_('members').select('updated_at', count='exact') \
+            .order('updated_at', desc=True).limit(1).execute()
+        latest = response.data[0].get('updated_at') if response.data else ''
+        return f"{response.count}:{latest}"
+    # Maikling TTL para makita rin ang edits na hindi dumaan sa app (Supabase dashboard)
+    return member_cache.get_or_set('data_version', load_version, ttl=15)
+
+def _all_members():
+    """
+    Members list, naka-key sa data version para laging tugma sa ETag.
+    Projected (CACHED_COLUMNS): walang photo_data / signature / qr_code, dahil
+    ang buong rows (base64 photos) ay ilang MB bawat kopya sa shared cache.
+    """
+    def load():
+        response = get_db().from_('members').select(', '.join(member_query.CACHED_COLUMNS)) \
+            .order('name', desc=False).execute()
+        return response.data or []
+    return member_cache.get_or_set(f"all:{_members_data_version()}", load)
+
+def _with_media(rows, date=None):
+    """
+    Idagdag ang MEDIA_COLUMNS (photo / pirma / QR) sa cached projected rows.
+    Diretso sa DB, hindi kina-cache. date= -> isang query by date imbes na by ids.
+    """
+    if not rows:
+        return rows
+    query = get_db().from_('members').select(', '.join(('id',) + member_query.MEDIA_COLUMNS))
+    query = query.eq('date_of_membership', date) if date else query.in_('id', [row['id'] for row in rows])
+    media = {item['id']: item for item in query.execute().data or []}
+    return [dict(row, **media.get(row['id'], {})) for row in rows]
+
 @app.route('/api/members/json', methods=["GET"])
+@cache_policy(private=True, version=_members_data_version)
 def api_members_json():
     """Returns raw list of members for DataTables or JS Grid."""
     try:
-        db = get_db()
-        response = db.from_('members').select('*').order('name', desc=False).execute()
-        return jsonify(response.data)
+        return jsonify(_all_members())
     except Exception as e:
-        print(f"API Error: {e}")
+        log.error(f"API Error: {e}")
         return jsonify([]), 500
 
+# ============================================================
+# REALTIME EVENTS: Server-Sent Events (see events.py + static/js/live_events.js)
+# ============================================================
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+# Pagkatapos nito, isinasara ang stream; ang EventSource ay kusang magre-reconnect
+# (with Last-Event-ID). Laging hanggang kalahati lang ng gunicorn timeout.
+EVENTS_STREAM_MAX_SECONDS = float(os.getenv("EVENTS_STREAM_MAX_SECONDS", "55"))
+# Max na sabay na bukas na streams per worker. Bawat stream ay may hawak na
+# worker thread, kaya dapat mas mababa ito sa `gunicorn --threads N` para may
+# matira sa ibang requests. Lampas = 503 + Retry-After (override:
+# ADMISSION_EVENTS="concurrency=...").
+EVENTS_MAX_STREAMS = int(os.getenv("EVENTS_MAX_STREAMS", "4"))
+# Mga worker class na kayang mag-hold ng stream nang hindi inuubos ang worker
+STREAMING_WORKER_CLASSES = ('gthread', 'gevent', 'eventlet')
+
+def events_enabled():
+    """
+    EVENTS_ENABLED=1/0 para pilitin; default (auto) = bukas lang kapag ang
+    gunicorn ay gthread na may threads > EVENTS_MAX_STREAMS, o gevent/eventlet
+    (see gunicorn.conf.py). Sync worker / hindi kilalang server = sarado.
+    """
+    flag = os.getenv("EVENTS_ENABLED", "auto").lower()
+    if flag != 'auto':
+        return flag in ('1', 'true', 'yes', 'on')
+    worker = os.getenv("SERVER_WORKER_CLASS", "").lower()
+    if not any(name in worker for name in STREAMING_WORKER_CLASSES):
+        return False
+    return 'gthread' not in worker or int(os.getenv("SERVER_THREADS", "1")) > EVENTS_MAX_STREAMS
+
+def events_stream_seconds():
+    # gunicorn default timeout = 30s kung walang SERVER_TIMEOUT
+    return min(EVENTS_STREAM_MAX_SECONDS, float(os.getenv("SERVER_TIMEOUT", "30")) / 2)
+
+@app.context_processor
+def inject_live_events():
+    return dict(live_events=events_enabled())
+
+@app.route('/api/events', methods=["GET"])
+@cache_policy(no_store=True)
+@admission_policy('events', concurrency=EVENTS_MAX_STREAMS, queue=0, wait=30, streaming=True)
+def api_events():
+    """
+    SSE stream ng member.* / card.* / layout.saved events.
+    Naka-disable (404) kapag sync worker - see events_enabled() / gunicorn.conf.py.
+    """
+    if not events_enabled():
+        return jsonify({'success': False, 'message': 'Live events are disabled on this server'}), 404
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+
+    def stream():
+        # Dito ang subscribe (hindi sa view): kung hindi ma-iterate ang
+        # generator, walang subscription na maiiwan sa broker
+        subscription = events.broker.subscribe()
+        try:
+            backlog = events.broker.replay_after(last_event_id) if last_event_id else []
+            yield "retry: 3000\n\n"
+            if backlog is None:
+                # Wala na sa replay buffer (o ibang worker) - sabihan ang client na mag-DeltaSync
+                yield "event: resync\ndata: {}\n\n"
+            sent = set()
+            for event in backlog or []:
+                sent.add(event['id'])
+                yield events.format_sse(event)
+
+            deadline = time.monotonic() + events_stream_seconds()
+            while time.monotonic() < deadline:
+                event = subscription.get(timeout=EVENTS_HEARTBEAT_SECONDS)
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    while subscription.get(timeout=0) is not None:
+                        pass
+                    yield "event: resync\ndata: {}\n\n"
+                    continue
+                if event is None:
+                    yield ": ping\n\n"
+                elif event['id'] not in sent:
+                    yield events.format_sse(event)
+        finally:
+            subscription.close()
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-store', 'X-Accel-Buffering': 'no'})
+
+# ============================================================
+# DELTA SYNC: Changes since cursor (see delta_sync.py + static/js/delta_sync.js)
+# ============================================================
+# Single-flight: ang mga phone na sabay nag-sync mula sa parehong cursor ay iisang
+# query. Walang window: ang sync pagkatapos ng add_member / update_member ay
+# laging bagong query (hindi resulta ng read na nauna sa write)
+sync_flights = singleflight.Group('sync', window=0)
+
+def _sync_page(resource, since, limit):
+    result = delta_sync.changes(get_db(), resource, since, limit)
+    if resource == 'officers':
+        # Gaya ng /get_officers_list: URL ng pirma imbes na base64
+        result['changes'] = [
+            dict(row, man_signature=signatures.image_url(signature_registry.OFFICER, row['id']))
+            for row in result['changes']
+        ]
+    return result
+
+@app.route('/api/sync/<resource>', methods=["GET"])
+@cache_policy(private=True)
+def api_sync(resource):
+    """
+    GET /api/sync/members?since=<cursor>&limit=500
+    Returns changed rows + deleted ids + bagong cursor. Walang 'since' = full snapshot.
+    """
+    since = request.args.get('since')
+    limit = request.args.get('limit', delta_sync.SYNC_PAGE_SIZE)
+    try:
+        result = sync_flights.do((resource, since, str(limit)), lambda: _sync_page(resource, since, limit))
+    except delta_sync.SyncError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        log.error(f"Sync Error ({resource}): {e}")
+        return jsonify({'error': str(e)}), 500
+    return jsonify(result)
+
+@app.route('/api/members/media', methods=["GET"])
+@cache_policy(private=True)
+def api_members_media():
+    """
+    GET /api/members/media?ids=1,2,3 -> [{id, photo_data, signature, qr_code}]
+    Para sa mga napiling row galing sa /api/sync/members (walang media ang sync).
+    """
+    ids = [member_id for member_id in request.args.get('ids', '').split(',') if member_id.strip()]
+    try:
+        return jsonify(delta_sync.media(get_db(), ids))
+    except delta_sync.SyncError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        log.error(f"Member Media Error: {e}")
+        return jsonify({'error': str(e)}), 500
+
 # ============================================================
 # 🆕 ULTIMATE FIX ROUTE: SIGNATURETABLE API (COMBO BOX)
 # ============================================================
 @app.route('/api/signaturetable/json', methods=["GET"])
+@cache_policy()
 def api_signaturetable_json():
     """
     Fetches list from SIGNATURETABLE for the Combo Box.
-    Robust: Uses '*' select to handle any case of 'name' column.
+    UPDATED: Galing na sa cached name index (id, name lang - walang pirma).
     """
     try:
-        db = get_db()
-        
-        # SELECT '*' para makuha kahit anong case ang column (name, Name, NAME)
-        response = db.from_('signaturetable').select('*').execute()
-        
-        data = []
-        if response.data:
-            for item in response.data:
-                # Kunin yung value kahit 'name', 'Name', o 'NAME' ang key
-                val = item.get("name") or item.get("Name") or item.get("NAME")
-                
-                if val:
-                    # Standardize key to 'name' (lowercase) for the frontend
-                    data.append({"name": val})
-                    
+        data = [{"name": item["name"]} for item in signatures.company_signatures() if item.get("name")]
         return jsonify(data)
     except Exception as e:
         # I-print sa Python Terminal para makita natin yung tunay na error
-        print(f"ERROR fetching signature table: {e}")
+        log.error(f"ERROR fetching signature table: {e}")
         # Ibalik ang error message sa response para alam natin
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/members/search', methods=["GET"])
+@cache_policy(private=True, max_age=30)
 def api_members_search():
-    """Live search endpoint (Name OR Pseudo Name OR Chapter)."""
+    """Live search endpoint (Name OR Pseudo Name OR Chapter), ranked."""
     try:
         db = get_db()
         q = request.args.get('q', '').strip()
         if not q: return jsonify([])
-        or_logic = f"name.ilike.%{q}%,pseudo_name.ilike.%{q}%,chapter.ilike.%{q}%"
-        response = db.from_('members').select('*').or_(or_logic).limit(20).execute()
-        return jsonify(response.data)
+        def load():
+            # Projected lang ang naka-cache; ang photo / pirma / QR (pang-populate ng
+            # form sa autocomplete) ay idinadagdag pagkatapos, hindi kina-cache
+            members, _ = member_search.search(db, q, 'quick', columns=member_query.CACHED_COLUMNS, limit=20)
+            return members
+        members = member_cache.get_or_set(f"search:{card_version()}:{q.lower()}", load, ttl=30)
+        return jsonify(_with_media(members))
     except Exception as e:
-        print(f"Autocomplete Error: {e}")
+        log.error(f"Autocomplete Error: {e}")
         return jsonify([]), 500
 
+def _members_by_date(selected_date, columns=member_query.LIST_COLUMNS):
+    """Projected rows lang ang kina-cache (walang MEDIA_COLUMNS; see _with_media)."""
+    db = get_db()
+    def load():
+        return db.from_('members').select(', '.join(columns)).eq('date_of_membership', selected_date) \
+            .order('name', desc=False).execute().data or []
+    return member_cache.get_or_set(f"date:{card_version()}:{','.join(columns)}:{selected_date}", load)
+
 @app.route('/api/members/by-date', methods=["GET"])
+@cache_policy(private=True)
 def api_members_by_date():
     """Filter members by date_of_membership."""
     try:
-        db = get_db()
         selected_date = request.args.get('date')
         if not selected_date: return jsonify([]), 400
-        response = db.from_('members').select('*').eq('date_of_membership', selected_date).order('name', desc=False).execute()
-        return jsonify(response.data)
+        # Card merge / PDF ay kailangan ng photo + pirma + QR
+        members = _members_by_date(selected_date, member_query.CACHED_COLUMNS)
+        return jsonify(_with_media(members, date=selected_date))
     except Exception as e:
-        print(f"Filter Date Error: {e}")
+        log.error(f"Filter Date Error: {e}")
         return jsonify([]), 500
 
+@app.route('/api/members/query', methods=["GET"])
+@cache_policy(private=True)
+def api_members_query():
+    """
+    GET /api/members/query?date_from=...&date_to=...&chapter=...&card=missing
+                          &columns=id,name&sort=date&limit=100&cursor=...
+    -> {members, cursor, has_more} (see member_query.py)
+    """
+    try:
+        filters = member_query.parse_filters(request.args)
+        columns = member_query.parse_columns(request.args.get('columns'))
+        sort = request.args.get('sort', 'id')
+        cursor = request.args.get('cursor') or None
+        limit = request.args.get('limit', member_query.QUERY_PAGE_SIZE)
+        # Naka-normalize ang filters (sorted), kaya pareho ang key ng parehong query
+        result = member_cache.get_or_set(
+            f"query:{card_version()}:{sort}:{limit}:{cursor}:{','.join(columns)}:{filters}",
+            lambda: member_query.query_members(get_db(), filters, columns, sort, cursor, limit))
+        return jsonify(result)
+    except member_query.QueryError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        log.error(f"Member Query Error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+# ==============================
+# MEMBER FACETS (see member_facets.py)
+# ==============================
+# Per-worker snapshot; nagsi-sync (delta lang) kapag na-bump ang member_cache
+# o nagbago ang cards (card generated / missing facet)
+member_snapshot = member_facets.MemberSnapshot(
+    get_db, version=lambda: (member_cache.version(), card_version()))
+
+@app.route('/api/members/facets', methods=["GET"])
+@cache_policy(private=True)
+def api_members_facets():
+    """
+    GET /api/members/facets?facets=chapter,blood_type&membership_type=Regular
+    -> {total, facets: {chapter: [{value, count}, ...]}, cursor, age_seconds}
+    Ang ibang query params na facet name ay filter (blangko = walang value).
+    """
+    names = [name for name in request.args.get('facets', '').split(',') if name]
+    filters = {name: value for name, value in request.args.items() if name in member_facets.FACETS}
+    try:
+        return jsonify(member_snapshot.facets(names, filters))
+    except member_facets.FacetError as e:
+        return jsonify({'success': False, 'message': str(e), 'facets': list(member_facets.FACETS)}), 400
+    except Exception as e:
+        log.error(f"Facets Error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 # ==============================
 # MEMBER CRUD LOGIC
 # ==============================
@@ -501,7 +789,7 @@ def add_member():
                 'emergency_person_name': request.form.get('emergency_person_name'),
                 'emergency_contact_no': request.form.get('emergency_contact_no'),
                 'emergency_address': request.form.get('emergency_address'), 
-                'photo_data': request.form.get('photo_data'), 
+                'photo_data': _ingest_member_photo(), 
                 'qr_code': request.form.get('qr_code'),
                 'signature': request.form.get('signature'),
                 'pseudo_name': request.form.get('pseudo_name'),
@@ -510,32 +798,101 @@ def add_member():
             }
 
             if form_action == 'update' and record_id:
-                new_photo = request.form.get('photo_data')
+                new_photo = form_data.get('photo_data')
                 if not new_photo or new_photo == "data,": 
                     form_data.pop('photo_data', None)
                 db.from_('members').update(form_data).eq('id', record_id).execute()
-                print(f"Updated Member ID: {record_id}")
+                log.info(f"Updated Member ID: {record_id}")
+                # Burahin lang ang card kung may nagbago sa fields na nasa card
+                try:
+                    if cards.invalidate_member(record_id, supabase):
+                        log.info(f"Card invalidated for Member ID: {record_id}")
+                        events.publish('card.deleted', member_ids=[record_id], reason='member_changed')
+                except Exception as e:
+                    log.warning(f"Card invalidation failed for Member ID {record_id}: {e}")
+                member_cache.bump()
+                cards_changed()
+                events.publish('member.updated', id=record_id)
             else:
-                db.from_('members').insert(form_data).execute()
-                print("Added New Member")
+                inserted = db.from_('members').insert(form_data).execute()
+                log.info("Added New Member")
+                new_id = inserted.data[0].get('id') if inserted.data else None
+                member_cache.bump()
+                events.publish('member.created', id=new_id)
             
             return redirect(url_for('home'))
 
         except Exception as e:
-            print(f"Add/Update Error: {e}")
+            log.error(f"Add/Update Error: {e}")
             return f"Error processing member: {str(e)}", 500
 
     return render_template('add_member_form.html')
 
+# ==============================
+# PHOTO INGEST (see photo_ingest.py)
+# ==============================
+def _ingest_member_photo():
+    """
+    photo_data ng add/update form:
+      - multipart file (photo_file) -> downscale -> Storage URL
+      - inline data URL (lumang client / walang DataTransfer) -> downscale,
+        inline pa rin (skip kung maliit na, para hindi paulit-ulit na re-encode)
+      - URL / wala -> as is
+    Kapag pumalya ang ingest, ang original ang sine-save (hindi haharangin ang member save).
+    """
+    upload = request.files.get('photo_file')
+    photo_data = request.form.get('photo_data')
+    try:
+        if upload and upload.filename:
+            photo = photo_ingest.ingest(upload.read())
+            url = photo_ingest.store(supabase.storage, photo)
+            log.info(f"Photo ingested: {photo.source_bytes} -> {len(photo.data)} bytes")
+            return url
+        raw = photo_ingest.decode_data_url(photo_data)
+        if raw and len(raw) > photo_ingest.PHOTO_TARGET_BYTES:
+            photo = photo_ingest.ingest(raw)
+            log.info(f"Inline photo ingested: {photo.source_bytes} -> {len(photo.data)} bytes")
+            return photo_ingest.to_data_url(photo)
+    except Exception as e:
+        log.warning(f"Photo ingest failed, saving original: {e}")
+    return photo_data
+
+@app.route('/api/photos', methods=['POST'])
+@admission_policy('photo_ingest', client='30/60:10', concurrency=2, queue=8, wait=15)
+def upload_photo():
+    """POST multipart `photo` (binary) -> {url, bytes, width, height, source_bytes}."""
+    upload = request.files.get('photo')
+    if not upload:
+        return jsonify({'success': False, 'message': "Missing 'photo' file"}), 400
+    try:
+        photo = photo_ingest.ingest(upload.read())
+        url = photo_ingest.store(supabase.storage, photo)
+    except photo_ingest.PhotoError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        log.error(f">>> Photo upload error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+    return jsonify({'success': True, 'url': url, 'bytes': len(photo.data), 'width': photo.width,
+                    'height': photo.height, 'source_bytes': photo.source_bytes})
+
+@app.errorhandler(413)
+def request_too_large(e):
+    limit = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    if request.path.startswith('/api/') or request.is_json:
+        return jsonify({'success': False, 'message': f"Upload too large (max {limit} MB)"}), 413
+    return f"Upload too large (max {limit} MB)", 413
+
 @app.route('/delete_member/<int:member_id>', methods=["DELETE"])
 def delete_member(member_id):
     """Deletes a member via AJAX/Fetch."""
     try:
         db = get_db()
         db.from_('members').delete().eq('id', member_id).execute()
+        member_cache.bump()
+        events.publish('member.deleted', id=member_id)
         return jsonify({'success': True, 'message': 'Member deleted successfully'})
     except Exception as e:
-        print(f"Delete Error: {e}")
+        log.error(f"Delete Error: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ==============================
@@ -546,108 +903,108 @@ def save_layout():
     """
     Updated: Saves layout SPECIFICALLY per client_slug (Carbon Copy).
     If client_slug exists -> Update. If not -> Insert.
+    UPDATED: Isang RPC na lang (upsert sa client_slug; walang slug = update ng
+    pinakabagong layout). Ibinabalik ang lumang config para sa card cache.
     """
     try:
-        payload = request.json
+        # Ang img.src ng pirma ay /signature_image URL (display lang): ibalik sa
+        # data URL para hindi naka-depende ang layout sa host / officer row
+        payload = signatures.embed_images(request.json)
         db = get_db()
         
         # 1. GET CLIENT SLUG FROM PAYLOAD
         client_slug = payload.get('client_slug')
 
-        if not client_slug:
-            # Fallback: Save generic if no client selected (Old behavior)
-            # FIXED: Sort by created_at desc to ensure we update the latest layout
-            response = db.from_('layouts').select("*").order('created_at', desc=True).limit(1).execute()
-            existing_data = response.data
-            
-            if existing_data and len(existing_data) > 0:
-                record_id = existing_data[0]['id']
-                db.from_('layouts').update({"config_json": payload}).eq('id', record_id).execute()
-            else:
-                db.from_('layouts').insert({"config_json": payload}).execute()
-        else:
-            # 2. CARBON COPY LOGIC: Check existing layout for this specific company
-            response = db.from_('layouts').select("*").eq('client_slug', client_slug).execute()
-            existing_data = response.data
-            
-            if existing_data and len(existing_data) > 0:
-                # UPDATE: May existing na sa company na 'to
-                record_id = existing_data[0]['id']
-                db.from_('layouts').update({"config_json": payload}).eq('id', record_id).execute()
-                print(f">>> UPDATED LAYOUT FOR: {client_slug}")
-            else:
-                # INSERT: Bagong company entry
-                db.from_('layouts').insert({"config_json": payload, "client_slug": client_slug}).execute()
-                print(f">>> INSERTED NEW LAYOUT FOR: {client_slug}")
+        # 2. CARBON COPY LOGIC (atomic): walang slug = generic (Old behavior)
+        previous = upserts.call(db, upserts.SAVE_LAYOUT, p_client_slug=client_slug or None, p_config=payload)
+        log.info(f">>> SAVED LAYOUT FOR: {client_slug or '(generic)'}")
+        layout_cache.bump()
+
+        # 3. CARD CACHE: Kung nagbago ang layout, stale na ang cards na gumamit nito
+        if card_cache.layout_version(previous) != card_cache.layout_version(payload):
+            try:
+                cleared = cards.invalidate_layout(client_slug, supabase)
+                log.info(f">>> LAYOUT CHANGED: invalidated {cleared} cards")
+                if cleared:
+                    cards_changed()
+                    events.publish('card.deleted', layout=client_slug or '', reason='layout_changed')
+            except Exception as e:
+                log.warning(f">>> Card invalidation after layout save failed: {e}")
+            events.publish('layout.saved', client_slug=client_slug or '')
 
         return jsonify({"status": "success", "message": "Layout saved successfully!"}), 200
 
     except Exception as e:
-        print(f"Error saving layout: {e}")
+        log.error(f"Error saving layout: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+def _layout_config(client_slug=None):
+    """config_json ng layout ng client (o pinakabago kung walang slug). None kung wala."""
+    db = get_db()
+
+    def load():
+        if client_slug:
+            # Load specific company
+            response = db.from_('layouts').select("*").eq('client_slug', client_slug).execute()
+            log.info(f">>> LOADING LAYOUT FOR: {client_slug}")
+        else:
+            # Fallback: Load latest layout
+            response = db.from_('layouts').select("*").order('created_at', desc=True).limit(1).execute()
+        return response.data[0]['config_json'] if response.data else None
+
+    return layout_cache.get_or_set(f"layout:{client_slug or ''}", load)
+
 @app.route('/load_layout', methods=['GET'])
+@cache_policy()
 def load_layout():
     """
     Updated: Loads layout SPECIFICALLY per client_slug.
     If no client_slug provided -> Load latest (Fallback).
     """
     try:
-        db = get_db()
-        
         # 1. GET CLIENT SLUG FROM URL PARAMS
         client_slug = request.args.get('client_slug')
-        
-        if client_slug:
-            # Load specific company
-            response = db.from_('layouts').select("*").eq('client_slug', client_slug).execute()
-            print(f">>> LOADING LAYOUT FOR: {client_slug}")
-        else:
-            # Fallback: Load latest layout
-            response = db.from_('layouts').select("*").order('created_at', desc=True).limit(1).execute()
-        
-        data = response.data
-        if not data:
+
+        config = _layout_config(client_slug)
+        if config is None:
             return jsonify({"status": "error", "message": "No saved layout found."}), 404
-        return jsonify({"status": "success", "data": data[0]['config_json']}), 200
+        return jsonify({"status": "success", "data": config}), 200
 
     except Exception as e:
-        print(f"Error loading layout: {e}")
+        log.error(f"Error loading layout: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
 # ==============================
 # 🆕 NEW: FETCH CLIENT SLUGS (FOR ADMIN COMBO BOX)
 # ==============================
+def _client_slugs():
+    db = get_db()
+
+    # 1. Kunin lahat ng client_slug
+    rows = layout_cache.get_or_set(
+        'client_slugs', lambda: db.from_('layouts').select('client_slug').execute().data or [])
+
+    # 2. Kunin lang yung UNIQUE values (Wang duplicate)
+    seen = set()
+    unique_slugs = []
+    for item in rows:
+        slug = item.get('client_slug')
+        if slug and slug.strip() != "" and slug not in seen:
+            seen.add(slug)
+            unique_slugs.append({ 'client_slug': slug })
+    return unique_slugs
+
 @app.route('/api/layouts', methods=['GET'])
+@cache_policy()
 def get_client_slugs():
     """
     Fetches unique client_slug from layouts table.
     Ito ang tatawagin ng admin.html combo box.
     """
     try:
-        db = get_db()
-        
-        # 1. Kunin lahat ng client_slug
-        response = db.from_('layouts').select('client_slug').execute()
-        
-        if response.data:
-            # 2. Kunin lang yung UNIQUE values (Wang duplicate)
-            seen = set()
-            unique_slugs = []
-            
-            for item in response.data:
-                slug = item.get('client_slug')
-                if slug and slug.strip() != "":
-                    if slug not in seen:
-                        seen.add(slug)
-                        unique_slugs.append({ 'client_slug': slug })
-            
-            return jsonify(unique_slugs), 200
-        else:
-            return jsonify([]), 200
-            
+        return jsonify(_client_slugs()), 200
     except Exception as e:
-        print(f">>> ERROR fetching client slugs: {e}")
+        log.error(f">>> ERROR fetching client slugs: {e}")
         return jsonify([]), 500
 
 # ==============================
@@ -669,28 +1026,21 @@ def save_id_for_client():
         if not client_slug or not idnumber:
             return jsonify({'success': False, 'message': 'Missing Client or ID Number'}), 400
 
-        # CHECK KUNG MAY EXISTING NA BA
-        response = db.from_('idgenerate').select('*').eq('client_slug', client_slug).execute()
-        
-        if response.data:
-            # UPDATE (CARBON COPY: I-update lang yung existing na record)
-            db.from_('idgenerate').update({'idnumber': idnumber}).eq('client_slug', client_slug).execute()
-            print(f">>> UPDATED ID for {client_slug}: {idnumber}")
-        else:
-            # INSERT (New Company Entry)
-            db.from_('idgenerate').insert({'idnumber': idnumber, 'client_slug': client_slug}).execute()
-            print(f">>> INSERTED NEW ID for {client_slug}: {idnumber}")
+        # UPSERT (CARBON COPY): update kung existing ang company, insert kung bago
+        upserts.upsert(db, 'idgenerate', {'idnumber': idnumber, 'client_slug': client_slug})
+        log.info(f">>> SAVED ID for {client_slug}: {idnumber}")
 
         return jsonify({'success': True, 'message': 'ID Number saved successfully!'}), 200
 
     except Exception as e:
-        print(f"Error saving ID for client: {e}")
+        log.error(f"Error saving ID for client: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ==============================
 # 🆕 CAPTION CHANGER ROUTES (API)
 # ==============================
 @app.route('/api/get_settings', methods=['GET'])
+@cache_policy(max_age=60)
 def api_get_settings():
     return jsonify(get_system_settings())
 
@@ -736,10 +1086,10 @@ def api_save_settings():
                 
                 # Get URL
                 logo_url_to_save = supabase.storage.from_(bucket_name).get_public_url(filename)
-                print(f">>> Logo Uploaded: {logo_url_to_save}")
+                log.info(f">>> Logo Uploaded: {logo_url_to_save}")
                 
             except Exception as upload_err:
-                print(f">>> Logo Upload Error: {upload_err}")
+                log.error(f">>> Logo Upload Error: {upload_err}")
                 # Pag nagerror sa upload, huwag na lang palitan yung logo sa DB
                 pass
 
@@ -755,29 +1105,31 @@ def api_save_settings():
             update_payload['logo_url'] = logo_url_to_save
 
         db.from_('system_settings').update(update_payload).eq('id', 1).execute()
+        settings_cache.bump()
 
         return jsonify({'success': True, 'message': 'Settings saved successfully!'})
         
     except Exception as e:
-        print(f">>> Save Settings Error: {e}")
+        log.error(f">>> Save Settings Error: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ==============================
 # ADMIN FORMS ROUTES (ACTIVE - Connected to Supabase)
 # ==============================
 
+def _admin_forms():
+    db = get_db()
+    return forms_cache.get_or_set(
+        'all', lambda: db.from_('admin_forms').select("*").order('created_at', desc=True).execute().data or [])
+
 @app.route('/get_admin_forms', methods=['GET'])
+@cache_policy()
 def get_admin_forms():
     """Fetches all forms from admin_forms table."""
     try:
-        db = get_db()
-        response = db.from_('admin_forms').select("*").order('created_at', desc=True).execute()
-        
-        if response.data:
-            return jsonify(response.data), 200
-        return jsonify([]), 200
+        return jsonify(_admin_forms()), 200
     except Exception as e:
-        print(f">>> ERROR CONNECTING TO SUPABASE (get_admin_forms): {e}")
+        log.error(f">>> ERROR CONNECTING TO SUPABASE (get_admin_forms): {e}")
         return jsonify([]), 500
 
 @app.route('/add_admin_form', methods=['POST'])
@@ -792,6 +1144,7 @@ def add_admin_form():
             return jsonify({'success': False, 'message': 'Form name is required'}), 400
 
         response = db.from_('admin_forms').insert({"forms_name": forms_name}).execute()
+        forms_cache.bump()
 
         return jsonify({
             'success': True, 
@@ -799,7 +1152,7 @@ def add_admin_form():
             'data': response.data
         }), 200
     except Exception as e:
-        print(f"Error saving admin form: {e}")
+        log.error(f"Error saving admin form: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @app.route('/delete_admin_form/<int:id>', methods=['DELETE'])
@@ -808,10 +1161,11 @@ def delete_admin_form(id):
     try:
         db = get_db()
         db.from_('admin_forms').delete().eq('id', id).execute()
+        forms_cache.bump()
         
         return jsonify({'success': True, 'message': 'Form deleted successfully'}), 200
     except Exception as e:
-        print(f"Error deleting admin form: {e}")
+        log.error(f"Error deleting admin form: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
@@ -820,15 +1174,24 @@ def delete_admin_form(id):
 # ==============================
 
 # 1. GET LIST (Para sa Table/Listbox sa HTML)
+def _officer_list():
+    return [
+        dict(row, man_signature=signatures.image_url(signature_registry.OFFICER, row['id']))
+        for row in signatures.officers()
+    ]
+
 @app.route('/get_officers_list', methods=['GET'])
+@cache_policy(private=True)
 def get_officers_list():
-    """Returns all officers from officer_list table."""
+    """
+    Returns all officers from officer_list table.
+    UPDATED: Walang base64 sa list; ang man_signature ay URL na ng /signature_image
+    (gumagana pa rin as <img src>). Kinukuha lang ang pirma kapag na-display.
+    """
     try:
-        db = get_db()
-        response = db.from_('officer_list').select("*").order('created_at', desc=True).execute()
-        return jsonify(response.data), 200
+        return jsonify(_officer_list()), 200
     except Exception as e:
-        print(f"Error fetching officers: {e}")
+        log.error(f"Error fetching officers: {e}")
         return jsonify([]), 500
 
 # 2. SAVE NEW (POST) - Para sa "Add New" button
@@ -847,6 +1210,8 @@ def save_officer_signature():
         if not name_officer or not man_signature:
             return jsonify({'success': False, 'message': 'Name and Signature are required'}), 400
 
+        man_signature = normalize_signature(man_signature)
+
         payload = {
             'name_officer': name_officer,
             'designation': designation,
@@ -855,6 +1220,7 @@ def save_officer_signature():
         }
 
         response = db.from_('officer_list').insert(payload).execute()
+        signatures.invalidate(signature_registry.OFFICER)
 
         return jsonify({
             'success': True, 
@@ -863,24 +1229,31 @@ def save_officer_signature():
         }), 200
 
     except Exception as e:
-        print(f"Save Signature Error: {e}")
+        log.error(f"Save Signature Error: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # 3. GET SINGLE (For Edit) - Para i-load sa canvas
 @app.route('/get_officer/<int:officer_id>', methods=['GET'])
+@cache_policy(private=True)
 def get_officer(officer_id):
     """Fetches a single officer's details for editing."""
     try:
-        db = get_db()
-        response = db.from_('officer_list').select("*").eq('id', officer_id).execute()
+        # Index muna; kung wala (bagong insert sa ibang worker), diretso sa DB
+        officer = next((row for row in signatures.officers() if row['id'] == officer_id), None)
+        if officer is None:
+            db = get_db()
+            response = db.from_('officer_list').select("*").eq('id', officer_id).execute()
+            officer = response.data[0] if response.data else None
+        else:
+            officer = dict(officer, man_signature=signatures.image(signature_registry.OFFICER, officer_id))
         
-        if response.data:
-            return jsonify({'success': True, 'data': response.data[0]}), 200
+        if officer:
+            return jsonify({'success': True, 'data': officer}), 200
         else:
             return jsonify({'success': False, 'message': 'Officer not found'}), 404
             
     except Exception as e:
-        print(f"Error fetching officer: {e}")
+        log.error(f"Error fetching officer: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # 4. UPDATE (PUT) - Para sa Save pag naka-Edit mode
@@ -899,6 +1272,8 @@ def update_officer_signature(officer_id):
         if not name_officer or not man_signature:
             return jsonify({'success': False, 'message': 'Name and Signature are required'}), 400
 
+        man_signature = normalize_signature(man_signature)
+
         payload = {
             'name_officer': name_officer,
             'designation': designation,
@@ -907,6 +1282,7 @@ def update_officer_signature(officer_id):
         }
 
         response = db.from_('officer_list').update(payload).eq('id', officer_id).execute()
+        signatures.invalidate(signature_registry.OFFICER, officer_id)
 
         return jsonify({
             'success': True, 
@@ -915,7 +1291,7 @@ def update_officer_signature(officer_id):
         }), 200
 
     except Exception as e:
-        print(f"Update Signature Error: {e}")
+        log.error(f"Update Signature Error: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # 5. DELETE (DELETE) - Para sa Delete button
@@ -925,19 +1301,129 @@ def delete_officer(officer_id):
     try:
         db = get_db()
         db.from_('officer_list').delete().eq('id', officer_id).execute()
+        signatures.invalidate(signature_registry.OFFICER, officer_id)
         return jsonify({'success': True, 'message': 'Officer deleted successfully'}), 200
     except Exception as e:
-        print(f"Error deleting officer: {e}")
+        log.error(f"Error deleting officer: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ==============================
 # HEALTH CHECK & SETTINGS
 # ==============================
+def _probe_members_table():
+    get_db().from_('members').select('id').limit(1).execute()
+
+def _probe_card_bucket():
+    supabase.storage.from_('public_id_cards').list(path='guardian_ids', options={'limit': 1})
+
+readiness = health.ReadinessChecker([
+    health.DependencyProbe('members_table', _probe_members_table, health.DB_MAX_LATENCY_MS),
+    health.DependencyProbe('public_id_cards_bucket', _probe_card_bucket, health.STORAGE_MAX_LATENCY_MS),
+])
+
+# ==============================
+# BOOTSTRAP: Lahat ng data ng isang page sa isang request (see bootstrap.py)
+# ==============================
+page_bootstrap = bootstrap.Bootstrap(shared_cache.namespace('bootstrap', ttl=60))
+page_bootstrap.section('officers', lambda p: _officer_list(), namespaces=[signature_cache])
+page_bootstrap.section('admin_forms', lambda p: _admin_forms(), namespaces=[forms_cache])
+page_bootstrap.section('layout', lambda p: _layout_config(p.get('client_slug')),
+                       namespaces=[layout_cache], params=['client_slug'])
+page_bootstrap.section('client_slugs', lambda p: _client_slugs(), namespaces=[layout_cache])
+# Walang date = walang members (ang buong listahan ay galing sa DeltaSync)
+page_bootstrap.section('members', lambda p: _members_by_date(p['date']) if p.get('date') else None,
+                       namespaces=[member_cache, storage_cache], params=['date'])
+
+page_bootstrap.page('admin', 'admin_forms', 'officers', 'layout', 'client_slugs', 'members')
+page_bootstrap.page('signature', 'admin_forms', 'officers', 'layout')
+page_bootstrap.page('id_pdf_generator', 'officers', 'layout', 'members')
+
+@app.route('/api/bootstrap/<page>', methods=['GET'])
+@cache_policy(private=True)
+def page_bootstrap_data(page):
+    """
+    GET /api/bootstrap/admin?client_slug=acme&date=2024-01-31
+    -> {page, data: {admin_forms, officers, layout, ...}, errors: {}, cached}
+    """
+    params = {'client_slug': request.args.get('client_slug') or None,
+              'date': request.args.get('date') or None}
+    try:
+        return jsonify(page_bootstrap.build(page, params)), 200
+    except bootstrap.BootstrapError as e:
+        return jsonify({'success': False, 'message': str(e), 'pages': page_bootstrap.pages()}), 404
+    except Exception as e:
+        log.error(f">>> Bootstrap error ({page}): {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @app.route('/health')
+@app.route('/health/live')
+@cache_policy(no_store=True)
 def health_check():
+    """Liveness: buhay ang worker. Walang tinatawag na Supabase."""
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
 
+@app.route('/health/ready')
+@cache_policy(no_store=True)
+def health_ready():
+    """Readiness: cached probes ng members table at public_id_cards bucket."""
+    result = readiness.check()
+    return jsonify(result), (200 if result['status'] == 'ready' else 503)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint (per-route latency + Supabase call timing)."""
+    return Response(metrics.render_latest(), content_type=metrics.CONTENT_TYPE)
+
+# ==============================
+# PROFILING (admin lang, per worker; see profiling.py)
+# ==============================
+@app.route('/debug/profile/token', methods=['POST'])
+@profiling.admin_required
+def debug_profile_token():
+    """Signed value para sa X-Profile header (?ttl=seconds, max 1 day)."""
+    try:
+        ttl = max(1, min(int(request.args.get('ttl', profiling.PROFILE_TOKEN_TTL)), 86400))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid ttl'}), 400
+    token, expires = profiling.issue_token(ttl)
+    return jsonify({'header': profiling.PROFILE_HEADER, 'token': token, 'expires': expires})
+
+@app.route('/debug/profiles', methods=['GET'])
+@profiling.admin_required
+def debug_profiles():
+    return jsonify({'pid': os.getpid(), 'directory': profiling.PROFILE_DIR, 'profiles': profiling.list_profiles()})
+
+@app.route('/debug/profiles/<name>', methods=['GET'])
+@profiling.admin_required
+def debug_profile_file(name):
+    path = profiling.profile_path(name)
+    if path is None:
+        return jsonify({'success': False, 'message': 'Profile not found'}), 404
+    return send_file(path, mimetype='application/json' if name.endswith('.json') else 'text/plain',
+                     as_attachment=True, download_name=name)
+
+@app.route('/debug/tracemalloc/<action>', methods=['GET', 'POST'])
+@profiling.admin_required
+def debug_tracemalloc(action):
+    """
+    POST start?frames=10 -> tracing + baseline;  GET diff?top=25&key=lineno
+    POST stop;  GET status
+    """
+    try:
+        if action == 'start' and request.method == 'POST':
+            return jsonify(profiling.tracemalloc_start(request.args.get('frames', 10)))
+        if action == 'diff':
+            return jsonify(profiling.tracemalloc_diff(request.args.get('top', 25), request.args.get('key', 'lineno')))
+        if action == 'stop' and request.method == 'POST':
+            return jsonify(profiling.tracemalloc_stop())
+        if action == 'status':
+            return jsonify(profiling.tracemalloc_status())
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify({'success': False, 'message': f"Unknown action: {request.method} {action}"}), 404
+
 @app.route('/get_current_id')
+@cache_policy(no_store=True)
 def get_current_id():
     """
     Updated: Fetches ID format based on selected client_slug.
@@ -964,7 +1450,7 @@ def get_current_id():
             return jsonify({'idnumber': ''})
 
     except Exception as e:
-        print(f"Error getting ID: {e}")
+        log.error(f"Error getting ID: {e}")
         return jsonify({'idnumber': ''})
 
 @app.route('/save_id_to_db', methods=['POST'])
@@ -977,16 +1463,12 @@ def save_id_to_db():
         if not id_value:
             return jsonify({'success': False, 'message': 'No ID value provided'}), 400
 
-        check_response = db.from_('idgenerate').select('id').order('id', desc=True).limit(1).execute()
-        if check_response.data:
-            record_id = check_response.data[0].get('id')
-            db.from_('idgenerate').update({"idnumber": id_value}).eq('id', record_id).execute()
-        else:
-            db.from_('idgenerate').insert({"idnumber": id_value}).execute()
+        # Isang RPC: update ng pinakabagong row, o insert kung wala pa
+        upserts.call(db, upserts.SAVE_CURRENT_ID, p_idnumber=id_value)
 
         return jsonify({'success': True, 'message': 'ID saved successfully!', 'id': id_value})
     except Exception as e:
-        print(f"Error saving ID: {e}")
+        log.error(f"Error saving ID: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ==============================
@@ -1004,6 +1486,7 @@ def display_id(member_id):
     return redirect(url_for('id_pdf_generator'))
 
 @app.route('/id_pdf_generator')
+@cache_policy()
 def id_pdf_generator():
     return render_template('id_pdf_generator.html')
 
@@ -1016,6 +1499,7 @@ def phone_viewer():
 # NEW: VIEW PHONE (CELPHONE ONLY / USER FRIENDLY)
 # ==============================
 @app.route('/view_phone')
+@cache_policy()
 def view_phone():
     """
     Celphone Only ID Viewer (User Friendly).
@@ -1027,15 +1511,11 @@ def view_phone():
 # FIXED: SAVE CARD IMAGE (Temp File Method + STATIC FILENAME)
 # ==============================
 @app.route('/save_card_image', methods=['POST'])
+# Sunod-sunod ang upload ng generator (isang card bawat request), kaya maluwag ang rate
+@admission_policy('save_card', client='300/60:60', concurrency=4, queue=16, wait=30)
 def save_card_image():
-    # Helper logging
-    def log(message):
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        with open("error_log.txt", "a") as f:
-            f.write(f"\n[{timestamp}] {message}")
-        print(message)
-
-    log(">>> ROUTE TRIGGERED: Save Card")
+    # Logging: dati ay bukas-sara ng error_log.txt bawat linya; ngayon ay queue-based (logging_setup.py)
+    hot_log.info(">>> ROUTE TRIGGERED: Save Card")
 
     try:
         db = get_db()
@@ -1044,10 +1524,23 @@ def save_card_image():
         image_data = data.get('image_data') 
 
         if not member_id or not image_data:
-            log(">>> ERROR: Missing member_id or image_data")
+            log.warning(">>> ERROR: Missing member_id or image_data")
             return jsonify({'success': False, 'message': 'Missing data'}), 400
 
-        log(f">>> Processing Member ID: {member_id}")
+        hot_log.info(f">>> Processing Member ID: {member_id}")
+
+        # --- STEP0: CARD CACHE (Walang nagbago -> huwag nang i-upload ulit) ---
+        client_slug = data.get('client_slug')
+        fingerprint = None
+        try:
+            fresh, fingerprint, member_row = cards.check(member_id, client_slug)
+            if fresh:
+                cards.touch([member_id])
+                hot_log.info(f">>> CARD CACHE HIT: Member ID {member_id}")
+                return jsonify({'success': True, 'message': 'ID Card is up to date.',
+                                'url': member_row['generated_card_image'], 'cached': True})
+        except Exception as e:
+            log.warning(f">>> Card cache check failed (uploading anyway): {e}")
 
         # --- STEP1: DECODE BASE64 ---
         try:
@@ -1057,9 +1550,9 @@ def save_card_image():
                 base64_string = image_data
             
             image_bytes = base64.b64decode(base64_string)
-            log(f">>> Decoded Image Size: {len(image_bytes)} bytes")
+            hot_log.info(f">>> Decoded Image Size: {len(image_bytes)} bytes")
         except Exception as decode_err:
-            log(f">>> DECODING ERROR: {decode_err}")
+            log.error(f">>> DECODING ERROR: {decode_err}")
             return jsonify({'success': False, 'message': 'Invalid Image Data'}), 400
 
         # --- STEP2: UPLOAD TO SUPABASE STORAGE (Using Temp File) ---
@@ -1067,7 +1560,7 @@ def save_card_image():
         
         # --- UPDATE: STATIC FILENAME (Overwrite instead of Duplicate) ---
         filename = f"guardian_ids/{member_id}.png"
-        log(f">>> Target Path: {bucket_name}/{filename} (Mode: OVERWRITE)")
+        hot_log.info(f">>> Target Path: {bucket_name}/{filename} (Mode: OVERWRITE)")
         
         try:
             # A. Create a temporary file
@@ -1075,7 +1568,7 @@ def save_card_image():
                 tmp_file.write(image_bytes)
                 temp_path = tmp_file.name
             
-            log(f">>> Created Temp File: {temp_path}")
+            hot_log.info(f">>> Created Temp File: {temp_path}")
 
             # B. Prepare options
             options = {
@@ -1090,16 +1583,17 @@ def save_card_image():
                 file_options=options
             )
             
-            log(f">>> Upload Response: {upload_response}")
+            hot_log.info(f">>> Upload Response: {upload_response}")
+            card_files_changed(filename)
 
             # D. Delete temporary file after upload (Cleanup)
             try:
                 os.remove(temp_path)
-                log(f">>> Deleted Temp File: {temp_path}")
+                hot_log.info(f">>> Deleted Temp File: {temp_path}")
             except:
                 pass # Hindi critical kung di ma-delete temp file
 
-            log(">>> UPLOAD SEEMS SUCCESSFUL")
+            hot_log.info(">>> UPLOAD SEEMS SUCCESSFUL")
 
         except Exception as upload_err:
             # Clean up temp file if error occurs
@@ -1107,7 +1601,7 @@ def save_card_image():
                 os.remove(temp_path)
                 
             error_msg = str(upload_err)
-            log(f">>> UPLOAD EXCEPTION: {error_msg}")
+            log.error(f">>> UPLOAD EXCEPTION: {error_msg}")
             
             if "Bucket not found" in error_msg:
                 return jsonify({'success': False, 'message': 'Bucket "public_id_cards" does not exist.'}), 500
@@ -1119,34 +1613,110 @@ def save_card_image():
         # --- STEP3: GET PUBLIC URL ---
         try:
             image_url_data = supabase.storage.from_(bucket_name).get_public_url(filename)
-            log(f">>> Public URL: {image_url_data}")
+            hot_log.info(f">>> Public URL: {image_url_data}")
         except Exception as url_err:
-            log(f">>> URL ERROR: {url_err}")
+            log.error(f">>> URL ERROR: {url_err}")
             # Fallback manual URL construction
             image_url_data = f"{SUPAB_URL}/storage/v1/object/public/{bucket_name}/{filename}"
 
-        # --- STEP4: SAVE URL TO DATABASE ---
+        # --- STEP4: SAVE URL + FINGERPRINT TO DATABASE ---
         try:
-            payload = {
-                'generated_card_image': image_url_data, 
-                'generated_at': datetime.now().isoformat()
-            }
-            db.from_('members').update(payload).eq('id', member_id).execute()
-            log(">>> DATABASE UPDATE SUCCESS")
+            cards.record(member_id, image_url_data, len(image_bytes), fingerprint, client_slug)
+            hot_log.info(">>> DATABASE UPDATE SUCCESS")
+            cards_changed()
+            events.publish('card.saved', member_id=member_id, url=image_url_data)
         except Exception as db_err:
-            log(f">>> DATABASE ERROR: {db_err}")
+            log.error(f">>> DATABASE ERROR: {db_err}")
             return jsonify({'success': False, 'message': f"DB Error: {str(db_err)}"}), 500
 
         return jsonify({'success': True, 'message': 'ID Card saved successfully.', 'url': image_url_data})
 
     except Exception as e:
-        log(f">>> FATAL ERROR (Outer Loop): {e}")
+        log.error(f">>> FATAL ERROR (Outer Loop): {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+# ==============================
+# DIRECT UPLOADS: Signed URL -> browser PUT -> confirm (see direct_upload.py)
+# ==============================
+# Hindi na dumadaan sa worker ang image bytes. Ang save_card_image (base64)
+# ay naiwan bilang fallback para sa lumang pages / kapag pumalya ang signed upload.
+# Kailangan ng totoong secret (UPLOAD_TICKET_SECRET o SECRET_KEY na hindi default):
+# kung wala, naka-disable ang signed uploads at gagamitin ng browser ang fallback.
+UPLOAD_TICKET_SECRET = os.getenv("UPLOAD_TICKET_SECRET") or os.getenv("SECRET_KEY")
+if UPLOAD_TICKET_SECRET in (None, '', 'supersecretkey'):
+    UPLOAD_TICKET_SECRET = None
+    log.warning(">>> UPLOAD_TICKET_SECRET / SECRET_KEY not set: direct uploads disabled")
+
+def _uploads_disabled():
+    return jsonify({'success': False, 'message': 'Direct uploads are disabled (no upload secret configured)'}), 404
+
+@app.route('/api/uploads/sign', methods=['POST'])
+@admission_policy('upload_sign', client='600/60:120')
+def sign_upload():
+    """
+    POST {kind: 'card'|'photo', member_id, content_type, client_slug}
+    Card na walang nagbago (card cache) -> {fresh: true, url}, walang upload.
+    """
+    if not UPLOAD_TICKET_SECRET:
+        return _uploads_disabled()
+    data = request.get_json(silent=True) or {}
+    kind = data.get('kind')
+    member_id = data.get('member_id')
+    client_slug = data.get('client_slug')
+    extra = {}
+    try:
+        if kind == direct_upload.CARD and member_id:
+            try:
+                fresh, fingerprint, member_row = cards.check(member_id, client_slug)
+                if fresh:
+                    cards.touch([member_id])
+                    return jsonify({'success': True, 'fresh': True, 'url': member_row['generated_card_image']})
+                # Ang fingerprint ay sa oras ng sign (ito ang data na ni-render ng browser)
+                extra = {'fp': fingerprint, 'cs': client_slug}
+            except Exception as e:
+                log.warning(f">>> Card cache check failed (signing anyway): {e}")
+        ticket = direct_upload.issue(supabase.storage, UPLOAD_TICKET_SECRET, kind, member_id,
+                                     data.get('content_type'), extra)
+        return jsonify({'success': True, 'fresh': False, **ticket})
+    except direct_upload.UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        log.error(f">>> Sign upload error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/uploads/confirm', methods=['POST'])
+def confirm_upload():
+    """POST {ticket} pagkatapos ng PUT. Card -> nire-record sa members (card cache + events)."""
+    if not UPLOAD_TICKET_SECRET:
+        return _uploads_disabled()
+    data = request.get_json(silent=True) or {}
+    try:
+        result = direct_upload.confirm(supabase.storage, UPLOAD_TICKET_SECRET, data.get('ticket'))
+    except direct_upload.UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        log.error(f">>> Confirm upload error: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+    if result['k'] == direct_upload.CARD:
+        member_id = result['m']
+        card_files_changed(result['p'])
+        try:
+            cards.record(member_id, result['url'], result['bytes'], result.get('fp'), result.get('cs'))
+        except Exception as db_err:
+            log.error(f">>> DATABASE ERROR: {db_err}")
+            return jsonify({'success': False, 'message': f"DB Error: {str(db_err)}"}), 500
+        cards_changed()
+        events.publish('card.saved', member_id=member_id, url=result['url'])
+        hot_log.info(f">>> CARD CONFIRMED: Member ID {member_id} ({result['bytes']} bytes)")
+
+    return jsonify({'success': True, 'url': result['url'], 'path': result['p'], 'bytes': result['bytes']})
+
 ## ==============================
 # UPDATED: BATCH DELETE CARDS (Case Sensitive Fix)
 # ==============================
 @app.route('/delete_cards_batch', methods=['POST'])
+@admission_policy('delete_cards_batch', client='20/60', concurrency=2, queue=4, wait=10)
 def delete_cards_batch():
     """
     Deletes generated IDs for a list of members.
@@ -1160,13 +1730,13 @@ def delete_cards_batch():
         if not member_ids:
             return jsonify({'success': False, 'message': 'No members selected'}), 400
 
-        print(f">>> BATCH DELETE INITIATED for {len(member_ids)} members.")
+        hot_log.info(f">>> BATCH DELETE INITIATED for {len(member_ids)} members.")
 
         # --- STEP1: GATHER FILES TO DELETE ---
         files_to_remove = set() 
 
         # A. KUNIN YUNG NAKASULAT SA DATABASE (Old Files)
-        print(">>> Checking Database for Files...")
+        hot_log.info(">>> Checking Database for Files...")
         get_members = db.from_('members').select('id', 'generated_card_image') \
             .in_('id', member_ids).execute()
         
@@ -1178,14 +1748,14 @@ def delete_cards_batch():
                         if '/public_id_cards/' in url:
                             filename = url.split(f'/public_id_cards/')[-1]
                             files_to_remove.add(filename)
-                            print(f"   -> Found in DB: {filename}")
+                            hot_log.info(f"   -> Found in DB: {filename}")
                     except Exception as e:
-                        print(f"   -> Error splitting URL: {e}")
+                        log.error(f"   -> Error splitting URL: {e}")
 
         # B. DAGDAGIN ANG STATIC FILENAMES (Case Sensitive!)
         # Buburahin natin BOTH: lower case AND upper case extensions.
         # Para siguradong mapatay kahit anong klaseng extension.
-        print(">>> Adding Standard Filenames (.png & .PNG)...")
+        hot_log.info(">>> Adding Standard Filenames (.png & .PNG)...")
         for mid in member_ids:
             lower_case = f"guardian_ids/{mid}.png"
             upper_case = f"guardian_ids/{mid}.PNG"
@@ -1193,32 +1763,37 @@ def delete_cards_batch():
             files_to_remove.add(lower_case)
             files_to_remove.add(upper_case)
             
-            print(f"   -> Adding: {lower_case} & {upper_case}")
+            hot_log.info(f"   -> Adding: {lower_case} & {upper_case}")
 
         # Convert set to list
         final_list = list(files_to_remove)
         
-        print(f">>> TOTAL COMMANDS PREPARED: {len(final_list)}")
-        print(f">>> SENDING COMMANDS TO SUPABASE: {final_list}")
+        hot_log.info(f">>> TOTAL COMMANDS PREPARED: {len(final_list)}")
+        hot_log.info(f">>> SENDING COMMANDS TO SUPABASE: {final_list}")
 
         # --- STEP2: EXECUTE DELETE ---
         if final_list:
             try:
                 response = supabase.storage.from_('public_id_cards').remove(final_list)
-                print(">>> DELETE COMMAND SENT SUCCESSFULLY.")
-                print(">>> CHECK SUPABASE DASHBOARD NOW.")
+                card_files_changed(*final_list)
+                hot_log.info(">>> DELETE COMMAND SENT SUCCESSFULLY.")
+                hot_log.info(">>> CHECK SUPABASE DASHBOARD NOW.")
             except Exception as e:
-                print(f">>> STORAGE DELETE ERROR: {e}")
-                print(">>> BUT WE WILL STILL CLEAR DATABASE.")
+                log.error(f">>> STORAGE DELETE ERROR: {e}")
+                log.warning(">>> BUT WE WILL STILL CLEAR DATABASE.")
         else:
-            print(">>> No files found to delete.")
+            hot_log.info(">>> No files found to delete.")
 
         # --- STEP3: CLEAR DATABASE ---
         payload = {
             'generated_card_image': None,
-            'generated_at': None
+            'generated_at': None,
+            'card_fingerprint': None,
+            'card_bytes': None
         }
         db.from_('members').update(payload).in_('id', member_ids).execute()
+        cards_changed()
+        events.publish('card.deleted', member_ids=member_ids, reason='batch_delete')
 
         return jsonify({
             'success': True, 
@@ -1226,13 +1801,14 @@ def delete_cards_batch():
         }), 200
 
     except Exception as e:
-        print(f">>> BATCH DELETE GENERAL ERROR: {e}")
+        log.error(f">>> BATCH DELETE GENERAL ERROR: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ==============================
 # NEW: BUCKET ONLY LIST (Lolo's Rule + SUPER RESCUE MODE)
 # ==============================
 @app.route('/api/storage/list-all', methods=['GET'])
+@cache_policy()
 def list_bucket_only():
     """
     Lahat ng nasa bucket, ilalabas.
@@ -1241,67 +1817,95 @@ def list_bucket_only():
     === LATEST FIX: AUTO RESCUE MODE ===
     Kung mawala yung folder, hindi na tayo babagsak.
     Mag-a-attempt ito mag-Upload ng fake file para ma-recreate ang folder.
+
+    UPDATED: Shared cache + single-flight. Pag sabay-sabay nagbukas ang phones
+    sa simula ng event, isang storage list lang ang tumatama sa Supabase.
     """
     try:
-        bucket_name = "public_id_cards"
-        folder_path = "guardian_ids"
+        # Ang storage_cache ay bina-bump ng cards_changed() sa bawat card write
+        return jsonify(storage_cache.get_or_set('list-all', _list_card_files)), 200
+    except Exception as e:
+        log.error(f">>> Error listing bucket: {e}")
+        # Pag error, ibalik na lang empty list para di bumagsak yung app ni Lolo
+        return jsonify([]), 200
 
-        # 1. LIST ALL FILES
+def _list_card_files():
+    """Bucket listing para sa list-all. Nagra-raise kapag bigo (para hindi ma-cache ang [])."""
+    bucket_name = "public_id_cards"
+    folder_path = "guardian_ids"
+
+    # 1. LIST ALL FILES
+    try:
+        files_response = supabase.storage.from_(bucket_name).list(path=folder_path)
+    except Exception as list_err:
+        # NAG ERROR, BAKIT? KASI WALANG FOLDER.
+        log.warning(f">>> ERROR: Folder '{folder_path}' might be missing.")
+        log.warning(f">>> ATTEMPTING AUTO-RESCUE...")
+        
         try:
-            files_response = supabase.storage.from_(bucket_name).list(path=folder_path)
-        except Exception as list_err:
-            # NAG ERROR, BAKIT? KASI WALANG FOLDER.
-            print(f">>> ERROR: Folder '{folder_path}' might be missing.")
-            print(f">>> ATTEMPTING AUTO-RESCUE...")
+            # Trick: Upload an empty string or dummy file to create folder
+            # Note: Some Supabase versions allow creating folders via upload of 'folder/.empty'
+            rescue_path = f"{folder_path}/.empty"
             
-            try:
-                # Trick: Upload an empty string or dummy file to create folder
-                # Note: Some Supabase versions allow creating folders via upload of 'folder/.empty'
-                rescue_path = f"{folder_path}/.empty"
-                
-                # Create dummy content
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as tmp:
-                    tmp.write(b"folder_rescue")
-                    tmp_path = tmp.name
-                
-                supabase.storage.from_(bucket_name).upload(
-                    path=rescue_path, 
-                    file=tmp_path,
-                    file_options={"upsert": "true"}
-                )
-                os.remove(tmp_path)
-                
-                print(">>> RESCUE SUCCESS! Folder recreated.")
-                # Try listing again
-                files_response = supabase.storage.from_(bucket_name).list(path=folder_path)
-            except Exception as rescue_err:
-                print(f">>> RESCUE FAILED: {rescue_err}")
-                # Pag talagang di makabuhay, return empty list nalang para di bumagsak UI
-                return jsonify([]), 200
-        
-        # 2. PREPARE DATA (Lagyan ng URL para madaling i-display)
-        result = []
-        for f in files_response:
-            # Iwasan yung .empty file na nilagay natin
-            if f['name'] != '.empty':
-                result.append({
-                    'filename': f['name'],
-                    'url': f"{SUPAB_URL}/storage/v1/object/public/{bucket_name}/{folder_path}/{f['name']}"
-                })
-
-        # 3. RETURN LIST (Sort by Filename para maayos)
-        # Reverse (Descending) para yung pinaka-bago naka-sa taas
-        return jsonify(sorted(result, key=lambda x: x['filename'], reverse=True)), 200
-
+            # Create dummy content
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as tmp:
+                tmp.write(b"folder_rescue")
+                tmp_path = tmp.name
+            
+            supabase.storage.from_(bucket_name).upload(
+                path=rescue_path, 
+                file=tmp_path,
+                file_options={"upsert": "true"}
+            )
+            os.remove(tmp_path)
+            
+            log.info(">>> RESCUE SUCCESS! Folder recreated.")
+            # Try listing again
+            files_response = supabase.storage.from_(bucket_name).list(path=folder_path)
+        except Exception as rescue_err:
+            log.error(f">>> RESCUE FAILED: {rescue_err}")
+            # Pag talagang di makabuhay, empty list sa UI (via list_bucket_only)
+            raise
+    
+    # 2. PREPARE DATA (Lagyan ng URL para madaling i-display)
+    result = []
+    for f in files_response:
+        # Iwasan yung .empty file na nilagay natin
+        if f['name'] != '.empty':
+            result.append({
+                'filename': f['name'],
+                'url': f"{SUPAB_URL}/storage/v1/object/public/{bucket_name}/{folder_path}/{f['name']}"
+            })
+
+    # 3. RETURN LIST (Sort by Filename para maayos)
+    # Reverse (Descending) para yung pinaka-bago naka-sa taas
+    return sorted(result, key=lambda x: x['filename'], reverse=True)
+
+# ==============================
+# IMAGE PROXY: /img/guardian_ids/12.png?w=480&fmt=webp (see image_proxy.py)
+# ==============================
+# Disk cache + sendfile; ETag at Range galing sa send_file(conditional=True).
+# max-age=0: laging nire-revalidate ng browser (304 mula sa disk), para
+# makita agad ang bagong card pagkatapos ng save.
+@app.route('/img/<path:key>', methods=['GET'])
+def proxied_image(key):
+    try:
+        entry = images.get(key, request.args.get('w'), request.args.get('fmt'))
+    except image_proxy.ImageNotFound as e:
+        return jsonify({'success': False, 'message': str(e)}), 404
+    except image_proxy.ImageError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
-        print(f">>> Error listing bucket: {e}")
-        # Pag error, ibalik na lang empty list para di bumagsak yung app ni Lolo
-        return jsonify([]), 200
+        log.error(f">>> Image proxy error for {key}: {e}")
+        return jsonify({'success': False, 'message': 'Image unavailable'}), 502
+    return send_file(entry.path, mimetype=entry.content_type, conditional=True,
+                     etag=entry.etag, max_age=0)
 
 # ============================================================
 # 🆕 NEW ROUTE: DELETE ALL FILES IN BUCKET (The Missing Link)
 # ============================================================
 @app.route('/api/storage/delete-all', methods=['DELETE'])
+@admission_policy('delete_all', client='2/60', route='5/60', concurrency=1, queue=0)
 def delete_all_bucket_files():
     """
     Ito ang tatawagin ng 'Burn' button.
@@ -1319,7 +1923,7 @@ def delete_all_bucket_files():
 
         # 2. CHECK KUNG MAY LAMAN
         if not filenames_to_delete:
-            print(">>> Bucket is already empty.")
+            log.info(">>> Bucket is already empty.")
             return jsonify({'success': True, 'message': 'Bucket is already empty.'}), 200
 
         # 3. DELETE
@@ -1328,75 +1932,135 @@ def delete_all_bucket_files():
             # Supabase remove function ay kumakain ng list ng paths
             full_paths = [f"{folder_path}/{name}" for name in filenames_to_delete]
             
-            print(f">>> BURNING {len(full_paths)} FILES...")
+            log.info(f">>> BURNING {len(full_paths)} FILES...")
             supabase.storage.from_(bucket_name).remove(full_paths)
+            images.clear(folder_path)
+            archives.clear()
+
+            # Wala nang file -> i-null din sa DB (card cache + 'cards' delta feed)
+            try:
+                get_db().from_('members').update({
+                    'generated_card_image': None,
+                    'generated_at': None,
+                    'card_fingerprint': None,
+                    'card_bytes': None
+                }).neq('generated_card_image', '').execute()
+            except Exception as e:
+                log.warning(f">>> Bucket burned but DB card columns not cleared: {e}")
+            cards_changed()
+            events.publish('card.deleted', all=True, reason='bucket_burned')
             
             return jsonify({'success': True, 'message': f'Deleted {len(full_paths)} files from bucket.'}), 200
             
         except Exception as e:
-            print(f">>> Error deleting files: {e}")
+            log.error(f">>> Error deleting files: {e}")
             return jsonify({'success': False, 'message': str(e)}), 500
 
     except Exception as e:
-        print(f">>> General Error in delete-all: {e}")
+        log.error(f">>> General Error in delete-all: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+# ============================================================
+# 🆕 NEW ROUTE: CARD CACHE STATUS (Para i-skip ang cards na walang nagbago)
+# ============================================================
+@app.route('/api/cards/status', methods=['POST'])
+def card_cache_status():
+    """
+    Body: {"member_ids": [1, 2, 3], "client_slug": optional}
+    Returns {"fresh": [...], "stale": [...]} - ang 'stale' lang ang kailangang i-generate.
+    """
+    try:
+        data = request.json or {}
+        member_ids = data.get('member_ids') or []
+        if not member_ids:
+            return jsonify({'fresh': [], 'stale': []})
+        return jsonify(cards.status(member_ids, data.get('client_slug')))
+    except Exception as e:
+        log.error(f"Card status error: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ============================================================
 # 🆕 NEW ROUTE: DOWNLOAD ZIP (For Celphone)
 # ============================================================
 @app.route('/api/storage/download-zip', methods=['POST'])
+@admission_policy('zip_download', client='6/60', route='60/60', concurrency=2, queue=4, wait=20)
 def download_zip_files():
     """
     I-Zip lahat ng selected files para sa easy download.
+    UPDATED: Galing sa archive cache (parehong selection + walang nagbagong
+    card = parehong ZIP sa disk). ?mode=link -> JSON na may GET URL, para ang
+    download manager ng phone ang bahala (resumable via Range).
     """
     try:
-        db = get_db()
-        data = request.json
+        data = request.get_json(silent=True) or {}
         filenames = data.get('filenames') # Expecting list: ["2.png", "16.png", etc.]
 
         if not filenames:
             return jsonify({'success': False, 'message': 'No files selected'}), 400
 
-        print(f">>> ZIPPING {len(filenames)} files...")
-
-        # 1. Gumawa ng ZIP sa Memory (BytesIO)
-        memory_file = io.BytesIO()
-        
-        with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for fname in filenames:
-                # Full path in bucket
-                file_path = f"guardian_ids/{fname}"
-                
-                try:
-                    # 2. Download file from Supabase to Memory
-                    # Note: .download() returns raw bytes
-                    file_data = supabase.storage.from_('public_id_cards').download(file_path)
-                    
-                    # 3. Isulat sa Zip
-                    zf.writestr(fname, file_data)
-                    print(f"   -> Zipped: {fname}")
-                except Exception as e:
-                    print(f"   -> Failed to zip {fname}: {e}")
-
-        # 4. Ibalik ang pointer sa simula ng Zip file
-        memory_file.seek(0)
-
-        # 5. Ibalik sa Browser as Download
-        return send_file(
-            memory_file, 
+        link_mode = request.args.get('mode') == 'link'
+        hot_log.info(f">>> ZIPPING {len(filenames)} files...")
+        # Link mode: walang saysay bumuo ng ZIP na hindi naka-cache (walang URL na
+        # maibibigay, kasama ang may pumalyang download) - ang client ay babalik
+        # sa direct POST download
+        archive = archives.get_or_build(filenames, temporary=not link_mode)
+        if archive is None:
+            return jsonify({'success': True, 'url': None, 'size': None, 'files': 0, 'missing': []})
+        hot_log.info(f">>> ZIP {'CACHED' if archive.cached else 'BUILT'}: {archive.files} files, "
+                     f"{archive.entry.size} bytes, missing {len(archive.missing)}")
+        for fname in archive.missing:
+            log.warning(f"   -> Failed to zip {fname}")
+
+        # LRU: na-download = ginamit (para hindi unang ma-evict)
+        try:
+            cards.touch([f.split('.')[0] for f in filenames if str(f).split('.')[0].isdigit()])
+        except Exception as e:
+            log.warning(f"   -> Card touch failed: {e}")
+
+        if link_mode:
+            # Naka-cache lang ang ibinabalik ng temporary=False (walang temp file dito)
+            return jsonify({
+                'success': True,
+                'url': url_for('download_archive', key=archive.key),
+                'size': archive.entry.size,
+                'files': archive.files,
+                'missing': archive.missing,
+            })
+
+        response = send_file(
+            archive.entry.path,
             mimetype='application/zip',
             as_attachment=True,
-            download_name='All_ID_Cards.zip'
+            download_name='All_ID_Cards.zip',
+            etag=archive.entry.etag or False,
         )
+        if archive.temporary:
+            response.call_on_close(lambda: os.path.exists(archive.entry.path) and os.remove(archive.entry.path))
+        return response
 
+    except archive_cache.ArchiveError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
-        print(f">>> ZIP ERROR: {e}")
+        log.error(f">>> ZIP ERROR: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@app.route('/api/storage/archives/<key>.zip', methods=['GET'])
+def download_archive(key):
+    """Naka-cache na ZIP (galing sa ?mode=link). ETag + Range = resumable download."""
+    try:
+        entry = archives.get(key)
+    except archive_cache.ArchiveError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    if entry is None:
+        return jsonify({'success': False, 'message': 'Archive expired; request it again.'}), 404
+    return send_file(entry.path, mimetype='application/zip', as_attachment=True,
+                     download_name='All_ID_Cards.zip', conditional=True, etag=entry.etag, max_age=0)
+
 # ============================================================
 # 🆕 NEW ROUTE: MAKE SIGNATURE PAGE (Standalone)
 # ============================================================
 @app.route('/make_signature')
+@cache_policy()
 def make_signature_route():
     """Tumutugon sa ✍️ button sa base.html."""
     return render_template('make_signature.html')
@@ -1405,24 +2069,30 @@ def make_signature_route():
 def upload_signature_standalone():
     if request.data is None or len(request.data) == 0:
         return jsonify({'error': 'No image data received'}), 400
-    timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-    filename = f'signature_{timestamp}.png'
-    path = os.path.join(SIGN_DIR, secure_filename(filename))
-    with open(path, 'wb') as f:
-        f.write(request.data)
-    return jsonify({'message': 'Signature uploaded', 'path': filename})
+    image_bytes = request.data
+    try:
+        normalized = signature_normalize.normalize_bytes(image_bytes, fmt='png')
+        if normalized and len(normalized[1]) < len(image_bytes):
+            image_bytes = normalized[1]
+    except Exception as e:
+        log.warning(f"Signature normalization skipped: {e}")
+    try:
+        entry = signature_store.add(image_bytes, 'image/png')
+    except Exception as e:
+        log.error(f"Error saving signature: {e}")
+        return jsonify({'error': 'Upload failed'}), 500
+    return jsonify({'message': 'Signature uploaded', 'path': entry['filename'], 'id': entry['id']})
 
 @app.route('/signature', methods=['DELETE'])
 def delete_signature_standalone():
-    path = last_signature_path()
-    if not path:
-        return jsonify({'message': 'No signature to delete'}), 404
     try:
-        os.remove(path)
-        return jsonify({'message': f'Deleted {os.path.basename(path)}'})
+        entry = signature_store.delete_latest()
     except Exception as e:
-        print(f"Error deleting signature: {e}")
+        log.error(f"Error deleting signature: {e}")
         return jsonify({'message': 'Delete failed'}), 500
+    if not entry:
+        return jsonify({'message': 'No signature to delete'}), 404
+    return jsonify({'message': f"Deleted {entry['filename']}", 'id': entry['id']})
 
 # ==============================
 # NEW ROUTE: SAVE COMPANY SIGNATURE (Standalone Page) - UPDATED FOR UPSERT
@@ -1443,36 +2113,25 @@ def save_company_signature():
         
         if not name or not signature_data:
             return jsonify({'success': False, 'message': 'Paki-lagay ng Pangalan at Pirma'}), 400
+
+        signature_data = normalize_signature(signature_data)
             
-        # 1. CHECK KUNG MAY EXISTING NA BA (Carbon Copy Logic)
-        # Tinitignan natin kung may record na sa table na kapareho ng 'name'
-        response = db.from_('signaturetable').select('*').eq('name', name).execute()
-        
-        if response.data:
-            # 2. UPDATE: May existing na sa pangalan na 'to
-            # I-uupdate lang yung signature field, hindi na gumagawa ng bagong row
-            db.from_('signaturetable').update({'signature': signature_data}).eq('name', name).execute()
-            print(f">>> UPDATED SIGNATURE FOR: {name}")
-            return jsonify({'success': True, 'message': f'Updated signature for {name}!'}), 200
-            
-        else:
-            # 3. INSERT: Walang nahanap na pangalan, so gagawa ng bago
-            payload = {
-                'name': name,
-                'signature': signature_data
-            }
-            db.from_('signaturetable').insert(payload).execute()
-            print(f">>> INSERTED NEW SIGNATURE FOR: {name}")
-            return jsonify({'success': True, 'message': f'Saved new signature for {name}!'}), 200
+        # UPSERT (Carbon Copy Logic): unique ang 'name', kaya iisang statement na
+        # ang "update kung existing, insert kung bago" (dati: SELECT muna)
+        upserts.upsert(db, 'signaturetable', {'name': name, 'signature': signature_data})
+        signatures.invalidate(signature_registry.COMPANY)
+        log.info(f">>> SAVED SIGNATURE FOR: {name}")
+        return jsonify({'success': True, 'message': f'Saved signature for {name}!'}), 200
             
     except Exception as e:
-        print(f"Error saving company signature: {e}")
+        log.error(f"Error saving company signature: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ==============================
 # 🆕 ROUTE: GET SIGNATURE TABLE (For Company Signature Page ONLY) - FIXED
 # ==============================
 @app.route('/get_signaturetable', methods=['GET'])
+@cache_policy(private=True)
 def get_signature_table():
     """
     Fetches list from 'signaturetable'.
@@ -1480,15 +2139,15 @@ def get_signature_table():
     FIXED: Field name updated to 'name' (lowercase)
     """
     try:
-        db = get_db()
-        
-        # Fetch all records
-        # FIXED: Changed 'NAME' to 'name'
-        response = db.from_('signaturetable').select('*').order('name', desc=True).execute()
-        return jsonify(response.data), 200
+        # UPDATED: Cached name index; ang 'signature' ay URL na (lazy fetch by id)
+        rows = [
+            dict(row, signature=signatures.image_url(signature_registry.COMPANY, row['id']))
+            for row in signatures.company_signatures()
+        ]
+        return jsonify(rows), 200
         
     except Exception as e:
-        print(f"Error fetching signaturetable: {e}")
+        log.error(f"Error fetching signaturetable: {e}")
         return jsonify([]), 500
 
 # ==============================
@@ -1510,6 +2169,8 @@ def save_signature_table():
         
         if not name or not signature_data:
             return jsonify({'success': False, 'message': 'Paki-lagay ng Pangalan at Pirma'}), 400
+
+        signature_data = normalize_signature(signature_data)
             
         # INSERT INTO SIGNATURE TABLE
         # FIXED: Using 'name' (lowercase) to match DB
@@ -1517,38 +2178,36 @@ def save_signature_table():
             'name': name,
             'man_signature': signature_data
         }).execute()
+        signatures.invalidate(signature_registry.COMPANY)
         
         return jsonify({'success': True, 'message': f'Saved to SignatureTable!'}), 200
         
     except Exception as e:
-        print(f"Error saving to signaturetable: {e}")
+        log.error(f"Error saving to signaturetable: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ==============================
 # 🆕 NEW ROUTE: GET SIGNATURE BY NAME
 # ==============================
 @app.route('/get_signature_by_name', methods=['GET'])
+@cache_policy(private=True)
 def get_signature_by_name():
     """
     Fetches a specific signature based on the Name.
     Used by the 'Load (DB)' button.
     """
     try:
-        db = get_db()
         name = request.args.get('name') # Kunin ang name galing sa URL
         
         if not name:
             return jsonify({'success': False, 'message': 'No name provided'}), 400
             
-        # Hanapin ang record sa signaturetable na match yung name
-        # Ginamit ko 'ilike' (case insensitive search) para mas user friendly
-        response = db.from_('signaturetable').select('*').ilike('name', name).execute()
+        # Hanapin ang record sa cached name index (case insensitive, gaya ng dating 'ilike')
+        record = signatures.find_company_signature(name)
         
-        if response.data and len(response.data) > 0:
-            # Kunin ang first match
-            record = response.data[0]
-            # Siguraduhin na nakuha yung field na 'signature'
-            sig_data = record.get('signature')
+        if record:
+            # Saka lang kukunin ang pirma mismo (by id, naka-cache)
+            sig_data = signatures.image(signature_registry.COMPANY, record['id'])
             
             if sig_data:
                 return jsonify({
@@ -1562,11 +2221,55 @@ def get_signature_by_name():
             return jsonify({'success': False, 'message': 'Name not found'}), 404
             
     except Exception as e:
-        print(f"Error fetching by name: {e}")
+        log.error(f"Error fetching by name: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+# ==============================
+# 🆕 ROUTE: SIGNATURE IMAGE (Lazy, by id)
+# ==============================
+@app.route('/signature_image/<kind>/<int:item_id>', methods=['GET'])
+@cache_policy(private=True, max_age=86400)
+def signature_image(kind, item_id):
+    """
+    Binary na pirma para sa <img src> ng officer/company lists.
+    Versioned ang URL (?v=) kaya ligtas i-cache ng browser nang matagal.
+    """
+    if kind not in (signature_registry.OFFICER, signature_registry.COMPANY):
+        return jsonify({'success': False, 'message': 'Unknown signature type'}), 404
+    try:
+        mimetype, image_bytes = signature_registry.parse_data_url(signatures.image(kind, item_id))
+        if not image_bytes:
+            return jsonify({'success': False, 'message': 'Signature not found'}), 404
+        return Response(image_bytes, mimetype=mimetype)
+    except Exception as e:
+        log.error(f"Error fetching signature image: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+startup.mark('routes')
+
+# ==============================
+# Warm-up (gunicorn --preload)
+# ==============================
+def warm_app(preload=None):
+    """
+    gunicorn --preload -w 4 'app:warm_app()'
+    Hindi ito app factory: ang `app` ay ginagawa na sa import, at ito rin ang
+    ibinabalik. Ang ginagawa lang ay i-import sa master ang mabibigat na lazy
+    modules (shared copy-on-write sa workers) at i-report ang startup timing.
+    Ang Supabase client ay lazy pa rin (per worker). APP_PRELOAD=0 = report lang.
+    """
+    if preload is None:
+        preload = os.getenv("APP_PRELOAD", "1") == "1"
+    if preload:
+        with startup.timed('preload'):
+            import supabase as _supabase_package  # noqa: F401 - import lang, walang client
+            startup.preload(signature_normalize, photo_ingest, archive_cache)
+    startup.report()
+    return app
+
 # ==============================
 # Run App
 # ==============================
 if __name__ == '__main__':
+    startup.report()
     app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
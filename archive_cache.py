@@ -0,0 +1,186 @@
+# ==============================
+# ARCHIVE CACHE: Prebuilt ZIPs para sa paulit-ulit na batch downloads
+# ==============================
+# Sa distribution day, maraming phones ang humihingi ng parehong ZIP (hal.
+# buong chapter). Dati, bawat request = download ng bawat card sa Supabase +
+# bagong ZIP sa memory.
+#
+# Ngayon:
+#   - key = sha256(sorted filenames + version ng bawat card), kung saan ang
+#     version ay card_fingerprint + generated_at sa members row. Nagbago ang
+#     isang card -> ibang key, kaya hindi kailanman maibibigay ang lumang ZIP.
+#   - ang ZIP ay binubuo sa disk (hindi memory), parallel ang downloads, at
+#     ZIP_STORED (PNG ay compressed na; sayang ang CPU sa deflate)
+#   - disk LRU na may budget (see disk_cache.py); sine-serve via send_file,
+#     kaya may ETag + Range (resumable sa GET /api/storage/archives/<key>.zip)
+#   - invalidate(paths) kapag na-save / na-delete ang card: binubura agad ang
+#     archives na may kasamang card na iyon (para hindi na maghintay sa LRU)
+#
+# Kapag may card na hindi na-download (o walang version), binubuo pa rin ang
+# ZIP pero hindi kina-cache.
+import os
+import re
+import json
+import hashlib
+import tempfile
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import logging_setup
+from disk_cache import DiskCache, Entry
+from singleflight import Group
+
+log = logging_setup.get_logger('archives')
+
+ARCHIVE_BUCKET = 'public_id_cards'
+ARCHIVE_FOLDER = 'guardian_ids'
+ARCHIVE_CACHE_DIR = os.getenv("ARCHIVE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "idsystem-archives"))
+ARCHIVE_CACHE_MAX_BYTES = int(os.getenv("ARCHIVE_CACHE_MAX_MB", "1024")) * 1024 * 1024
+ARCHIVE_CACHE_TTL = float(os.getenv("ARCHIVE_CACHE_TTL", str(6 * 3600)))
+ARCHIVE_FETCH_CONCURRENCY = int(os.getenv("ARCHIVE_FETCH_CONCURRENCY", "4"))
+ARCHIVE_MAX_FILES = int(os.getenv("ARCHIVE_MAX_FILES", "2000"))
+
+_KEY_RE = re.compile(r'^[0-9a-f]{64}$')
+
+# entry: disk file; temporary=True -> hindi naka-cache, burahin pagkatapos i-send
+Archive = namedtuple('Archive', 'key entry files missing cached temporary')
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+def normalize(filenames):
+    """Sorted, unique; bawal ang path separators / hidden names."""
+    if not isinstance(filenames, (list, tuple)) or not filenames:
+        raise ArchiveError("No files selected")
+    names = sorted({str(name) for name in filenames})
+    if len(names) > ARCHIVE_MAX_FILES:
+        raise ArchiveError(f"Too many files (max {ARCHIVE_MAX_FILES})")
+    for name in names:
+        if not name or '/' in name or '\\' in name or name.startswith('.'):
+            raise ArchiveError(f"Invalid filename: {name}")
+    return names
+
+
+def archive_key(names, versions):
+    body = json.dumps([[name, versions.get(name)] for name in names], separators=(',', ':'))
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _key_path(key):
+    if not _KEY_RE.match(key or ''):
+        raise ArchiveError(f"Invalid archive key: {key}")
+    return [key[:2], key]
+
+
+class ArchiveCache:
+    def __init__(self, get_storage, get_db, cache=None):
+        self._get_storage = get_storage
+        self._get_db = get_db
+        self.cache = cache or DiskCache('archives', ARCHIVE_CACHE_DIR, ARCHIVE_CACHE_MAX_BYTES,
+                                        ARCHIVE_CACHE_TTL, key_path=_key_path)
+        self._flights = Group('archives', window=0)
+
+    def versions(self, names):
+        """filename -> version (None kung walang card record, hal. hindi '<id>.png')."""
+        ids = {name.split('.')[0]: name for name in names if name.split('.')[0].isdigit()}
+        if not ids:
+            return {}
+        rows = self._get_db().from_('members') \
+            .select('id, generated_card_image, card_fingerprint, generated_at') \
+            .in_('id', list(ids)).execute().data or []
+        versions = {}
+        for row in rows:
+            name = ids.get(str(row['id']))
+            # Lumang cards (bago ang card cache) ay walang fingerprint; generated_at na lang
+            if name and row.get('generated_card_image') and (row.get('card_fingerprint') or row.get('generated_at')):
+                versions[name] = f"{row.get('card_fingerprint') or ''}@{row.get('generated_at') or ''}"
+        return versions
+
+    def get(self, key):
+        """Naka-cache na archive (para sa GET download), o None."""
+        return self.cache.get(key, 'zip')
+
+    def get_or_build(self, filenames, temporary=True):
+        """temporary=False -> None kung hindi kina-cache ang selection o may pumalyang download."""
+        names = normalize(filenames)
+        versions = self.versions(names)
+        key = archive_key(names, versions)
+        cacheable = all(versions.get(name) for name in names)
+        if not cacheable:
+            if not temporary:
+                return None
+            # Sariling temp file bawat request (binubura pagkatapos i-send, kaya hindi shared)
+            return self._build(key, names, cacheable)
+        entry = self.cache.get(key, 'zip')
+        if entry is not None:
+            return Archive(key, entry, len(names), [], True, False)
+        # Sabay na parehong selection (buong chapter) = isang build lang
+        archive = self._flights.do(key, lambda: self._build(key, names, cacheable, shared=True))
+        if archive is not None:
+            return archive
+        # May pumalyang download: hindi na-cache. Ang temp file ay binubura
+        # pagkatapos i-send, kaya bawat caller ay may sariling build (hindi shared)
+        if not temporary:
+            return None
+        return self._build(key, names, False)
+
+    def _download(self, name):
+        try:
+            return name, self._get_storage().from_(ARCHIVE_BUCKET).download(f"{ARCHIVE_FOLDER}/{name}")
+        except Exception as e:
+            log.warning(f"Failed to fetch {name} for archive: {e}")
+            return name, None
+
+    def _build(self, key, names, cacheable, shared=False):
+        """shared=True (sa loob ng flight) -> None imbes na temporary archive."""
+        tmp = self.cache.temp_path('.zip')
+        missing = []
+        try:
+            with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_STORED) as zf, \
+                    ThreadPoolExecutor(max_workers=ARCHIVE_FETCH_CONCURRENCY) as pool:
+                # map() = parehong order ng names, kaya deterministic ang ZIP
+                for name, data in pool.map(self._download, names):
+                    if data is None:
+                        missing.append(name)
+                    else:
+                        zf.writestr(name, data)
+        except Exception:
+            os.remove(tmp)
+            raise
+
+        if cacheable and not missing:
+            entry = self.cache.put_file(key, 'zip', tmp, 'zip')
+            self.cache.put(key, 'manifest', json.dumps(names).encode(), 'json')
+            log.info(f"Archive built and cached: {len(names)} files, {entry.size} bytes")
+            return Archive(key, entry, len(names), missing, True, False)
+
+        if shared:
+            log.warning(f"Archive not cached, {len(missing)} files missing: {missing[:5]}")
+            os.remove(tmp)
+            return None
+        entry = Entry(tmp, None, 'application/zip', os.path.getsize(tmp))
+        return Archive(key, entry, len(names) - len(missing), missing, False, True)
+
+    def invalidate(self, *paths):
+        """Burahin ang archives na may kasamang alinman sa paths ('guardian_ids/12.png')."""
+        names = {os.path.basename(path) for path in paths
+                 if path and os.path.dirname(path) == ARCHIVE_FOLDER}
+        if not names or not os.path.isdir(self.cache.directory):
+            return 0
+        removed = 0
+        for manifest in self.cache.entries('manifest'):
+            try:
+                with open(manifest) as f:
+                    included = set(json.load(f))
+            except (OSError, ValueError):
+                continue
+            if included & names:
+                self.cache.invalidate(os.path.basename(os.path.dirname(manifest)))
+                removed += 1
+        return removed
+
+    def clear(self):
+        self.cache.clear()
@@ -0,0 +1 @@
+# Benchmark harness: FakeSupabase backend + load scenarios (see bench/run.py)
@@ -0,0 +1,511 @@
+# ==============================
+# FAKE SUPABASE (PostgREST + Storage stand-in para sa benchmarks)
+# ==============================
+# In-process, thread-safe na kapalit ng supabase.Client. Sinusuportahan lang
+# ang subset ng API na ginagamit ng app.py:
+#   db.from_(t).select/insert/update/delete/upsert + eq/neq/lt/lte/gt/gte/
+#   in_/ilike/like/is_/or_ + order/limit/range/offset -> .execute()
+#   db.rpc(fn, params).execute()
+#   storage.from_(bucket).upload/remove/list/download/get_public_url/
+#   create_signed_upload_url/upload_to_signed_url
+#
+# Optional `latency_ms` para gayahin ang network round trip ng totoong Supabase.
+import re
+import copy
+import time
+import uuid
+import hashlib
+import threading
+from difflib import SequenceMatcher
+from datetime import datetime, timezone
+
+# Tables na may AFTER DELETE trigger papuntang sync_tombstones (see supabase_setup.sql)
+TOMBSTONE_TABLES = {'members', 'officer_list'}
+# Columns na hindi nagpapalit ng updated_at kapag sila lang ang binago
+# (gaya ng update_updated_at_column() sa supabase_setup.sql)
+NO_TOUCH_COLUMNS = {'card_last_used_at'}
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self):
+        return f"FakeResponse(rows={len(self.data) if isinstance(self.data, list) else 1})"
+
+
+def _like_regex(pattern, ignore_case):
+    regex = ''.join('.*' if ch == '%' else '.' if ch == '_' else re.escape(ch) for ch in pattern)
+    return re.compile(f"^{regex}$", re.IGNORECASE | re.DOTALL if ignore_case else re.DOTALL)
+
+
+def _coerce_pair(a, b):
+    # Parehong string ang galing sa URL params; gayahin ang Postgres comparison sa numbers
+    if isinstance(a, (int, float)) and isinstance(b, str):
+        try:
+            return a, type(a)(b)
+        except ValueError:
+            return str(a), b
+    return a, b
+
+
+def _compare(op, value, target):
+    if op == 'is':
+        return value is None if target in (None, 'null') else value == target
+    if value is None:
+        return False
+    value, target = _coerce_pair(value, target)
+    if op == 'eq':
+        return value == target
+    if op == 'neq':
+        return value != target
+    if op == 'lt':
+        return value < target
+    if op == 'lte':
+        return value <= target
+    if op == 'gt':
+        return value > target
+    if op == 'gte':
+        return value >= target
+    if op == 'in':
+        return any(_coerce_pair(value, t)[1] == value for t in target)
+    if op in ('like', 'ilike'):
+        return bool(_like_regex(str(target), op == 'ilike').match(str(value)))
+    raise NotImplementedError(f"fake filter operator not supported: {op}")
+
+
+def _parse_or(expression):
+    """'name.ilike.%x%,chapter.eq.y' -> [(column, op, value), ...]"""
+    clauses = []
+    for part in expression.split(','):
+        column, op, value = part.strip().split('.', 2)
+        # PostgREST: "..." = quoted value (hal. eq."" para sa empty string)
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        clauses.append((column, op, value))
+    return clauses
+
+
+class _Query:
+    def __init__(self, backend, table):
+        self._backend = backend
+        self._table = table
+        self._op = 'select'
+        self._columns = None
+        self._count = None
+        self._payload = None
+        self._on_conflict = None
+        self._filters = []
+        self._order = []
+        self._limit = None
+        self._offset = 0
+        self._single = False
+        self._matched = 0
+
+    # --- operations ---
+    def select(self, *columns, count=None, **_):
+        cols = [c.strip() for col in columns for c in col.split(',') if c.strip()]
+        self._columns = None if not cols or '*' in cols else cols
+        self._count = count
+        return self
+
+    def insert(self, payload, **_):
+        self._op, self._payload = 'insert', payload
+        return self
+
+    def update(self, payload, **_):
+        self._op, self._payload = 'update', payload
+        return self
+
+    def upsert(self, payload, on_conflict='', **_):
+        self._op, self._payload = 'upsert', payload
+        self._on_conflict = [c.strip() for c in on_conflict.split(',') if c.strip()] or ['id']
+        return self
+
+    def delete(self, **_):
+        self._op = 'delete'
+        return self
+
+    # --- filters ---
+    def _add(self, column, op, value):
+        self._filters.append(('and', [(column, op, value)]))
+        return self
+
+    def eq(self, column, value): return self._add(column, 'eq', value)
+    def neq(self, column, value): return self._add(column, 'neq', value)
+    def lt(self, column, value): return self._add(column, 'lt', value)
+    def lte(self, column, value): return self._add(column, 'lte', value)
+    def gt(self, column, value): return self._add(column, 'gt', value)
+    def gte(self, column, value): return self._add(column, 'gte', value)
+    def like(self, column, pattern): return self._add(column, 'like', pattern)
+    def ilike(self, column, pattern): return self._add(column, 'ilike', pattern)
+    def is_(self, column, value): return self._add(column, 'is', value)
+    def in_(self, column, values): return self._add(column, 'in', list(values))
+
+    def or_(self, filters, **_):
+        self._filters.append(('or', _parse_or(filters)))
+        return self
+
+    # --- modifiers ---
+    def order(self, column, desc=False, **_):
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size, **_):
+        self._limit = size
+        return self
+
+    def offset(self, size):
+        self._offset = size
+        return self
+
+    def range(self, start, end, **_):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    maybe_single = single
+
+    def _matches(self, row):
+        for kind, clauses in self._filters:
+            results = (_compare(op, row.get(col), val) for col, op, val in clauses)
+            if not (all(results) if kind == 'and' else any(results)):
+                return False
+        return True
+
+    def execute(self):
+        self._backend.simulate_latency()
+        with self._backend.lock:
+            data = getattr(self, f"_exec_{self._op}")(self._backend.rows(self._table))
+        count = (self._matched if self._op == 'select' else len(data)) if self._count else None
+        if self._single:
+            data = data[0] if data else None
+        return FakeResponse(data, count)
+
+    def _exec_select(self, rows):
+        result = [r for r in rows if self._matches(r)]
+        self._matched = len(result)
+        for column, desc in reversed(self._order):
+            result.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+        if self._offset:
+            result = result[self._offset:]
+        if self._limit is not None:
+            result = result[:self._limit]
+        if self._columns:
+            return [{c: r.get(c) for c in self._columns} for r in result]
+        return [copy.deepcopy(r) for r in result]
+
+    def _exec_insert(self, rows):
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        return [copy.deepcopy(self._backend.insert_row(self._table, item)) for item in payload]
+
+    def _exec_update(self, rows):
+        updated = []
+        for row in rows:
+            if self._matches(row):
+                changed = {c for c, v in self._payload.items() if row.get(c) != v}
+                row.update(copy.deepcopy(self._payload))
+                if changed - NO_TOUCH_COLUMNS:
+                    row['updated_at'] = _now_iso()
+                updated.append(copy.deepcopy(row))
+        return updated
+
+    def _exec_delete(self, rows):
+        kept, deleted = [], []
+        for row in rows:
+            (deleted if self._matches(row) else kept).append(row)
+        rows[:] = kept
+        for row in deleted:
+            self._backend.record_tombstone(self._table, row)
+        return deleted
+
+    def _exec_upsert(self, rows):
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        result = []
+        for item in payload:
+            key = tuple(item.get(c) for c in self._on_conflict)
+            existing = next((r for r in rows if tuple(r.get(c) for c in self._on_conflict) == key), None)
+            if existing is not None and None not in key:
+                existing.update(copy.deepcopy(item))
+                existing['updated_at'] = _now_iso()
+                result.append(copy.deepcopy(existing))
+            else:
+                result.append(copy.deepcopy(self._backend.insert_row(self._table, item)))
+        return result
+
+
+class _RpcCall:
+    def __init__(self, backend, fn, params):
+        self._backend = backend
+        self._fn = fn
+        self._params = params or {}
+
+    def execute(self):
+        self._backend.simulate_latency()
+        handler = self._backend.functions.get(self._fn)
+        if handler is None:
+            raise Exception(f"Could not find the function public.{self._fn}")
+        with self._backend.lock:
+            return FakeResponse(handler(self._backend, self._params))
+
+
+# ==============================
+# STORAGE
+# ==============================
+class _FakeBucket:
+    def __init__(self, backend, name):
+        self._backend = backend
+        self._name = name
+
+    @property
+    def _objects(self):
+        return self._backend.bucket(self._name)
+
+    def upload(self, path, file, file_options=None):
+        self._backend.simulate_latency()
+        options = file_options or {}
+        if isinstance(file, (bytes, bytearray)):
+            data = bytes(file)
+        elif hasattr(file, 'read'):
+            data = file.read()
+        else:
+            with open(file, 'rb') as fh:
+                data = fh.read()
+        upsert = str(options.get('upsert', options.get('x-upsert', 'false'))).lower() == 'true'
+        with self._backend.lock:
+            if path in self._objects and not upsert:
+                raise Exception('The resource already exists')
+            self._backend.put_object(self._name, path, data, options.get('content-type', 'application/octet-stream'))
+        return {'path': path, 'full_path': f"{self._name}/{path}"}
+
+    def upload_to_signed_url(self, path, token, file, file_options=None):
+        return self.upload(path, file, {**(file_options or {}), 'upsert': 'true'})
+
+    def create_signed_upload_url(self, path, options=None):
+        token = uuid.uuid4().hex
+        url = f"{self._backend.url}/storage/v1/object/upload/sign/{self._name}/{path}?token={token}"
+        return {'signed_url': url, 'signedUrl': url, 'token': token, 'path': path}
+
+    def remove(self, paths):
+        self._backend.simulate_latency()
+        removed = []
+        with self._backend.lock:
+            for path in paths:
+                obj = self._objects.pop(path, None)
+                if obj is not None:
+                    removed.append({'name': path, 'bucket_id': self._name})
+        return removed
+
+    def download(self, path, options=None):
+        self._backend.simulate_latency()
+        with self._backend.lock:
+            obj = self._objects.get(path)
+        if obj is None:
+            raise Exception('Object not found')
+        return obj['data']
+
+    def info(self, path):
+        self._backend.simulate_latency()
+        with self._backend.lock:
+            obj = self._objects.get(path)
+        if obj is None:
+            raise Exception('Object not found')
+        return {'name': path, **self._entry(path.rsplit('/', 1)[-1], obj)}
+
+    def list(self, path=None, options=None):
+        self._backend.simulate_latency()
+        options = options or {}
+        prefix = (path or '').strip('/')
+        prefix = f"{prefix}/" if prefix else ''
+        limit = options.get('limit', 100)
+        offset = options.get('offset', 0)
+        search = options.get('search', '')
+        sort = options.get('sortBy', {'column': 'name', 'order': 'asc'})
+
+        entries, folders = [], set()
+        with self._backend.lock:
+            for key, obj in self._objects.items():
+                if not key.startswith(prefix):
+                    continue
+                rest = key[len(prefix):]
+                if '/' in rest:
+                    folders.add(rest.split('/', 1)[0])
+                elif not search or search in rest:
+                    entries.append(self._entry(rest, obj))
+        entries.extend({'name': f, 'id': None, 'updated_at': None, 'created_at': None, 'metadata': None}
+                       for f in folders)
+        column = sort.get('column', 'name')
+        entries.sort(key=lambda e: (e.get(column) is None, e.get(column) or ''),
+                     reverse=sort.get('order') == 'desc')
+        return entries[offset:offset + limit]
+
+    @staticmethod
+    def _entry(name, obj):
+        return {
+            'name': name,
+            'id': obj['id'],
+            'updated_at': obj['updated_at'],
+            'created_at': obj['created_at'],
+            'last_accessed_at': obj['updated_at'],
+            'metadata': {
+                'eTag': f'"{obj["etag"]}"',
+                'size': len(obj['data']),
+                'mimetype': obj['content_type'],
+                'lastModified': obj['updated_at'],
+            },
+        }
+
+    def get_public_url(self, path, options=None):
+        return f"{self._backend.url}/storage/v1/object/public/{self._name}/{path}"
+
+
+class _FakeStorage:
+    def __init__(self, backend):
+        self._backend = backend
+
+    def from_(self, bucket):
+        return _FakeBucket(self._backend, bucket)
+
+
+# ==============================
+# CLIENT
+# ==============================
+# ==============================
+# RPC FUNCTIONS (gaya ng nasa supabase_setup.sql)
+# ==============================
+def _rpc_save_layout(backend, params):
+    slug, config = params.get('p_client_slug') or None, params.get('p_config')
+    rows = backend.rows('layouts')
+    if slug is None:
+        target = max(rows, key=lambda r: r.get('created_at') or '', default=None)
+    else:
+        target = next((r for r in rows if r.get('client_slug') == slug), None)
+    if target is None:
+        backend.insert_row('layouts', {'client_slug': slug, 'config_json': copy.deepcopy(config)})
+        return None
+    previous = target.get('config_json')
+    target['config_json'] = copy.deepcopy(config)
+    return previous
+
+
+def _rpc_save_current_id(backend, params):
+    rows = backend.rows('idgenerate')
+    if rows:
+        max(rows, key=lambda r: r['id'])['idnumber'] = params.get('p_idnumber')
+    else:
+        backend.insert_row('idgenerate', {'idnumber': params.get('p_idnumber')})
+    return None
+
+
+_SEARCH_FIELDS = {
+    'all': ('name', 'pseudo_name', 'chapter', 'designation', 'contact_no', 'blood_type', 'home_address'),
+    'name': ('name', 'pseudo_name'),
+    'chapter': ('chapter',),
+    'designation': ('designation',),
+    'contact': ('contact_no',),
+    'quick': ('name', 'pseudo_name', 'chapter'),
+}
+
+
+def _rpc_search_members(backend, params):
+    # Approximation lang: substring / lahat ng salita (walang stemming o typo match)
+    term = (params.get('p_query') or '').strip().lower()
+    fields = _SEARCH_FIELDS[params.get('p_field') or 'all']
+    words = term.split()
+    hits = []
+    for row in backend.rows('members'):
+        values = [str(row.get(f) or '').lower() for f in fields]
+        if not term or not any(term in v or all(w in v for w in words) for v in values):
+            continue
+        score = max(SequenceMatcher(None, term, v).ratio() for v in values)
+        if str(row.get('name') or '').lower().startswith(term):
+            score += 1
+        hits.append((score, row))
+    hits.sort(key=lambda h: (-h[0], h[1].get('name') or '', h[1]['id']))
+    offset, limit = max(0, params.get('p_offset') or 0), max(1, params.get('p_limit') or 50)
+    columns = params.get('p_columns')
+    return [{'member': {c: row.get(c) for c in columns} if columns else copy.deepcopy(row),
+             'rank': round(score, 4), 'total_count': len(hits)}
+            for score, row in hits[offset:offset + limit]]
+
+
+FUNCTIONS = {
+    'save_layout': _rpc_save_layout,
+    'save_current_id': _rpc_save_current_id,
+    'search_members': _rpc_search_members,
+}
+
+
+class FakeSupabase:
+    """Kapalit ng supabase.Client; lahat ng data ay nasa memory ng process."""
+
+    def __init__(self, url="http://fake-supabase.local", latency_ms=0.0):
+        self.url = url.rstrip('/')
+        self.latency = latency_ms / 1000.0
+        self.lock = threading.RLock()
+        self.tables = {}
+        self.buckets = {}
+        self.functions = dict(FUNCTIONS)
+        self._sequences = {}
+        self.storage = _FakeStorage(self)
+
+    def simulate_latency(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    # --- table helpers ---
+    def rows(self, name):
+        return self.tables.setdefault(name, [])
+
+    def insert_row(self, table, item):
+        row = copy.deepcopy(item)
+        if row.get('id') is None:
+            seq = self._sequences.get(table, 0) + 1
+            self._sequences[table] = seq
+            row['id'] = seq
+        else:
+            self._sequences[table] = max(self._sequences.get(table, 0), int(row['id']))
+        now = _now_iso()
+        row.setdefault('created_at', now)
+        row.setdefault('updated_at', now)
+        self.rows(table).append(row)
+        return row
+
+    def record_tombstone(self, table, row):
+        # Gaya ng sync_tombstones AFTER DELETE trigger sa supabase_setup.sql
+        if table in TOMBSTONE_TABLES:
+            self.insert_row('sync_tombstones', {'table_name': table, 'row_id': row.get('id'),
+                                                'deleted_at': _now_iso()})
+
+    # --- storage helpers ---
+    def bucket(self, name):
+        return self.buckets.setdefault(name, {})
+
+    def put_object(self, bucket, path, data, content_type='application/octet-stream'):
+        now = _now_iso()
+        existing = self.bucket(bucket).get(path)
+        self.bucket(bucket)[path] = {
+            'id': existing['id'] if existing else str(uuid.uuid4()),
+            'data': data,
+            'content_type': content_type,
+            'etag': hashlib.md5(data).hexdigest(),
+            'created_at': existing['created_at'] if existing else now,
+            'updated_at': now,
+        }
+
+    # --- supabase.Client surface ---
+    def from_(self, table):
+        return _Query(self, table)
+
+    table = from_
+
+    def rpc(self, fn, params=None, **_):
+        return _RpcCall(self, fn, params)
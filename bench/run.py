@@ -0,0 +1,279 @@
+# ==============================
+# BENCHMARK RUNNER
+# ==============================
+# Reproducible load scenarios laban sa app.py na naka-FakeSupabase.
+#
+#   python -m bench.run                          # lahat ng scenarios, gunicorn 4 workers
+#   python -m bench.run --scenario autocomplete --scenario search_all
+#   python -m bench.run --mode inprocess         # walang gunicorn (Flask test client)
+#   python -m bench.run --latency-ms 40 --members 5000 --json bench_output.json
+#
+# Output: requests, errors, throughput (req/s) at p50/p95/p99/max latency (ms)
+# per scenario. Gamitin ang --json para i-compare ang before/after ng isang change.
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+import subprocess
+import http.client
+from urllib.parse import quote
+
+from bench import seed as seed_data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ==============================
+# SCENARIOS
+# ==============================
+# Bawat scenario ay generator ng "iteration": isang listahan ng requests na
+# sunod-sunod na ginagawa ng isang virtual user (e.g. pagta-type ng pangalan).
+class Context:
+    def __init__(self, members, card_fraction, seed):
+        self.rng = random.Random(seed)
+        self.members = seed_data.synthetic_members(members, seed)
+        self.card_files = seed_data.card_filenames(members, card_fraction)
+        self.card_payload = seed_data.data_url(seed_data.sample_card(), 'image/png')
+
+
+def scenario_autocomplete(ctx, rng):
+    """Nagta-type ng pangalan sa search box: /api/members/search?q=J, Ju, Jua, ..."""
+    name = rng.choice(ctx.members)['name']
+    return [('GET', f"/api/members/search?q={quote(name[:n])}", None)
+            for n in range(1, min(len(name), 6) + 1)]
+
+
+def scenario_search_all(ctx, rng):
+    """Search form na walang term = 'show all' (server-rendered)."""
+    body = 'search_term=&search_type=all'
+    return [('POST', '/search-members', (body, 'application/x-www-form-urlencoded'))]
+
+
+def scenario_card_save(ctx, rng, batch=10):
+    """Batch card generation: sunod-sunod na /save_card_image ng isang encoder."""
+    requests = []
+    for member in rng.sample(ctx.members, min(batch, len(ctx.members))):
+        body = json.dumps({'member_id': member['id'], 'image_data': ctx.card_payload})
+        requests.append(('POST', '/save_card_image', (body, 'application/json')))
+    return requests
+
+
+def scenario_zip_download(ctx, rng, files=20):
+    """Phone download ng ZIP ng mga piling cards."""
+    selection = rng.sample(ctx.card_files, min(files, len(ctx.card_files)))
+    body = json.dumps({'filenames': selection})
+    return [('POST', '/api/storage/download-zip', (body, 'application/json'))]
+
+
+def scenario_storage_list(ctx, rng):
+    """view_phone.html load: listing ng lahat ng generated cards."""
+    return [('GET', '/api/storage/list-all', None)]
+
+
+SCENARIOS = {
+    'autocomplete': scenario_autocomplete,
+    'search_all': scenario_search_all,
+    'card_save': scenario_card_save,
+    'zip_download': scenario_zip_download,
+    'storage_list': scenario_storage_list,
+}
+
+
+# ==============================
+# CLIENTS
+# ==============================
+class HttpClient:
+    """Keep-alive HTTP client (isa per virtual user thread)."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.conn = None
+
+    def request(self, method, path, body):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        headers = {}
+        payload = None
+        if body is not None:
+            payload, headers['Content-Type'] = body[0].encode(), body[1]
+        try:
+            self.conn.request(method, path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+            return response.status
+        except (http.client.HTTPException, OSError):
+            self.conn.close()
+            self.conn = None
+            raise
+
+
+class InProcessClient:
+    def __init__(self, flask_app):
+        self.client = flask_app.test_client()
+
+    def request(self, method, path, body):
+        kwargs = {}
+        if body is not None:
+            kwargs = {'data': body[0], 'content_type': body[1]}
+        return self.client.open(path, method=method, **kwargs).status_code
+
+
+# ==============================
+# LOAD LOOP
+# ==============================
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(name, ctx, make_client, concurrency, duration, warmup, seed):
+    scenario = SCENARIOS[name]
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+
+    def worker(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        client = make_client()
+        local, local_errors = [], 0
+        while time.perf_counter() < stop_at:
+            for method, path, body in scenario(ctx, rng):
+                t0 = time.perf_counter()
+                try:
+                    status = client.request(method, path, body)
+                    failed = status >= 500
+                except Exception:
+                    failed = True
+                t1 = time.perf_counter()
+                if t0 >= start_at and t1 <= stop_at:
+                    local.append(t1 - t0)
+                    local_errors += failed
+                if t1 >= stop_at:
+                    break
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    ms = [v * 1000 for v in latencies]
+    return {
+        'scenario': name,
+        'requests': len(ms),
+        'errors': errors[0],
+        'throughput_rps': round(len(ms) / duration, 1),
+        'p50_ms': round(percentile(ms, 50), 2),
+        'p95_ms': round(percentile(ms, 95), 2),
+        'p99_ms': round(percentile(ms, 99), 2),
+        'max_ms': round(ms[-1], 2) if ms else 0.0,
+    }
+
+
+# ==============================
+# GUNICORN LIFECYCLE
+# ==============================
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(args, port):
+    env = dict(os.environ,
+               BENCH_MEMBERS=str(args.members),
+               BENCH_CARD_FRACTION=str(args.card_fraction),
+               BENCH_LATENCY_MS=str(args.latency_ms),
+               BENCH_SEED=str(args.seed),
+               LOG_LEVEL=os.getenv('LOG_LEVEL', 'WARNING'))
+    cmd = [sys.executable, '-m', 'gunicorn', '-w', str(args.workers), '--threads', str(args.threads),
+           '-b', f"127.0.0.1:{port}", '--log-level', 'warning', '--timeout', '120', 'bench.wsgi:app']
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited early (code {proc.returncode})")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("gunicorn did not become healthy in time")
+
+
+def print_table(results):
+    header = f"{'scenario':<14}{'reqs':>8}{'errs':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['scenario']:<14}{r['requests']:>8}{r['errors']:>6}{r['throughput_rps']:>9}"
+              f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['max_ms']:>9}")
+    print("(latencies in ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark app.py against a local fake Supabase.")
+    parser.add_argument('--mode', choices=['gunicorn', 'inprocess'], default='gunicorn')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Repeatable. Default: lahat.")
+    parser.add_argument('--members', type=int, default=500)
+    parser.add_argument('--card-fraction', type=float, default=0.8)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Simulated Supabase round trip.")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=8, help="Virtual users per scenario.")
+    parser.add_argument('--duration', type=float, default=10.0, help="Measured seconds per scenario.")
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', dest='json_out', help="Write results to this file.")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or list(SCENARIOS)
+    ctx = Context(args.members, args.card_fraction, args.seed)
+    proc = None
+
+    if args.mode == 'gunicorn':
+        port = _free_port()
+        proc = start_gunicorn(args, port)
+        make_client = lambda: HttpClient('127.0.0.1', port)  # noqa: E731
+    else:
+        os.environ.update(BENCH_MEMBERS=str(args.members), BENCH_CARD_FRACTION=str(args.card_fraction),
+                          BENCH_LATENCY_MS=str(args.latency_ms), BENCH_SEED=str(args.seed))
+        sys.path.insert(0, ROOT)
+        from bench.wsgi import app as flask_app
+        make_client = lambda: InProcessClient(flask_app)  # noqa: E731
+
+    results = []
+    try:
+        for name in scenarios:
+            results.append(run_scenario(name, ctx, make_client, args.concurrency,
+                                        args.duration, args.warmup, args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    print_table(results)
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump({'config': vars(args), 'results': results}, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+# ==============================
+# SEED DATA para sa FakeSupabase
+# ==============================
+# Deterministic (naka-seed ang random) para pare-pareho ang laman ng bawat
+# gunicorn worker at ng load generator.
+import io
+import base64
+import random
+from datetime import date, datetime, timedelta, timezone
+
+FIRST_NAMES = ["Juan", "Maria", "Pedro", "Ana", "Carlos", "Jose", "Luz", "Ramon", "Teresa", "Andres",
+               "Rosa", "Emilio", "Corazon", "Antonio", "Lorna", "Danilo", "Marites", "Rodel", "Gloria", "Noel"]
+LAST_NAMES = ["Dela Cruz", "Santos", "Garcia", "Rodriguez", "Mendoza", "Reyes", "Bautista", "Aquino",
+              "Villanueva", "Ramos", "Castillo", "Navarro", "Abeleda", "Torres", "Flores", "Gonzales"]
+CHAPTERS = ["Manila Chapter", "Quezon City Chapter", "Makati Chapter", "Pasig Chapter", "Taguig Chapter",
+            "Cebu Chapter", "Davao Chapter", "Iloilo Chapter", "Baguio Chapter", "Bacolod Chapter"]
+DESIGNATIONS = ["Member", "Member", "Member", "Member", "President", "Vice President", "Secretary",
+                "Treasurer", "Auditor", "PRO"]
+BLOOD_TYPES = ["O+", "O-", "A+", "A-", "B+", "B-", "AB+", "AB-"]
+MEMBERSHIP_TYPES = ["Regular", "Associate", "Lifetime"]
+
+CARD_BUCKET = "public_id_cards"
+CARD_FOLDER = "guardian_ids"
+CARD_SIZE = (1011, 638)      # CR80 @ 300dpi
+PHOTO_SIZE = (480, 640)
+
+
+def _image_bytes(size, fmt, seed):
+    """Totoong image (para gumana rin sa Pillow-based code paths), may noise para hindi sobrang liit."""
+    try:
+        from PIL import Image
+    except ImportError:
+        rng = random.Random(seed)
+        return bytes(rng.getrandbits(8) for _ in range(size[0] * size[1] // 8))
+    noise = Image.effect_noise(size, 48).convert('RGB')
+    gradient = Image.linear_gradient('L').resize(size).convert('RGB')
+    img = Image.blend(noise, gradient, 0.6)
+    out = io.BytesIO()
+    img.save(out, format=fmt, **({'quality': 85} if fmt == 'JPEG' else {}))
+    return out.getvalue()
+
+
+def data_url(raw, mimetype):
+    return f"data:{mimetype};base64,{base64.b64encode(raw).decode()}"
+
+
+def sample_photo():
+    return _image_bytes(PHOTO_SIZE, 'JPEG', 1)
+
+
+def sample_card():
+    """Card-like PNG: flat header/background + photo area + text (~150 KB, gaya ng totoong card)."""
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        return _image_bytes(CARD_SIZE, 'PNG', 2)
+    card = Image.linear_gradient('L').resize(CARD_SIZE).convert('RGB')
+    draw = ImageDraw.Draw(card)
+    draw.rectangle([0, 0, CARD_SIZE[0], 90], fill=(20, 60, 140))
+    photo = Image.open(io.BytesIO(_image_bytes((220, 280), 'JPEG', 2)))
+    card.paste(photo, (40, 130))
+    for row in range(6):
+        draw.text((300, 150 + row * 50), "NAME: JUAN DELA CRUZ  CHAPTER: MANILA", fill=(0, 0, 0))
+    out = io.BytesIO()
+    card.save(out, format='PNG')
+    return out.getvalue()
+
+
+def sample_signature():
+    """Gaya ng galing sa signature_pad: full transparent canvas, konting ink sa gitna."""
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        return _image_bytes((700, 250), 'PNG', 3)
+    rng = random.Random(3)
+    canvas = Image.new('RGBA', (700, 250), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(canvas)
+    points = [(180 + i * 12, 125 + rng.randrange(-40, 40)) for i in range(28)]
+    draw.line(points, fill=(0, 0, 0, 255), width=3, joint='curve')
+    out = io.BytesIO()
+    canvas.save(out, format='PNG')
+    return out.getvalue()
+
+
+def synthetic_members(count, seed=42):
+    """Rows para sa 'members' table (walang photo - idinadagdag sa seed())."""
+    rng = random.Random(seed)
+    start = date(2018, 1, 1)
+    members = []
+    for i in range(1, count + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        joined = start + timedelta(days=rng.randrange(0, 365 * 7))
+        members.append({
+            'id': i,
+            'idnumb': f"UGB-{i:06d}",
+            'name': f"{first} {rng.choice('ABCDEFGHIJKLMNOPRSTV')}. {last}",
+            'pseudo_name': f"{first[:3]}{last[:3]}{i}".lower(),
+            'gender': rng.choice(['Male', 'Female']),
+            'birthdate': (date(1960, 1, 1) + timedelta(days=rng.randrange(0, 365 * 40))).isoformat(),
+            'civil_status': rng.choice(['Single', 'Married', 'Widowed']),
+            'country': 'Philippines',
+            'blood_type': rng.choice(BLOOD_TYPES),
+            'designation': rng.choice(DESIGNATIONS),
+            'chapter': rng.choice(CHAPTERS),
+            'date_of_membership': joined.isoformat(),
+            'membership_type': rng.choice(MEMBERSHIP_TYPES),
+            'contact_no': f"09{rng.randrange(10**8, 10**9)}",
+            'email': f"member{i}@example.com",
+            'home_address': f"{rng.randrange(1, 999)} Rizal St., {rng.choice(CHAPTERS).split()[0]}",
+            'height': f"{rng.randrange(150, 190)} cm",
+            'weight': f"{rng.randrange(45, 100)} kg",
+            'occupation': rng.choice(['Driver', 'Teacher', 'Engineer', 'Vendor', 'Nurse', 'Farmer']),
+            'emergency_person_name': f"{rng.choice(FIRST_NAMES)} {last}",
+            'emergency_contact_no': f"09{rng.randrange(10**8, 10**9)}",
+            'emergency_address': 'Same as above',
+            'issued_date': '2024-01-01',
+            'valid_until': '2027-01-01',
+            'generated_card_image': None,
+            'generated_at': None,
+        })
+    return members
+
+
+def card_filenames(member_count, card_fraction=0.8):
+    """Filenames (relative sa guardian_ids/) ng mga member na may generated card na."""
+    return [f"{i}.png" for i in range(1, int(member_count * card_fraction) + 1)]
+
+
+def seed(client, members=500, card_fraction=0.8, layouts=3, officers=10, signatures=5,
+         with_photos=True, seed=42):
+    """Populate a FakeSupabase with synthetic rows and storage objects."""
+    photo = data_url(sample_photo(), 'image/jpeg') if with_photos else None
+    card = sample_card()
+    now = datetime.now(timezone.utc)
+
+    with client.lock:
+        for row in synthetic_members(members, seed):
+            row['photo_data'] = photo
+            client.insert_row('members', row)
+
+        for fname in card_filenames(members, card_fraction):
+            path = f"{CARD_FOLDER}/{fname}"
+            client.put_object(CARD_BUCKET, path, card, 'image/png')
+            member = client.rows('members')[int(fname.split('.')[0]) - 1]
+            member['generated_card_image'] = client.storage.from_(CARD_BUCKET).get_public_url(path)
+            member['generated_at'] = now.isoformat()
+            member['card_bytes'] = len(card)
+            member['card_last_used_at'] = now.isoformat()
+
+        for i in range(layouts):
+            client.insert_row('layouts', {
+                'client_slug': f"client-{i + 1}",
+                'config_json': {
+                    'client_slug': f"client-{i + 1}",
+                    'front': {'photo': {'x': 40, 'y': 120, 'w': 220, 'h': 280},
+                              'name': {'x': 300, 'y': 160, 'font': 'Arial', 'size': 32}},
+                    'back': {'qr': {'x': 700, 'y': 300, 'w': 200}},
+                },
+            })
+
+        signature = data_url(sample_signature(), 'image/png')
+        for i in range(officers):
+            client.insert_row('officer_list', {
+                'name_officer': f"Officer {i + 1}",
+                'designation': DESIGNATIONS[4 + i % 6],
+                'man_signature': signature,
+                'text_signature': '',
+            })
+        for i in range(signatures):
+            client.insert_row('signaturetable', {'name': f"Signatory {i + 1}", 'signature': signature})
+
+        client.insert_row('admin_forms', {'forms_name': 'Officer Signature'})
+        client.insert_row('admin_forms', {'forms_name': 'Mode of Payment'})
+        client.insert_row('system_settings', {
+            'id': 1, 'main_title': 'UGBROMOVE App', 'sub_title': 'Benchmark',
+            'company_name': 'Bench Co.', 'logo_url': '',
+        })
+        # Para hindi tumakbo ang cleanup sweep habang nagbe-benchmark
+        client.insert_row('idgenerate', {
+            'idnumber': 'UGB-000000', 'client_slug': None,
+            'last_card_cleanup': datetime.now().isoformat(),
+        })
+    return client
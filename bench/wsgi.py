@@ -0,0 +1,34 @@
+# ==============================
+# WSGI ENTRY POINT NA NAKA-FAKE SUPABASE
+# ==============================
+#   gunicorn -w 4 bench.wsgi:app
+#
+# Env:
+#   BENCH_MEMBERS        default 500
+#   BENCH_CARD_FRACTION  default 0.8
+#   BENCH_LATENCY_MS     default 0 - simulated Supabase round trip
+#   BENCH_SEED           default 42
+#
+# NOTE: Bawat worker ay may sariling kopya ng fake data (same seed, kaya
+# pareho ang simula). Hindi nakikita ng ibang worker ang writes ng isa.
+import os
+
+# Dapat naka-set bago i-import ang app (load_dotenv ay hindi nag-o-override)
+os.environ.setdefault("SUPAB_URL", "http://fake-supabase.local")
+os.environ.setdefault("SUPAB_SERVICE_KEY", "bench.fake.key")
+
+import app as app_module  # noqa: E402
+import metrics  # noqa: E402
+from bench import seed  # noqa: E402
+from bench.fake_supabase import FakeSupabase  # noqa: E402
+
+fake = FakeSupabase(url=os.environ["SUPAB_URL"], latency_ms=float(os.getenv("BENCH_LATENCY_MS", "0")))
+seed.seed(
+    fake,
+    members=int(os.getenv("BENCH_MEMBERS", "500")),
+    card_fraction=float(os.getenv("BENCH_CARD_FRACTION", "0.8")),
+    seed=int(os.getenv("BENCH_SEED", "42")),
+)
+app_module.supabase = metrics.instrument_client(fake)
+
+app = app_module.app
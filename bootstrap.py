@@ -0,0 +1,109 @@
+# ==============================
+# BOOTSTRAP: Isang request para sa lahat ng data ng isang page
+# ==============================
+# Pagbukas ng admin.html, signature.html at id_pdf_generator.html, sunod-sunod
+# na fetch ang ginagawa (officers, admin forms, layout, members by date...).
+# Bawat isa ay sariling worker slot + sariling Supabase round trip.
+#
+# GET /api/bootstrap/<page>?client_slug=...&date=...
+#   - ang sections ng page ay sabay-sabay na niloload (thread pool)
+#   - ang buong resulta ay naka-shared cache per page + params; ang key ay may
+#     kasamang version ng bawat namespace na pinagkukunan ng sections, kaya
+#     ang bump() sa layouts / forms / signatures / members = bagong bootstrap
+#   - pumalyang section = null + nasa 'errors' (hindi kina-cache ang resulta)
+#
+# Ang sections ay nirerehistro ng app.py (section() / page()), dahil doon
+# nakatira ang mga loader.
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+import logging_setup
+from singleflight import Group
+
+log = logging_setup.get_logger('bootstrap')
+
+BOOTSTRAP_CONCURRENCY = int(os.getenv("BOOTSTRAP_CONCURRENCY", "4"))
+
+BOOTSTRAP_SECTION_SECONDS = metrics.REGISTRY.histogram(
+    'bootstrap_section_seconds', 'Time to load each bootstrap section (cache misses only).', ('section',))
+
+
+class BootstrapError(ValueError):
+    pass
+
+
+class Bootstrap:
+    def __init__(self, cache, concurrency=BOOTSTRAP_CONCURRENCY):
+        self._cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='bootstrap')
+        self._flights = Group('bootstrap', window=0)
+        self._sections = {}    # name -> (loader(params), namespaces, params it uses)
+        self._pages = {}       # page -> [section names]
+
+    def section(self, name, loader, namespaces=(), params=()):
+        """loader(params) -> JSON-able. `params` = aling query params ang nakakaapekto."""
+        self._sections[name] = (loader, tuple(namespaces), tuple(params))
+
+    def page(self, name, *sections):
+        unknown = [s for s in sections if s not in self._sections]
+        if unknown:
+            raise BootstrapError(f"Unknown bootstrap sections: {unknown}")
+        self._pages[name] = list(sections)
+
+    def pages(self):
+        return {name: list(sections) for name, sections in self._pages.items()}
+
+    def _cache_key(self, page, sections, params):
+        namespaces, used = [], set()
+        for name in sections:
+            _, section_namespaces, section_params = self._sections[name]
+            namespaces.extend(ns for ns in section_namespaces if ns not in namespaces)
+            used.update(section_params)
+        version = '.'.join(str(ns.version()) for ns in namespaces)
+        args = '&'.join(f"{k}={params.get(k) or ''}" for k in sorted(used))
+        return f"{page}:{version}:{args}"
+
+    def build(self, page, params):
+        """Returns {'page', 'data': {section: value}, 'errors': {section: message}}."""
+        sections = self._pages.get(page)
+        if sections is None:
+            raise BootstrapError(f"Unknown page: {page}")
+        try:
+            key = self._cache_key(page, sections, params)
+            cached = self._cache.get(key)
+        except Exception as e:
+            log.warning(f"Bootstrap cache unavailable for {page}: {e}")
+            key, cached = None, None
+        if cached is not None:
+            return dict(cached, cached=True)
+
+        def gather():
+            result = self._gather(page, sections, params)
+            if key and not result['errors']:
+                self._cache.set(key, result)
+            return result
+
+        result = self._flights.do(key or f"{page}:nocache:{sorted(params.items())}", gather)
+        return dict(result, cached=False)
+
+    def _timed(self, name, params):
+        loader = self._sections[name][0]
+        start = time.perf_counter()
+        try:
+            return loader(params)
+        finally:
+            BOOTSTRAP_SECTION_SECONDS.observe(time.perf_counter() - start, section=name)
+
+    def _gather(self, page, sections, params):
+        futures = {name: self._pool.submit(self._timed, name, params) for name in sections}
+        data, errors = {}, {}
+        for name, future in futures.items():
+            try:
+                data[name] = future.result()
+            except Exception as e:
+                log.error(f"Bootstrap section '{name}' failed for {page}: {e}")
+                data[name] = None
+                errors[name] = str(e)
+        return {'page': page, 'data': data, 'errors': errors}
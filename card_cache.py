@@ -0,0 +1,214 @@
+# ==============================
+# CARD CACHE: Fingerprint-based freshness para sa generated ID cards
+# ==============================
+# Dati: bawat 13 oras, binubura ang lahat ng card na lampas 24 oras kahit
+# walang nagbago sa member -> paulit-ulit na html2canvas + upload.
+# Ngayon, bawat card ay may fingerprint (sha256) ng:
+#   - member fields na talagang lumalabas sa card (see CARD_FIELDS)
+#   - version ng layout na ginamit (hash ng config_json)
+# Invalidate lang kapag nagbago ang inputs:
+#   - add_member (update)  -> invalidate_member()
+#   - save_layout          -> invalidate_layout()
+# Eviction: LRU (card_last_used_at) kapag lampas sa CARD_STORAGE_BUDGET_MB,
+# hindi na by age.
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime, timezone
+
+CARD_BUCKET = 'public_id_cards'
+CARD_FOLDER = 'guardian_ids'
+
+CARD_STORAGE_BUDGET_MB = float(os.getenv("CARD_STORAGE_BUDGET_MB", "1024"))
+LAYOUT_VERSION_TTL_SECONDS = float(os.getenv("CARD_LAYOUT_VERSION_TTL_SECONDS", "30"))
+# Para sa lumang cards na wala pang card_bytes (bago ang migration)
+ESTIMATED_CARD_BYTES = 150 * 1024
+
+# Mga field na ginagamit ng getMemberVal() sa id_pdf_generator.html
+CARD_FIELDS = (
+    'name', 'pseudo_name', 'idnumb', 'designation', 'blood_type', 'home_address', 'contact_no',
+    'emergency_person_name', 'emergency_address', 'emergency_contact_no', 'issued_date',
+    'valid_until', 'chapter', 'height', 'weight', 'occupation', 'birthdate', 'civil_status',
+    'photo_data', 'signature', 'qr_code',
+)
+CACHE_COLUMNS = ('generated_card_image', 'card_fingerprint', 'card_layout')
+
+GENERIC_LAYOUT = ''   # card_layout value kapag walang client_slug (latest layout)
+
+
+def layout_version(config_json):
+    if config_json is None:
+        return 'none'
+    return hashlib.sha1(json.dumps(config_json, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def fingerprint(member, layout_ver):
+    h = hashlib.sha256(layout_ver.encode())
+    for field in CARD_FIELDS:
+        h.update(b'\x1f' + field.encode() + b'=' + str(member.get(field) or '').encode())
+    return h.hexdigest()
+
+
+def card_path(member_id):
+    return f"{CARD_FOLDER}/{member_id}.png"
+
+
+def path_from_url(url):
+    if url and f'/{CARD_BUCKET}/' in url:
+        return url.split(f'/{CARD_BUCKET}/')[-1].split('?', 1)[0] or None
+    return None
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class CardCache:
+    def __init__(self, get_db, storage_budget_bytes=CARD_STORAGE_BUDGET_MB * 1024 * 1024,
+                 layout_ttl=LAYOUT_VERSION_TTL_SECONDS, on_removed=None):
+        self._get_db = get_db
+        # Callback(paths) pagkatapos burahin sa storage (hal. image proxy cache)
+        self._on_removed = on_removed
+        self.storage_budget_bytes = storage_budget_bytes
+        self.layout_ttl = layout_ttl
+        self._lock = threading.Lock()
+        self._layout_versions = {}   # layout key -> (loaded_at, version)
+
+    # ------------------------------
+    # LAYOUT VERSION
+    # ------------------------------
+    def layout_version_for(self, client_slug=None):
+        key = client_slug or GENERIC_LAYOUT
+        with self._lock:
+            cached = self._layout_versions.get(key)
+            if cached and time.monotonic() - cached[0] < self.layout_ttl:
+                return cached[1]
+
+        query = self._get_db().from_('layouts').select('config_json')
+        if key:
+            query = query.eq('client_slug', key)
+        else:
+            # Gaya ng /load_layout na walang client_slug
+            query = query.order('created_at', desc=True)
+        rows = query.limit(1).execute().data or []
+        version = layout_version(rows[0].get('config_json') if rows else None)
+
+        with self._lock:
+            self._layout_versions[key] = (time.monotonic(), version)
+        return version
+
+    # ------------------------------
+    # LOOKUP
+    # ------------------------------
+    def _load_members(self, member_ids):
+        columns = ', '.join(('id',) + CARD_FIELDS + CACHE_COLUMNS)
+        rows = self._get_db().from_('members').select(columns).in_('id', list(member_ids)).execute().data or []
+        return {str(r['id']): r for r in rows}
+
+    def check(self, member_id, client_slug=None):
+        """Returns (fresh, fingerprint, member_row). fresh = may card na at tugma ang fingerprint."""
+        row = self._load_members([member_id]).get(str(member_id))
+        if row is None:
+            return False, None, None
+        fp = fingerprint(row, self.layout_version_for(client_slug))
+        fresh = bool(row.get('generated_card_image')) and row.get('card_fingerprint') == fp
+        return fresh, fp, row
+
+    def status(self, member_ids, client_slug=None):
+        """Bulk check para sa generator page: {'fresh': [...], 'stale': [...]}."""
+        version = self.layout_version_for(client_slug)
+        rows = self._load_members(member_ids)
+        fresh, stale = [], []
+        for mid in member_ids:
+            row = rows.get(str(mid))
+            if (row and row.get('generated_card_image')
+                    and row.get('card_fingerprint') == fingerprint(row, version)):
+                fresh.append(mid)
+            else:
+                stale.append(mid)
+        if fresh:
+            self.touch(fresh)
+        return {'fresh': fresh, 'stale': stale, 'layout_version': version}
+
+    # ------------------------------
+    # WRITE / TOUCH
+    # ------------------------------
+    def record(self, member_id, url, size, fp, client_slug=None):
+        now = _now_iso()
+        self._get_db().from_('members').update({
+            'generated_card_image': url,
+            'generated_at': now,
+            'card_fingerprint': fp,
+            'card_layout': client_slug or GENERIC_LAYOUT,
+            'card_bytes': size,
+            'card_last_used_at': now,
+        }).eq('id', member_id).execute()
+
+    def touch(self, member_ids):
+        if member_ids:
+            self._get_db().from_('members').update({'card_last_used_at': _now_iso()}) \
+                .in_('id', list(member_ids)).execute()
+
+    # ------------------------------
+    # INVALIDATION
+    # ------------------------------
+    def _clear(self, rows, storage):
+        """Burahin sa storage + i-null ang cache columns. Returns bilang ng na-clear."""
+        if not rows:
+            return 0
+        paths = {path_from_url(r.get('generated_card_image')) or card_path(r['id']) for r in rows}
+        try:
+            storage.from_(CARD_BUCKET).remove(sorted(paths))
+        except Exception:
+            pass  # Hindi critical; null pa rin ang DB para ma-regenerate
+        if self._on_removed:
+            self._on_removed(sorted(paths))
+        self._get_db().from_('members').update({
+            'generated_card_image': None,
+            'generated_at': None,
+            'card_fingerprint': None,
+            'card_bytes': None,
+        }).in_('id', [r['id'] for r in rows]).execute()
+        return len(rows)
+
+    def invalidate_member(self, member_id, storage):
+        """Tawagin pagkatapos ng member update. Buburahin lang ang card kung nagbago ang fingerprint."""
+        row = self._load_members([member_id]).get(str(member_id))
+        if not row or not row.get('generated_card_image'):
+            return False
+        fp = fingerprint(row, self.layout_version_for(row.get('card_layout') or None))
+        if row.get('card_fingerprint') == fp:
+            return False
+        return self._clear([row], storage) > 0
+
+    def invalidate_layout(self, client_slug, storage):
+        """Tawagin pagkatapos ng save_layout na nagbago ang config."""
+        key = client_slug or GENERIC_LAYOUT
+        with self._lock:
+            self._layout_versions.pop(key, None)
+        rows = self._get_db().from_('members').select('id, generated_card_image') \
+            .eq('card_layout', key).neq('generated_card_image', '').execute().data or []
+        return self._clear(rows, storage)
+
+    # ------------------------------
+    # EVICTION (LRU + storage budget)
+    # ------------------------------
+    def evict_over_budget(self, storage):
+        rows = self._get_db().from_('members') \
+            .select('id, generated_card_image, card_bytes, card_last_used_at, generated_at') \
+            .neq('generated_card_image', '').execute().data or []
+        total = sum(r.get('card_bytes') or ESTIMATED_CARD_BYTES for r in rows)
+        if total <= self.storage_budget_bytes:
+            return 0
+
+        # Least recently used muna; ang walang card_last_used_at (legacy) ang pinakauna
+        rows.sort(key=lambda r: r.get('card_last_used_at') or r.get('generated_at') or '')
+        victims = []
+        for row in rows:
+            if total <= self.storage_budget_bytes:
+                break
+            victims.append(row)
+            total -= row.get('card_bytes') or ESTIMATED_CARD_BYTES
+        return self._clear(victims, storage)
@@ -0,0 +1,152 @@
+# ==============================
+# DELTA SYNC: "Changes since version X" para sa admin / generator / phone pages
+# ==============================
+# Ang mga page ay may IndexedDB copy (static/js/delta_sync.js). Sa bawat load,
+# ang hinihingi lang ay ang nagbago mula sa huling cursor:
+#   - upserts: rows na updated_at > cursor (trigger sa supabase_setup.sql)
+#   - deletes: sync_tombstones (AFTER DELETE trigger)
+#
+# Cursor = "<updated_at>|<id>". Kailangan ang id kasi ang isang bulk UPDATE
+# ay iisa ang NOW() para sa lahat ng rows - kung timestamp lang, hindi
+# uusad ang pagination kapag mas marami sa `limit` ang may parehong oras.
+#
+# Kapag mas luma ang cursor kaysa sa tombstone retention, `reset: true` at
+# full snapshot ang ibinabalik (baka may na-purge na tombstones).
+#
+# Ang 'members' ay walang MEDIA_COLUMNS (photo / pirma / QR): ilang MB ang
+# buong table kung kasama. Kinukuha lang ang media ng mga napiling members
+# (media(), GET /api/members/media).
+import os
+from datetime import datetime, timedelta, timezone
+
+import member_query
+
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+SYNC_MAX_PAGE_SIZE = 2000
+SYNC_MEDIA_MAX_IDS = int(os.getenv("SYNC_MEDIA_MAX_IDS", "200"))
+TOMBSTONE_RETENTION_DAYS = float(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+TOMBSTONE_TABLE = 'sync_tombstones'
+
+# resource -> (table, projected columns)
+RESOURCES = {
+    'members': ('members', ', '.join(member_query.CACHED_COLUMNS)),
+    'officers': ('officer_list', 'id, name_officer, designation, text_signature, created_at, updated_at'),
+    'cards': ('members', 'id, name, generated_card_image, generated_at, updated_at'),
+    # In-memory facet snapshot ng bawat worker (see member_facets.py)
+    'facets': ('members', 'id, chapter, designation, blood_type, membership_type, '
+                          'date_of_membership, generated_card_image, updated_at'),
+}
+
+
+class SyncError(ValueError):
+    pass
+
+
+def parse_cursor(cursor):
+    """'2026-01-01T00:00:00+00:00|42' -> ('2026-...', 42). Walang cursor -> (None, None)."""
+    if not cursor:
+        return None, None
+    # Hindi na-encode na '+' sa query string ay nagiging space
+    stamp, _, row_id = cursor.replace(' ', '+').rpartition('|')
+    if not stamp:
+        stamp, row_id = row_id, '0'
+    try:
+        return stamp, int(row_id or 0)
+    except ValueError:
+        raise SyncError(f"Invalid cursor: {cursor!r}")
+
+
+def make_cursor(stamp, row_id):
+    return f"{stamp}|{row_id}" if stamp else None
+
+
+def _parse_stamp(stamp):
+    value = datetime.fromisoformat(stamp.replace('Z', '+00:00'))
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _is_expired(stamp):
+    try:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+        return _parse_stamp(stamp) < cutoff
+    except ValueError:
+        raise SyncError(f"Invalid cursor timestamp: {stamp!r}")
+
+
+def changes(db, resource, cursor=None, limit=SYNC_PAGE_SIZE):
+    """
+    Returns {'resource', 'cursor', 'changes', 'deleted', 'has_more', 'reset'}.
+    Ulit-ulitin ng client habang has_more, gamit ang ibinalik na cursor.
+    """
+    if resource not in RESOURCES:
+        raise SyncError(f"Unknown resource: {resource}")
+    table, columns = RESOURCES[resource]
+    try:
+        limit = max(1, min(int(limit), SYNC_MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise SyncError(f"Invalid limit: {limit!r}")
+
+    since_stamp, since_id = parse_cursor(cursor)
+    reset = since_stamp is not None and _is_expired(since_stamp)
+    if reset:
+        since_stamp, since_id = None, None
+
+    rows = []
+    if since_stamp is not None:
+        # A. Natitirang rows na kapareho ng timestamp ng cursor (bulk update)
+        rows = db.from_(table).select(columns).eq('updated_at', since_stamp).gt('id', since_id) \
+            .order('id').limit(limit).execute().data or []
+    if len(rows) < limit:
+        # B. Mga mas bago
+        query = db.from_(table).select(columns)
+        if since_stamp is not None:
+            query = query.gt('updated_at', since_stamp)
+        rows += query.order('updated_at').order('id').limit(limit - len(rows)).execute().data or []
+
+    has_more = len(rows) >= limit
+    if rows:
+        next_stamp, next_id = rows[-1]['updated_at'], rows[-1]['id']
+    else:
+        next_stamp, next_id = since_stamp, since_id
+
+    # Tombstones: (since, next] lang kapag may kasunod pang page, para sakto ang hati
+    deleted = []
+    if since_stamp is not None:
+        query = db.from_(TOMBSTONE_TABLE).select('row_id, deleted_at') \
+            .eq('table_name', table).gt('deleted_at', since_stamp)
+        if has_more:
+            query = query.lte('deleted_at', next_stamp)
+        tombstones = query.order('deleted_at').execute().data or []
+        deleted = [t['row_id'] for t in tombstones]
+        if tombstones and not has_more and (next_stamp is None or tombstones[-1]['deleted_at'] > next_stamp):
+            next_stamp, next_id = tombstones[-1]['deleted_at'], 0
+
+    return {
+        'resource': resource,
+        'cursor': make_cursor(next_stamp, next_id),
+        'changes': rows,
+        'deleted': deleted,
+        'has_more': has_more,
+        'reset': reset or cursor is None,
+    }
+
+
+def media(db, ids):
+    """MEDIA_COLUMNS ng ilang members (by id), para sa mga row galing sa 'members' sync."""
+    try:
+        ids = sorted({int(member_id) for member_id in ids})
+    except (TypeError, ValueError):
+        raise SyncError(f"Invalid member ids: {ids!r}")
+    if len(ids) > SYNC_MEDIA_MAX_IDS:
+        raise SyncError(f"Too many ids (max {SYNC_MEDIA_MAX_IDS})")
+    if not ids:
+        return []
+    columns = ', '.join(('id',) + member_query.MEDIA_COLUMNS)
+    return db.from_('members').select(columns).in_('id', ids).execute().data or []
+
+
+def purge_tombstones(db):
+    """Tinatawag ng cleanup scanner. Ang cursor na mas luma dito ay magre-reset (full sync)."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+    db.from_(TOMBSTONE_TABLE).delete().lt('deleted_at', cutoff.isoformat()).execute()
@@ -0,0 +1,176 @@
+# ==============================
+# DIRECT UPLOAD: Signed upload URLs para sa photos at cards
+# ==============================
+# Dati, ang card PNG (save_card_image) at member photo (add_member) ay base64
+# sa JSON / form field: +33% na laki, dine-decode ng worker, tapos ina-upload
+# ulit sa Supabase. Dalawang beses dumadaan sa gunicorn ang bytes.
+#
+# Ngayon (static/js/direct_upload.js):
+#   1. POST /api/uploads/sign     -> signed upload URL + ticket (maliit na JSON)
+#   2. PUT  <signed upload URL>   -> binary, diretso sa Supabase Storage
+#   3. POST /api/uploads/confirm  -> sinusuri ang object (size, type), saka
+#                                    nire-record (cards) o ibinabalik ang URL (photos)
+#
+# Ang ticket ay HMAC-signed (path, kind, member, expiry), kaya ang confirm ay
+# tumatanggap lang ng path na inisyu natin, at hanggang UPLOAD_TICKET_TTL_SECONDS lang.
+# Sa confirm, dapat tugma ang path sa kind / member / content type ng ticket at
+# ang mimetype ng object sa 'ct'; kung hindi, buburahin ang object.
+import os
+import re
+import hmac
+import json
+import time
+import uuid
+import base64
+import hashlib
+
+UPLOAD_BUCKET = 'public_id_cards'
+UPLOAD_TICKET_TTL_SECONDS = int(os.getenv("UPLOAD_TICKET_TTL_SECONDS", "600"))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(5 * 1024 * 1024)))
+
+CARD = 'card'
+PHOTO = 'photo'
+
+# kind -> (folder, allowed content types)
+KINDS = {
+    CARD: ('guardian_ids', ('image/png',)),
+    PHOTO: ('member_photos', ('image/jpeg', 'image/png', 'image/webp')),
+}
+_EXTENSIONS = {'image/jpeg': 'jpg', 'image/png': 'png', 'image/webp': 'webp'}
+
+
+class UploadError(ValueError):
+    pass
+
+
+# ==============================
+# TICKETS
+# ==============================
+def _b64(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def make_ticket(secret, payload):
+    body = _b64(json.dumps(payload, separators=(',', ':')).encode())
+    signature = _b64(hmac.new(secret.encode(), body.encode(), hashlib.sha256).digest())
+    return f"{body}.{signature}"
+
+
+def read_ticket(secret, ticket):
+    body, _, signature = (ticket or '').partition('.')
+    expected = _b64(hmac.new(secret.encode(), body.encode(), hashlib.sha256).digest())
+    if not body or not hmac.compare_digest(signature, expected):
+        raise UploadError("Invalid upload ticket")
+    payload = json.loads(_unb64(body))
+    if payload.get('exp', 0) < time.time():
+        raise UploadError("Upload ticket expired")
+    return payload
+
+
+# ==============================
+# SIGN / CONFIRM
+# ==============================
+def object_path(kind, member_id=None, content_type='image/png'):
+    folder, allowed = KINDS[kind]
+    if content_type not in allowed:
+        raise UploadError(f"Unsupported content type for {kind}: {content_type}")
+    if kind == CARD:
+        # Parehong static filename gaya ng save_card_image (overwrite, hindi duplicate)
+        return f"{folder}/{int(member_id)}.png"
+    return f"{folder}/{uuid.uuid4().hex}.{_EXTENSIONS[content_type]}"
+
+
+def path_matches(path, kind, member_id=None, content_type='image/png'):
+    """True kung ang `path` ay kayang ibigay ng object_path() para sa parehong inputs."""
+    try:
+        expected = object_path(kind, member_id, content_type)
+    except (KeyError, TypeError, ValueError):
+        return False
+    if kind == CARD:
+        return path == expected
+    folder = KINDS[kind][0]
+    return re.fullmatch(rf"{folder}/[0-9a-f]{{32}}\.{_EXTENSIONS[content_type]}", path or '') is not None
+
+
+def _upsert_options():
+    try:
+        from storage3.types import CreateSignedUploadUrlOptions
+    except ImportError:
+        return {'upsert': 'true'}
+    return CreateSignedUploadUrlOptions(upsert='true')
+
+
+def issue(storage, secret, kind, member_id=None, content_type=None, extra=None):
+    """Returns {'upload_url', 'path', 'ticket', 'content_type', 'expires_in'}."""
+    if kind not in KINDS:
+        raise UploadError(f"Unknown upload kind: {kind}")
+    if kind == CARD and not str(member_id or '').isdigit():
+        raise UploadError("Card uploads require a numeric member_id")
+    content_type = content_type or KINDS[kind][1][0]
+    path = object_path(kind, member_id, content_type)
+
+    bucket = storage.from_(UPLOAD_BUCKET)
+    # Card = fixed path kaya kailangang upsert; photo = laging bagong pangalan
+    signed = bucket.create_signed_upload_url(path, _upsert_options()) if kind == CARD \
+        else bucket.create_signed_upload_url(path)
+
+    ticket = make_ticket(secret, {
+        'k': kind, 'p': path, 'm': member_id, 'ct': content_type,
+        'exp': int(time.time()) + UPLOAD_TICKET_TTL_SECONDS, **(extra or {}),
+    })
+    return {'upload_url': signed['signed_url'], 'path': path, 'ticket': ticket,
+            'content_type': content_type, 'expires_in': UPLOAD_TICKET_TTL_SECONDS}
+
+
+def _object_size(info):
+    # Totoong storage API: top-level 'size'; listing-style: metadata.size
+    size = info.get('size')
+    if size is None:
+        size = (info.get('metadata') or {}).get('size')
+    return int(size or 0)
+
+
+def _object_mimetype(info):
+    # Totoong storage API: top-level 'content_type'; listing-style: metadata.mimetype
+    mimetype = info.get('content_type') or (info.get('metadata') or {}).get('mimetype') or ''
+    return mimetype.split(';', 1)[0].strip().lower()
+
+
+def _discard(bucket, path):
+    # Huwag hayaang nakatambak ang sobrang laki / sirang / maling upload
+    try:
+        bucket.remove([path])
+    except Exception:
+        pass
+
+
+def confirm(storage, secret, ticket):
+    """
+    Sinusuri na nandoon na ang object at pasok sa limit.
+    Returns ang ticket payload + 'bytes' + 'url'.
+    """
+    payload = read_ticket(secret, ticket)
+    bucket = storage.from_(UPLOAD_BUCKET)
+    path = payload.get('p')
+    if not path_matches(path, payload.get('k'), payload.get('m'), payload.get('ct')):
+        raise UploadError(f"Upload ticket path does not match its kind: {path}")
+    try:
+        info = bucket.info(path)
+    except Exception as e:
+        raise UploadError(f"Upload not found: {path} ({e})")
+
+    size = _object_size(info)
+    if size <= 0 or size > UPLOAD_MAX_BYTES:
+        _discard(bucket, path)
+        raise UploadError(f"Uploaded file size {size} is outside the allowed range (max {UPLOAD_MAX_BYTES} bytes)")
+
+    mimetype = _object_mimetype(info)
+    if mimetype != payload['ct']:
+        _discard(bucket, path)
+        raise UploadError(f"Uploaded file type {mimetype or 'unknown'} does not match {payload['ct']}")
+
+    return {**payload, 'bytes': size, 'url': bucket.get_public_url(path)}
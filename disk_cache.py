@@ -0,0 +1,208 @@
+# ==============================
+# DISK CACHE: Size-bounded LRU ng files sa local disk (shared ng workers sa host)
+# ==============================
+# Ginagamit ng image proxy (resized cards/photos) at ng ZIP archive cache.
+# Para sa malalaking binary na sine-serve via send_file (sendfile + Range),
+# hindi para sa maliliit na JSON values (iyon ay shared_cache).
+#
+# Layout: <directory>/<key path>/<variant>-<etag>.<ext>
+# Isang directory per key, kaya ang invalidate(key) = rmtree lang. Ang
+# key_path(key) ang nagmamapa ng key sa path components (default: sha1).
+#
+# LRU: atime (itinatakda natin sa bawat hit) ang recency, mtime ang edad
+# (ttl). Kapag lumampas sa max_bytes, binubura ang pinakamatagal nang hindi
+# nagamit hanggang bumaba sa 90%. Atomic ang writes (temp file + rename), kaya
+# ang ibang worker ay hindi nakakabasa ng kalahating file.
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import namedtuple
+
+import metrics
+import logging_setup
+
+log = logging_setup.get_logger('disk_cache')
+
+DISK_CACHE_REQUESTS = metrics.REGISTRY.counter(
+    'disk_cache_requests_total', 'Disk cache lookups by result (hit, miss, error).', ('cache', 'result'))
+DISK_CACHE_EVICTIONS = metrics.REGISTRY.counter(
+    'disk_cache_evictions_total', 'Disk cache files removed by reason (lru, ttl, invalidate).', ('cache', 'reason'))
+DISK_CACHE_BYTES = metrics.REGISTRY.gauge(
+    'disk_cache_bytes', 'Approximate bytes in the disk cache (as seen by this worker).', ('cache', 'pid'))
+
+CONTENT_TYPES = {
+    'png': 'image/png', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'webp': 'image/webp',
+    'zip': 'application/zip', 'json': 'application/json',
+}
+
+Entry = namedtuple('Entry', 'path etag content_type size')
+
+_TMP_DIR = '.tmp'
+
+
+def _hashed_path(key):
+    digest = hashlib.sha1(str(key).encode()).hexdigest()
+    return [digest[:2], digest]
+
+
+def _file_etag(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()[:20]
+
+
+class DiskCache:
+    def __init__(self, name, directory, max_bytes, ttl, key_path=_hashed_path):
+        self.name = name
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._key_path = key_path
+        self._lock = threading.Lock()
+        self._approx_bytes = None     # lazy: unang put() ang nag-i-scan
+
+    def key_dir(self, key):
+        return os.path.join(self.directory, *self._key_path(key))
+
+    def _entry(self, path, size):
+        name = os.path.basename(path)
+        etag, _, ext = name.split('-', 1)[1].partition('.')
+        return Entry(path, etag, CONTENT_TYPES.get(ext, 'application/octet-stream'), size)
+
+    def get(self, key, variant):
+        key_dir = self.key_dir(key)
+        try:
+            names = os.listdir(key_dir)
+        except FileNotFoundError:
+            DISK_CACHE_REQUESTS.inc(cache=self.name, result='miss')
+            return None
+        prefix = variant + '-'
+        for name in names:
+            if not name.startswith(prefix):
+                continue
+            path = os.path.join(key_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                break
+            now = time.time()
+            if now - stat.st_mtime > self.ttl:
+                self._unlink(path, 'ttl')
+                break
+            os.utime(path, (now, stat.st_mtime))    # LRU recency = atime
+            DISK_CACHE_REQUESTS.inc(cache=self.name, result='hit')
+            return self._entry(path, stat.st_size)
+        DISK_CACHE_REQUESTS.inc(cache=self.name, result='miss')
+        return None
+
+    def temp_path(self, suffix=''):
+        """Temp file sa parehong filesystem (para atomic ang put_file)."""
+        tmp_dir = os.path.join(self.directory, _TMP_DIR)
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=tmp_dir, suffix=suffix)
+        os.close(fd)
+        return path
+
+    def put(self, key, variant, data, ext):
+        tmp = self.temp_path()
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        return self._commit(key, variant, tmp, ext, hashlib.sha1(data).hexdigest()[:20], len(data))
+
+    def put_file(self, key, variant, tmp_path, ext):
+        """Ilipat ang file galing temp_path() papasok sa cache (walang kopya)."""
+        return self._commit(key, variant, tmp_path, ext, _file_etag(tmp_path), os.path.getsize(tmp_path))
+
+    def _commit(self, key, variant, tmp, ext, etag, size):
+        key_dir = self.key_dir(key)
+        os.makedirs(key_dir, exist_ok=True)
+        path = os.path.join(key_dir, f"{variant}-{etag}.{ext}")
+        os.replace(tmp, path)
+        # Lumang variant ng parehong key (ibang etag) = tanggalin
+        for name in os.listdir(key_dir):
+            if name.startswith(variant + '-') and os.path.join(key_dir, name) != path:
+                self._unlink(os.path.join(key_dir, name), 'invalidate')
+        self._account(size)
+        return self._entry(path, size)
+
+    def invalidate(self, *keys):
+        for key in keys:
+            try:
+                shutil.rmtree(self.key_dir(key))
+                DISK_CACHE_EVICTIONS.inc(cache=self.name, reason='invalidate')
+            except (FileNotFoundError, ValueError):
+                pass
+
+    def clear(self, *subdir):
+        """clear() = lahat; clear('guardian_ids') = isang subdirectory lang."""
+        shutil.rmtree(os.path.join(self.directory, *subdir), ignore_errors=True)
+        with self._lock:
+            self._approx_bytes = None
+
+    def entries(self, variant):
+        """Lahat ng (path) ng isang variant (hal. manifests) - full scan, bihirang gamitin."""
+        prefix = variant + '-'
+        return [path for path, _ in self._files() if os.path.basename(path).startswith(prefix)]
+
+    def _unlink(self, path, reason):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        DISK_CACHE_EVICTIONS.inc(cache=self.name, reason=reason)
+        with self._lock:
+            if self._approx_bytes is not None:
+                self._approx_bytes -= size
+
+    def _files(self):
+        for root, dirs, names in os.walk(self.directory):
+            if _TMP_DIR in dirs:
+                dirs.remove(_TMP_DIR)
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    yield path, os.stat(path)
+                except FileNotFoundError:
+                    continue
+
+    def _account(self, added):
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = sum(stat.st_size for _, stat in self._files())
+            else:
+                self._approx_bytes += added
+            over = self._approx_bytes > self.max_bytes
+        if over:
+            self.evict()
+        DISK_CACHE_BYTES.set(self._approx_bytes or 0, cache=self.name, pid=os.getpid())
+
+    def evict(self):
+        """Scan ng buong cache; LRU hanggang 90% ng max. Returns ang na-free na bytes."""
+        with self._lock:
+            files = sorted(self._files(), key=lambda item: item[1].st_atime)
+            total = sum(stat.st_size for _, stat in files)
+            target = self.max_bytes * 0.9
+            freed = 0
+            for path, stat in files:
+                if total - freed <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                try:
+                    os.rmdir(os.path.dirname(path))   # wala nang variant = alisin ang key dir
+                except OSError:
+                    pass
+                freed += stat.st_size
+                DISK_CACHE_EVICTIONS.inc(cache=self.name, reason='lru')
+            self._approx_bytes = total - freed
+        if freed:
+            log.info(f"{self.name} cache evicted {freed} bytes")
+        return freed
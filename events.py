@@ -0,0 +1,206 @@
+# ==============================
+# EVENTS: Pub/sub para sa realtime updates (Server-Sent Events)
+# ==============================
+# Ang write routes (add_member, save_card_image, save_layout, ...) ay
+# tumatawag ng publish(); ang /api/events ay nag-i-stream nito sa browsers.
+#
+# Backends (EVENTS_BACKEND):
+#   local    - in-process lang (default; isang worker / dev)
+#   postgres - NOTIFY/LISTEN sa EVENTS_DATABASE_URL para lahat ng gunicorn
+#              workers ay makatanggap ng parehong events. Kailangan ang
+#              `psycopg` (v3, optional dependency).
+#
+# Bawat process ay may maliit na replay buffer para sa Last-Event-ID; kung
+# wala na sa buffer ang hinihinging id, 'resync' event ang ipinapadala
+# (client -> DeltaSync.sync() ulit).
+import os
+import json
+import time
+import uuid
+import queue
+import threading
+from collections import deque
+
+import metrics
+import logging_setup
+
+try:
+    import psycopg  # optional dependency
+except ImportError:
+    psycopg = None
+
+log = logging_setup.get_logger('events')
+
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "local").lower()
+EVENTS_DATABASE_URL = os.getenv("EVENTS_DATABASE_URL", "")
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "idsystem_events")
+EVENTS_REPLAY_SIZE = int(os.getenv("EVENTS_REPLAY_SIZE", "256"))
+EVENTS_SUBSCRIBER_QUEUE = int(os.getenv("EVENTS_SUBSCRIBER_QUEUE", "100"))
+
+EVENTS_PUBLISHED = metrics.REGISTRY.counter(
+    'events_published_total', 'Events published by write routes.', ('type',))
+EVENTS_DROPPED = metrics.REGISTRY.counter(
+    'events_dropped_total', 'Events dropped because a subscriber queue was full.')
+EVENTS_SUBSCRIBERS = metrics.REGISTRY.gauge(
+    'events_subscribers', 'Open /api/events streams per worker.', ('pid',))
+
+
+def make_event(event_type, data):
+    return {'id': f"{time.time_ns():x}-{uuid.uuid4().hex[:6]}", 'type': event_type,
+            'data': data, 'ts': time.time()}
+
+
+class Subscription:
+    def __init__(self, broker):
+        self._broker = broker
+        self.queue = queue.Queue(maxsize=EVENTS_SUBSCRIBER_QUEUE)
+        self.overflowed = False
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """In-process fan-out. Base rin ng PostgresBroker (local delivery + replay buffer)."""
+
+    def __init__(self, replay_size=EVENTS_REPLAY_SIZE):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._recent = deque(maxlen=replay_size)
+
+    # --- publish side ---
+    def publish(self, event):
+        self._deliver(event)
+
+    def _deliver(self, event):
+        with self._lock:
+            self._recent.append(event)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            try:
+                sub.queue.put_nowait(event)
+            except queue.Full:
+                # Mabagal na client: i-resync na lang kaysa lumaki ang memory
+                sub.overflowed = True
+                EVENTS_DROPPED.inc()
+
+    # --- subscribe side ---
+    def subscribe(self):
+        sub = Subscription(self)
+        with self._lock:
+            self._subscribers.add(sub)
+        EVENTS_SUBSCRIBERS.inc(pid=os.getpid())
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            if sub not in self._subscribers:
+                return
+            self._subscribers.discard(sub)
+        EVENTS_SUBSCRIBERS.dec(pid=os.getpid())
+
+    def replay_after(self, last_event_id):
+        """Events pagkatapos ng last_event_id, o None kung wala na sa buffer."""
+        with self._lock:
+            recent = list(self._recent)
+        for index, event in enumerate(recent):
+            if event['id'] == last_event_id:
+                return recent[index + 1:]
+        return None
+
+
+class PostgresBroker(LocalBroker):
+    """
+    publish() -> pg_notify(channel, json). Isang listener thread per process
+    ang nagla-LISTEN at nagde-deliver locally, kaya pati ang sariling events
+    ay dumadaan sa Postgres (iisang order para sa lahat ng workers).
+    """
+
+    def __init__(self, dsn, channel=EVENTS_CHANNEL, **kwargs):
+        if psycopg is None:
+            raise RuntimeError("EVENTS_BACKEND=postgres requires the 'psycopg' package")
+        super().__init__(**kwargs)
+        self.dsn = dsn
+        self.channel = channel
+        self._pid = None
+        self._publish_conn = None
+        self._publish_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _ensure_listener(self):
+        # Lazy + per-process: ang gunicorn workers ay naka-fork pagkatapos ng import
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._publish_conn = None
+            self._stop.clear()
+            threading.Thread(target=self._listen_forever, name='events-listener', daemon=True).start()
+
+    def _listen_forever(self):
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    conn.execute(f'LISTEN "{self.channel}"')
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=5.0):
+                            try:
+                                self._deliver(json.loads(notify.payload))
+                            except ValueError:
+                                log.warning(f"Ignoring malformed event payload: {notify.payload[:200]}")
+            except Exception as e:
+                log.warning(f"Event listener disconnected, retrying: {e}")
+                self._stop.wait(2.0)
+
+    def publish(self, event):
+        self._ensure_listener()
+        payload = json.dumps(event, default=str)
+        with self._publish_lock:
+            try:
+                if self._publish_conn is None or self._publish_conn.closed:
+                    self._publish_conn = psycopg.connect(self.dsn, autocommit=True)
+                self._publish_conn.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+            except Exception:
+                self._publish_conn = None
+                raise
+
+    def subscribe(self):
+        self._ensure_listener()
+        return super().subscribe()
+
+    def close(self):
+        self._stop.set()
+
+
+def create_broker(backend=EVENTS_BACKEND, dsn=EVENTS_DATABASE_URL):
+    if backend == 'postgres':
+        if not dsn:
+            raise RuntimeError("EVENTS_BACKEND=postgres requires EVENTS_DATABASE_URL")
+        return PostgresBroker(dsn)
+    if backend != 'local':
+        raise ValueError(f"Unknown EVENTS_BACKEND: {backend}")
+    return LocalBroker()
+
+
+broker = create_broker()
+
+
+def publish(event_type, **data):
+    """Fire-and-forget: hindi dapat bumagsak ang write route dahil sa events."""
+    try:
+        broker.publish(make_event(event_type, data))
+        EVENTS_PUBLISHED.inc(type=event_type)
+    except Exception as e:
+        log.warning(f"Event publish failed ({event_type}): {e}")
+
+
+def format_sse(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
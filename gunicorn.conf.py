@@ -0,0 +1,37 @@
+# ==============================
+# GUNICORN CONFIG (awtomatikong binabasa kapag tumakbo sa root ng repo)
+# ==============================
+#   gunicorn app:app
+#   gunicorn --preload 'app:warm_app()'     # lazy modules na-import na sa master
+#
+# Default: gthread workers (maraming threads per worker). Ang sync worker ng
+# gunicorn ay isang request lang sa isang pagkakataon, kaya ang isang bukas na
+# SSE stream (/api/events) ay hawak ang buong worker. Kaya:
+#   - gthread:  GUNICORN_THREADS ay dapat mas malaki sa EVENTS_MAX_STREAMS
+#               (app.py), para may matirang threads sa ordinaryong requests
+#   - gevent:   GUNICORN_WORKER_CLASS=gevent (kailangan ang `gevent` package)
+#   - sync:     GUNICORN_WORKER_CLASS=sync -> naka-disable ang /api/events;
+#               ang admin page ay bumabalik sa refresh kapag bumalik sa tab
+#
+# Ang aktwal na config (kasama ang CLI flags, hal. --threads 1 ng bench) ay
+# ine-export sa env bilang SERVER_WORKER_CLASS / SERVER_THREADS / SERVER_TIMEOUT
+# bago mag-fork; doon ibinabatay ng app.py kung bubuksan ang SSE at gaano
+# katagal ang bawat stream (mas maikli sa timeout).
+import os
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+
+def on_starting(server):
+    cfg = server.cfg
+    worker = cfg.worker_class_str
+    if worker == 'sync' and cfg.threads > 1:
+        worker = 'gthread'    # gaya ng ginagawa ng gunicorn mismo
+    os.environ['SERVER_WORKER_CLASS'] = worker
+    os.environ['SERVER_THREADS'] = str(cfg.threads)
+    os.environ['SERVER_TIMEOUT'] = str(cfg.timeout)
@@ -0,0 +1,90 @@
+# ==============================
+# HEALTH: Liveness + Readiness probes
+# ==============================
+# Ang readiness ay talagang tumatama sa Supabase (members table + storage bucket),
+# pero naka-cache ang resulta ng ilang segundo para hindi dumami ang load
+# kahit sunod-sunod ang tawag ng load balancer.
+import os
+import time
+import threading
+from datetime import datetime
+
+import metrics
+
+PROBE_CACHE_SECONDS = float(os.getenv("HEALTH_PROBE_CACHE_SECONDS", "5"))
+DB_MAX_LATENCY_MS = float(os.getenv("HEALTH_DB_MAX_LATENCY_MS", "1500"))
+STORAGE_MAX_LATENCY_MS = float(os.getenv("HEALTH_STORAGE_MAX_LATENCY_MS", "2000"))
+
+PROBE_LATENCY = metrics.REGISTRY.gauge(
+    'readiness_probe_latency_ms', 'Latency of the last readiness probe per dependency.', ('dependency',))
+PROBE_OK = metrics.REGISTRY.gauge(
+    'readiness_probe_ok', '1 if the last readiness probe passed, else 0.', ('dependency',))
+
+
+class DependencyProbe:
+    """Isang dependency check: tinatawag ang fn() at sinusukat ang latency."""
+
+    def __init__(self, name, fn, max_latency_ms):
+        self.name = name
+        self.fn = fn
+        self.max_latency_ms = max_latency_ms
+
+    def run(self):
+        start = time.perf_counter()
+        error = None
+        try:
+            self.fn()
+        except Exception as e:
+            error = str(e)
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        ok = error is None and latency_ms <= self.max_latency_ms
+        if error is None and not ok:
+            error = f"latency {latency_ms}ms above threshold {self.max_latency_ms}ms"
+
+        PROBE_LATENCY.set(latency_ms, dependency=self.name)
+        PROBE_OK.set(1 if ok else 0, dependency=self.name)
+        return {
+            'ok': ok,
+            'latency_ms': latency_ms,
+            'threshold_ms': self.max_latency_ms,
+            'error': error,
+        }
+
+
+class ReadinessChecker:
+    """
+    Runs all probes at most once per `ttl` seconds.
+    Habang may nagpa-probe na, yung ibang requests ay binabalik lang ang last result.
+    """
+
+    def __init__(self, probes, ttl=PROBE_CACHE_SECONDS):
+        self.probes = list(probes)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._result = None
+        self._checked_at = 0.0
+
+    def _fresh(self):
+        return self._result is not None and (time.monotonic() - self._checked_at) < self.ttl
+
+    def check(self):
+        if self._fresh():
+            return self._result
+
+        # Isa lang ang mag-pa-probe; yung iba hintayin siya kung wala pang resulta
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._result
+        try:
+            if self._fresh():
+                return self._result
+            checks = {probe.name: probe.run() for probe in self.probes}
+            self._result = {
+                'status': 'ready' if all(c['ok'] for c in checks.values()) else 'unready',
+                'checks': checks,
+                'checked_at': datetime.now().isoformat(),
+            }
+            self._checked_at = time.monotonic()
+            return self._result
+        finally:
+            self._lock.release()
@@ -0,0 +1,157 @@
+# ==============================
+# HTTP CACHE: Compression + ETag / 304 + Cache-Control
+# ==============================
+# Para sa mga phone na naka-mobile data:
+#   - gzip (o brotli kung naka-install ang `brotli`) para sa JSON/HTML na
+#     lampas sa COMPRESS_MIN_SIZE
+#   - weak ETag galing sa content hash, o sa "data version" ng route kung meron
+#     (para hindi na kailangang patakbuhin yung buong query)
+#   - If-None-Match -> 304 Not Modified
+#   - Cache-Control per route gamit ang @cache_policy(...)
+import os
+import gzip
+import hashlib
+from functools import wraps
+
+from flask import current_app, g, request
+
+try:
+    import brotli  # optional dependency
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/plain', 'text/css', 'text/csv',
+    'application/json', 'application/javascript', 'image/svg+xml',
+}
+
+
+class CachePolicy:
+    def __init__(self, max_age=0, private=False, no_store=False, stale_while_revalidate=None, version=None):
+        self.max_age = max_age
+        self.private = private
+        self.no_store = no_store
+        self.stale_while_revalidate = stale_while_revalidate
+        # Optional callable -> string; mura dapat (e.g. max(updated_at) + count)
+        self.version = version
+
+    def header_value(self):
+        if self.no_store:
+            return 'no-store'
+        parts = ['private' if self.private else 'public']
+        if self.max_age:
+            parts.append(f'max-age={self.max_age}')
+        else:
+            # Pwedeng i-store pero laging i-revalidate (ETag -> 304)
+            parts.append('no-cache')
+        if self.stale_while_revalidate:
+            parts.append(f'stale-while-revalidate={self.stale_while_revalidate}')
+        return ', '.join(parts)
+
+
+def cache_policy(**kwargs):
+    """
+    @app.route('/api/members/json')
+    @cache_policy(private=True, version=members_version)
+    def api_members_json(): ...
+    """
+    policy = CachePolicy(**kwargs)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kw):
+            return view(*args, **kw)
+        wrapper._cache_policy = policy
+        return wrapper
+    return decorator
+
+
+def _policy_for_request():
+    view = current_app.view_functions.get(request.endpoint) if request.endpoint else None
+    return getattr(view, '_cache_policy', None)
+
+
+def _version_etag(version):
+    return 'v' + hashlib.sha1(str(version).encode()).hexdigest()[:20]
+
+
+# ==============================
+# REQUEST / RESPONSE HOOKS
+# ==============================
+def _short_circuit_on_version():
+    """
+    Kung may data version ang route at tugma sa If-None-Match, 304 agad - walang query.
+    Kinukuha ang version BAGO ang route para hindi mauna ang ETag sa laman ng body.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    policy = _policy_for_request()
+    if policy is None or policy.version is None:
+        return None
+    try:
+        etag = _version_etag(policy.version())
+    except Exception:
+        return None  # Hayaan na lang tumakbo ang route kung pumalya ang version check
+    g._version_etag = etag
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = policy.header_value()
+        return response
+    return None
+
+
+def _negotiate_encoding():
+    accept = request.accept_encodings
+    if brotli is not None and accept['br']:
+        return 'br'
+    if accept['gzip']:
+        return 'gzip'
+    return None
+
+
+def _finalize(response):
+    policy = _policy_for_request()
+    if policy is not None and 'Cache-Control' not in response.headers:
+        response.headers['Cache-Control'] = policy.header_value()
+
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    body = response.get_data()
+
+    # --- ETag + 304 (GET/HEAD lang) ---
+    if request.method in ('GET', 'HEAD') and not (policy and policy.no_store):
+        etag = g.pop('_version_etag', None) or hashlib.sha1(body).hexdigest()[:20]
+        response.set_etag(etag, weak=True)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    # --- Compression ---
+    response.vary.add('Accept-Encoding')
+    if len(body) < COMPRESS_MIN_SIZE or 'Content-Encoding' in response.headers:
+        return response
+    encoding = _negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(body, quality=min(COMPRESS_LEVEL, 11))
+    else:
+        compressed = gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+    if len(compressed) >= len(body):
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    app.before_request(_short_circuit_on_version)
+    app.after_request(_finalize)
@@ -0,0 +1,162 @@
+# ==============================
+# IMAGE PROXY: Disk LRU cache + resize/convert para sa card at photo images
+# ==============================
+# Dati, ang view_phone at generator pages ay direktang kumukuha sa Supabase
+# public URL, laging full resolution (PNG na 2x scale ng html2canvas), kahit
+# thumbnail lang ang kailangan sa phone.
+#
+# GET /img/<folder>/<file>?w=480&fmt=webp
+#   - hit: sendfile mula sa disk (ETag + Range via send_file conditional)
+#   - miss: download sa public_id_cards (single-flight per variant), itago
+#     ang original, saka i-resize / i-convert kung hiniling
+#
+# Disk layout (see disk_cache.py): IMAGE_CACHE_DIR/<folder>/<file>/<variant>-<etag>.<ext>
+# Isang directory per source key, kaya ang invalidate(key) = rmtree lang, at
+# clear('guardian_ids') = lahat ng cards. Shared ng lahat ng workers sa host.
+#
+# Hiwalay na host = hiwalay na disk: ang invalidation ay local lang, kaya
+# IMAGE_CACHE_TTL ang bound ng staleness sa ibang hosts.
+import os
+import io
+import tempfile
+
+from disk_cache import DiskCache, CONTENT_TYPES
+from singleflight import Group
+
+IMAGE_BUCKET = 'public_id_cards'
+IMAGE_FOLDERS = ('guardian_ids', 'member_photos')
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "idsystem-images"))
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_MB", "512")) * 1024 * 1024
+IMAGE_CACHE_TTL = float(os.getenv("IMAGE_CACHE_TTL", str(24 * 3600)))
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "80"))
+
+# ?w= ay ini-snap pataas sa isa sa mga ito (para may hangganan ang variants)
+IMAGE_WIDTHS = (160, 320, 480, 640, 960, 1280)
+
+# fmt -> (Pillow format, content type, extension)
+FORMATS = {
+    'webp': ('WEBP', 'image/webp', 'webp'),
+    'jpeg': ('JPEG', 'image/jpeg', 'jpg'),
+    'png': ('PNG', 'image/png', 'png'),
+}
+
+class ImageError(ValueError):
+    pass
+
+
+class ImageNotFound(ImageError):
+    pass
+
+
+def validate_key(key):
+    """'guardian_ids/12.png' lang ang puwede: kilalang folder, walang subdir / '..'."""
+    folder, _, name = (key or '').partition('/')
+    if folder not in IMAGE_FOLDERS or not name or '/' in name or name.startswith('.') or '\\' in name:
+        raise ImageNotFound(f"Unknown image: {key}")
+    return key
+
+
+def variant_for(width=None, fmt=None):
+    """Normalized (variant name, width, fmt). 'orig' = walang babaguhin."""
+    if fmt is not None and fmt not in FORMATS:
+        raise ImageError(f"Unsupported format: {fmt}")
+    if width is not None:
+        try:
+            width = int(width)
+        except (TypeError, ValueError):
+            raise ImageError(f"Invalid width: {width}")
+        if width <= 0:
+            raise ImageError(f"Invalid width: {width}")
+        width = next((w for w in IMAGE_WIDTHS if w >= width), None)   # lampas sa pinakamalaki = original size
+    if width is None and fmt is None:
+        return 'orig', None, None
+    return f"w{width or 0}.{fmt or 'src'}", width, fmt
+
+
+# ==============================
+# PROXY
+# ==============================
+def render(raw, width=None, fmt=None):
+    """Resize (hindi nag-u-upscale) + convert. Returns (bytes, ext)."""
+    # Dito lang ang PIL import: ang invalidate() ay tinatawag sa save routes,
+    # hindi dapat magbayad ng Pillow import ang mga iyon.
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(raw))
+    source_format = (img.format or 'PNG').lower()
+    if fmt is None:
+        fmt = 'jpeg' if source_format in ('jpeg', 'mpo') else 'webp' if source_format == 'webp' else 'png'
+    pil_format, _, ext = FORMATS[fmt]
+
+    if width and img.width > width:
+        height = max(1, round(img.height * width / img.width))
+        if pil_format == 'JPEG':
+            img.draft('RGB', (width, height))
+        img = img.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+    if pil_format == 'JPEG' and img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    out = io.BytesIO()
+    if pil_format == 'PNG':
+        img.save(out, 'PNG', optimize=True)
+    elif pil_format == 'WEBP':
+        img.save(out, 'WEBP', quality=IMAGE_QUALITY, method=4)
+    else:
+        img.save(out, 'JPEG', quality=IMAGE_QUALITY, optimize=True, progressive=True)
+    return out.getvalue(), ext
+
+
+class ImageProxy:
+    def __init__(self, get_storage, cache=None):
+        self._get_storage = get_storage
+        self.cache = cache or DiskCache('images', IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES, IMAGE_CACHE_TTL,
+                                        key_path=lambda key: validate_key(key).split('/'))
+        self._flights = Group('images', window=0)
+
+    def _download(self, key):
+        try:
+            return self._get_storage().from_(IMAGE_BUCKET).download(key)
+        except Exception as e:
+            if 'not found' in str(e).lower() or '404' in str(e):
+                raise ImageNotFound(f"Image not found: {key}")
+            raise
+
+    def _original(self, key):
+        entry = self.cache.get(key, 'orig')
+        if entry is None:
+            data = self._download(key)
+            ext = key.rsplit('.', 1)[-1].lower() if '.' in key else 'png'
+            entry = self.cache.put(key, 'orig', data, ext if ext in CONTENT_TYPES else 'png')
+        return entry
+
+    def get(self, key, width=None, fmt=None):
+        """Returns Entry (disk path + etag). Raises ImageNotFound / ImageError."""
+        validate_key(key)
+        variant, width, fmt = variant_for(width, fmt)
+        entry = self.cache.get(key, variant)
+        if entry is not None:
+            return entry
+
+        def load():
+            original = self._original(key)
+            if variant == 'orig':
+                return original
+            with open(original.path, 'rb') as f:
+                data, ext = render(f.read(), width, fmt)
+            return self.cache.put(key, variant, data, ext)
+
+        return self._flights.do((key, variant), load)
+
+    def invalidate(self, *keys):
+        self.cache.invalidate(*keys)
+
+    def clear(self, folder=None):
+        self.cache.clear(*([folder] if folder else []))
+
+
+def key_from_url(url):
+    """Supabase public URL -> 'guardian_ids/12.png' (o None kung hindi galing sa bucket)."""
+    marker = f"/object/public/{IMAGE_BUCKET}/"
+    if not url or marker not in url:
+        return None
+    return url.split(marker, 1)[1].split('?', 1)[0]
@@ -0,0 +1,236 @@
+# ==============================
+# LOGGING: Structured JSON + non-blocking handlers
+# ==============================
+# Pinalitan nito yung print() at yung lumang log() helper na nagbubukas ng
+# error_log.txt sa bawat message. Ngayon:
+#   - isang JSON object per line (may request_id, pid, route)
+#   - ang route thread ay naglalagay lang sa queue; ang isang background
+#     thread ang sumusulat sa stdout / rotating file
+#   - optional sampling para sa high-volume paths (save_card_image, zip, batch)
+#
+# Config (env):
+#   LOG_LEVEL              default INFO
+#   LOG_FILE               kung naka-set, sumusulat din sa rotating file
+#   LOG_FILE_MAX_BYTES     default 10 MB
+#   LOG_FILE_BACKUPS       default 5
+#   LOG_FILE_PER_WORKER    default 1 - dagdag ang pid sa filename para
+#                          hindi mag-agawan ang gunicorn workers sa rotation
+#   LOG_SAMPLE_RATE        default 1.0 - fraction ng requests na ilalabas ang
+#                          INFO logs ng sampled loggers (WARNING+ laging labas)
+import os
+import sys
+import copy
+import atexit
+import json
+import uuid
+import queue
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from flask import g, has_request_context, request
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.getenv("LOG_FILE")
+LOG_FILE_MAX_BYTES = int(os.getenv("LOG_FILE_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_FILE_BACKUPS = int(os.getenv("LOG_FILE_BACKUPS", "5"))
+LOG_FILE_PER_WORKER = os.getenv("LOG_FILE_PER_WORKER", "1") not in ("0", "false", "False")
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+ROOT_LOGGER_NAME = "idsystem"
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Standard LogRecord attributes; lahat ng iba ay galing sa `extra=` at isasama sa JSON
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "route"}
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "pid": record.process,
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            payload["request_id"] = request_id
+            payload["route"] = getattr(record, "route", None)
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class RequestContextFilter(logging.Filter):
+    """Idinadagdag ang request_id at route habang nasa loob pa ng request thread."""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get("request_id")
+            record.route = request.path
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Para sa high-volume loggers: INFO/DEBUG ay lalabas lang sa sampled requests.
+    Isang beses lang nagde-decide per request para buo ang trace ng isang request.
+    WARNING pataas ay hindi kailanman sina-sample.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        if has_request_context():
+            if "_log_sampled" not in g:
+                g._log_sampled = random.random() < self.rate
+            return g._log_sampled
+        return random.random() < self.rate
+
+
+class _ProcessLocalQueueHandler(QueueHandler):
+    """
+    QueueHandler na sinisigurong may listener thread sa CURRENT process.
+    Kailangan ito dahil hindi sumasama ang threads sa fork (gunicorn --preload).
+    """
+
+    def __init__(self, handler_factory):
+        super().__init__(queue.SimpleQueue())
+        self._handler_factory = handler_factory
+        self._pid = None
+        self._listener = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_listener(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._start_lock:
+            if self._pid == pid:
+                return
+            # Bagong process: bagong queue at bagong listener (yung sa parent ay patay na)
+            self.queue = queue.SimpleQueue()
+            self._listener = QueueListener(self.queue, *self._handler_factory(), respect_handler_level=True)
+            self._listener.start()
+            self._pid = pid
+
+    def prepare(self, record):
+        # Buuin na ang message at traceback dito (sa request thread), pero
+        # huwag i-format as text - JsonFormatter ang bahala sa listener side
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
+
+    def stop(self):
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._pid = None
+
+
+def _build_handlers():
+    formatter = JsonFormatter()
+    handlers = []
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(formatter)
+    handlers.append(stream)
+
+    if LOG_FILE:
+        path = LOG_FILE
+        if LOG_FILE_PER_WORKER:
+            base, ext = os.path.splitext(LOG_FILE)
+            path = f"{base}.{os.getpid()}{ext or '.log'}"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        rotating = RotatingFileHandler(path, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS,
+                                       encoding="utf-8", delay=True)
+        rotating.setFormatter(formatter)
+        handlers.append(rotating)
+    return handlers
+
+
+_queue_handler = None
+_setup_lock = threading.Lock()
+
+
+def configure():
+    """Idempotent: i-setup ang 'idsystem' logger tree isang beses lang."""
+    global _queue_handler
+    with _setup_lock:
+        if _queue_handler is not None:
+            return
+        handler = _ProcessLocalQueueHandler(_build_handlers)
+        handler.addFilter(RequestContextFilter())
+
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.setLevel(LOG_LEVEL)
+        root.addHandler(handler)
+        root.propagate = False
+        _queue_handler = handler
+        # I-flush ang natitirang records bago mamatay ang process
+        atexit.register(shutdown)
+
+
+def get_logger(name, sampled=False):
+    """
+    get_logger('app')               -> normal logger
+    get_logger('app.cards', True)   -> high-volume logger na sinusunod ang LOG_SAMPLE_RATE
+    """
+    configure()
+    logger = logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+    if sampled and not any(isinstance(f, SamplingFilter) for f in logger.filters):
+        logger.addFilter(SamplingFilter(LOG_SAMPLE_RATE))
+    return logger
+
+
+def shutdown():
+    if _queue_handler is not None:
+        _queue_handler.stop()
+
+
+# ==============================
+# FLASK INTEGRATION: Request IDs
+# ==============================
+def _assign_request_id():
+    incoming = request.headers.get(REQUEST_ID_HEADER, "")
+    # Tanggapin lang yung maikli at simple para hindi ma-inject sa logs
+    if incoming and len(incoming) <= 64 and incoming.replace("-", "").isalnum():
+        g.request_id = incoming
+    else:
+        g.request_id = uuid.uuid4().hex
+
+
+def _echo_request_id(response):
+    request_id = g.get("request_id")
+    if request_id:
+        response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
+def init_app(app):
+    configure()
+    app.before_request(_assign_request_id)
+    app.after_request(_echo_request_id)
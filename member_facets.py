@@ -0,0 +1,260 @@
+# ==============================
+# MEMBER FACETS: Counts by chapter / blood type / ... mula sa in-memory snapshot
+# ==============================
+# Dati, para malaman kung ilan ang members per chapter (o ilan ang wala pang
+# card), kailangang i-download ang buong members table. Ngayon:
+#
+#   - bawat worker ay may compact snapshot ng maliit na bahagi ng bawat row
+#     (id + facet columns lang, walang photo / pirma)
+#   - column-oriented at dictionary-encoded: bawat facet ay array('I') ng
+#     codes + listahan ng values, kaya ~4 bytes per row per facet
+#   - ang counts per value ay minementena habang nag-a-apply ng changes, kaya
+#     ang GET /api/members/facets (walang filter) ay O(bilang ng values), hindi
+#     O(rows). May filter (?chapter=...) = isang pass sa arrays.
+#
+# Incremental ang update: gamit ang delta_sync.changes() ('facets' resource)
+# mula sa huling cursor - upserts + tombstones lang ang kinukuha. Nagsi-sync
+# kapag nagbago ang `version()` (member_cache + card version sa app.py, bina-bump
+# ng member / card writes sa kahit anong worker) o lumampas sa FACETS_MAX_AGE
+# (edits na hindi dumaan sa app, hal. Supabase dashboard).
+import os
+import time
+import threading
+from array import array
+
+import metrics
+import logging_setup
+import delta_sync
+
+log = logging_setup.get_logger('facets')
+
+FACETS_MAX_AGE = float(os.getenv("FACETS_MAX_AGE", "30"))
+FACETS_SYNC_PAGE_SIZE = int(os.getenv("FACETS_SYNC_PAGE_SIZE", "2000"))
+
+# Direktang columns ng members + derived (month = 'YYYY-MM' ng date_of_membership,
+# card = 'generated' / 'missing')
+FIELD_FACETS = ('chapter', 'designation', 'blood_type', 'membership_type')
+FACETS = FIELD_FACETS + ('month', 'card')
+# Ang mga ito ay naka-sort ayon sa value (timeline), ang iba ay pinakamarami muna
+ORDERED_FACETS = ('month',)
+
+SNAPSHOT_ROWS = metrics.REGISTRY.gauge(
+    'member_snapshot_rows', 'Members in the in-memory facet snapshot.', ('pid',))
+SNAPSHOT_SYNCS = metrics.REGISTRY.counter(
+    'member_snapshot_syncs_total', 'Facet snapshot syncs by result (incremental, full, error).', ('result',))
+
+
+class FacetError(ValueError):
+    pass
+
+
+def facet_values(row):
+    """members row -> {facet: value}. Blangko = None."""
+    values = {}
+    for name in FIELD_FACETS:
+        value = row.get(name)
+        values[name] = (str(value).strip() or None) if value is not None else None
+    joined = str(row.get('date_of_membership') or '')
+    values['month'] = joined[:7] if len(joined) >= 7 else None
+    values['card'] = 'generated' if row.get('generated_card_image') else 'missing'
+    return values
+
+
+class _Column:
+    """Dictionary-encoded column: codes[slot] -> values[code], counts[code]."""
+
+    def __init__(self):
+        self.codes = array('I')
+        self.values = []
+        self.lookup = {}
+        self.counts = array('q')
+
+    def encode(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.values)
+            self.values.append(value)
+            self.counts.append(0)
+        return code
+
+    def append(self, value):
+        code = self.encode(value)
+        self.codes.append(code)
+        self.counts[code] += 1
+
+    def assign(self, slot, value):
+        code = self.encode(value)
+        old = self.codes[slot]
+        if old != code:
+            self.counts[old] -= 1
+            self.counts[code] += 1
+            self.codes[slot] = code
+
+    def remove(self, slot):
+        """Swap-remove: ang huling slot ang lilipat sa `slot`."""
+        self.counts[self.codes[slot]] -= 1
+        last = self.codes.pop()
+        if slot < len(self.codes):
+            self.codes[slot] = last
+
+    def summary(self, ordered=False):
+        items = [(value, count) for value, count in zip(self.values, self.counts) if count]
+        if ordered:
+            items.sort(key=lambda item: (item[0] is None, item[0] or ''))
+        else:
+            items.sort(key=lambda item: (-item[1], item[0] is None, item[0] or ''))
+        return [{'value': value, 'count': count} for value, count in items]
+
+
+class MemberSnapshot:
+    def __init__(self, get_db, version=None, max_age=FACETS_MAX_AGE, page_size=FACETS_SYNC_PAGE_SIZE):
+        self._get_db = get_db
+        self._version = version
+        self.max_age = max_age
+        self.page_size = page_size
+        self._lock = threading.Lock()         # data (arrays / counts)
+        self._sync_lock = threading.Lock()    # isang sync lang sa isang pagkakataon
+        self._reset()
+        self._cursor = None
+        self._loaded = False
+        self._synced_at = 0.0
+        self._synced_version = None
+
+    def _reset(self):
+        self._ids = array('q')
+        self._slots = {}                      # member id -> slot
+        self._columns = {name: _Column() for name in FACETS}
+
+    def __len__(self):
+        return len(self._ids)
+
+    # --- incremental updates ---
+    def upsert(self, row):
+        values = facet_values(row)
+        with self._lock:
+            slot = self._slots.get(row['id'])
+            if slot is None:
+                self._slots[row['id']] = len(self._ids)
+                self._ids.append(row['id'])
+                for name, column in self._columns.items():
+                    column.append(values[name])
+            else:
+                for name, column in self._columns.items():
+                    column.assign(slot, values[name])
+
+    def remove(self, member_id):
+        with self._lock:
+            slot = self._slots.pop(member_id, None)
+            if slot is None:
+                return
+            last = self._ids.pop()
+            if slot < len(self._ids):
+                self._ids[slot] = last
+                self._slots[last] = slot
+            for column in self._columns.values():
+                column.remove(slot)
+
+    # --- sync ---
+    def is_stale(self):
+        if not self._loaded or time.monotonic() - self._synced_at > self.max_age:
+            return True
+        return self._version is not None and self._version() != self._synced_version
+
+    def refresh(self, force=False):
+        """Kunin ang changes mula sa huling cursor. Returns True kung may na-sync."""
+        if not force and not self.is_stale():
+            return False
+        # Naka-load na at may ibang nagsi-sync = ibigay muna ang kasalukuyan
+        if not self._sync_lock.acquire(blocking=not self._loaded):
+            return False
+        try:
+            if not force and not self.is_stale():
+                return False
+            version = self._version() if self._version is not None else None
+            self._sync(version)
+            return True
+        except Exception:
+            SNAPSHOT_SYNCS.inc(result='error')
+            raise
+        finally:
+            self._sync_lock.release()
+
+    def _sync(self, version):
+        db = self._get_db()
+        cursor, full, applied = self._cursor, self._cursor is None, 0
+        while True:
+            page = delta_sync.changes(db, 'facets', cursor, self.page_size)
+            if page['reset'] and cursor is not None:
+                # Lumang cursor (purged tombstones) = buuin ulit
+                with self._lock:
+                    self._reset()
+                full = True
+            for row in page['changes']:
+                self.upsert(row)
+            for member_id in page['deleted']:
+                self.remove(member_id)
+            applied += len(page['changes']) + len(page['deleted'])
+            cursor = page['cursor']
+            if not page['has_more']:
+                break
+        self._cursor = cursor
+        self._loaded = True
+        self._synced_at = time.monotonic()
+        self._synced_version = version
+        SNAPSHOT_SYNCS.inc(result='full' if full else 'incremental')
+        SNAPSHOT_ROWS.set(len(self._ids), pid=os.getpid())
+        if applied:
+            log.info(f"Facet snapshot {'loaded' if full else 'updated'}: {applied} changes, {len(self._ids)} members")
+
+    # --- reads ---
+    def facets(self, names=None, filters=None):
+        """
+        Returns {'total', 'facets': {name: [{'value', 'count'}, ...]}, 'cursor', 'age_seconds'}.
+        filters = {facet: value}; '' / None = walang value.
+        """
+        names = list(names or FACETS)
+        unknown = [name for name in list(names) + list(filters or {}) if name not in FACETS]
+        if unknown:
+            raise FacetError(f"Unknown facets: {unknown}")
+        try:
+            self.refresh()
+        except Exception as e:
+            if not self._loaded:
+                raise
+            log.warning(f"Facet snapshot sync failed, serving previous snapshot: {e}")
+
+        with self._lock:
+            if filters:
+                total, result = self._filtered(names, filters)
+            else:
+                total = len(self._ids)
+                result = {name: self._columns[name].summary(name in ORDERED_FACETS) for name in names}
+            return {
+                'total': total,
+                'facets': result,
+                'cursor': self._cursor,
+                'age_seconds': round(time.monotonic() - self._synced_at, 3),
+            }
+
+    def _filtered(self, names, filters):
+        wanted = []
+        for name, value in filters.items():
+            code = self._columns[name].lookup.get(value or None)
+            if code is None:
+                return 0, {name: [] for name in names}
+            wanted.append((self._columns[name].codes, code))
+        counts = {name: {} for name in names}
+        total = 0
+        for slot in range(len(self._ids)):
+            if all(codes[slot] == code for codes, code in wanted):
+                total += 1
+                for name in names:
+                    code = self._columns[name].codes[slot]
+                    counts[name][code] = counts[name].get(code, 0) + 1
+        result = {}
+        for name in names:
+            column = _Column()
+            column.values = self._columns[name].values
+            column.counts = array('q', (counts[name].get(code, 0) for code in range(len(column.values))))
+            result[name] = column.summary(name in ORDERED_FACETS)
+        return total, result
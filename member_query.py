@@ -0,0 +1,188 @@
+# ==============================
+# MEMBER QUERY: Composable filters + projection + keyset pagination
+# ==============================
+# Dati: /api/members/by-date = eksaktong petsa lang, select('*') (kasama ang
+# photo_data ng bawat row), walang pagination. Ang batch printing ay kumukuha
+# ng sobra tapos sinasala sa browser.
+#
+# GET /api/members/query?date_from=2024-01-01&date_to=2024-03-31&chapter=Makati Chapter
+#                       &card=missing&columns=id,name,photo_data&sort=date&limit=100
+#   - filters: tingnan ang FILTERS (ulitin ang param para sa maraming value)
+#   - columns: projection (whitelist); default = LIST_COLUMNS (walang photo / pirma)
+#   - sort: id | name | date | generated; pagination via `cursor` (opaque),
+#     hindi offset, kaya pare-pareho ang bilis kahit nasa dulo na ng listahan
+#
+# Keyset gaya ng delta_sync.py: (A) parehong sort value, id > cursor id,
+# (B) mas malaking sort value, at (C) para sa nullable na sort column, ang
+# mga walang value (NULLS LAST). Walang or(and(...)) na string, kaya walang
+# escaping ng user values. Indexes: tingnan ang MEMBER QUERY sa supabase_setup.sql.
+import json
+import base64
+from datetime import date, datetime
+
+QUERY_PAGE_SIZE = 100
+QUERY_MAX_PAGE_SIZE = 500
+
+# Columns na puwedeng hingin sa `columns`
+MEMBER_COLUMNS = (
+    'id', 'idnumb', 'name', 'pseudo_name', 'gender', 'birthdate', 'civil_status', 'country',
+    'blood_type', 'designation', 'chapter', 'date_of_membership', 'membership_type',
+    'contact_no', 'email', 'home_address', 'height', 'weight', 'occupation',
+    'govt_id_presented', 'govt_id_no', 'emergency_person_name', 'emergency_contact_no',
+    'emergency_address', 'photo_data', 'qr_code', 'signature', 'issued_date', 'valid_until',
+    'generated_card_image', 'generated_at', 'card_layout', 'created_at', 'updated_at',
+)
+# Malalaking base64 / data URL columns: hindi kina-cache (see _with_media sa app.py)
+MEDIA_COLUMNS = ('photo_data', 'signature', 'qr_code')
+CACHED_COLUMNS = tuple(name for name in MEMBER_COLUMNS if name not in MEDIA_COLUMNS)
+LIST_COLUMNS = ('id', 'idnumb', 'name', 'pseudo_name', 'chapter', 'designation', 'membership_type',
+                'blood_type', 'date_of_membership', 'generated_card_image', 'generated_at')
+
+# sort -> (column, nullable)
+SORTS = {
+    'id': ('id', False),
+    'name': ('name', False),
+    'date': ('date_of_membership', True),
+    'generated': ('generated_at', True),
+}
+
+# param -> (column, operator, parser). 'in' = isa o higit pang values.
+FILTERS = {
+    'date': ('date_of_membership', 'in', date.fromisoformat),
+    'date_from': ('date_of_membership', 'gte', date.fromisoformat),
+    'date_to': ('date_of_membership', 'lte', date.fromisoformat),
+    'generated_from': ('generated_at', 'gte', datetime.fromisoformat),
+    'generated_to': ('generated_at', 'lte', datetime.fromisoformat),
+    'chapter': ('chapter', 'in', str),
+    'membership_type': ('membership_type', 'in', str),
+    'designation': ('designation', 'in', str),
+    'blood_type': ('blood_type', 'in', str),
+    'layout': ('card_layout', 'in', str),     # '' = generic layout
+    'card': ('generated_card_image', 'card', str),
+}
+CARD_STATUSES = ('generated', 'missing')
+
+
+class QueryError(ValueError):
+    pass
+
+
+def encode_cursor(value, row_id):
+    raw = json.dumps([value, row_id], separators=(',', ':'), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Returns (sort value, id) o (None, None) kung walang cursor."""
+    if not cursor:
+        return None, None
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return value, int(row_id)
+    except (ValueError, TypeError):
+        raise QueryError(f"Invalid cursor: {cursor!r}")
+
+
+def parse_filters(args):
+    """request.args (MultiDict) -> normalized [(param, [values])], sorted para sa cache key."""
+    filters = []
+    for param in sorted(FILTERS):
+        values = [value.strip() for value in args.getlist(param)]
+        if not values:
+            continue
+        column, op, parser = FILTERS[param]
+        if op == 'card':
+            if len(values) != 1 or values[0] not in CARD_STATUSES:
+                raise QueryError(f"card must be one of {CARD_STATUSES}")
+        elif op != 'in' and len(values) != 1:
+            raise QueryError(f"{param} takes a single value")
+        for value in values:
+            # Blangko = "walang value" para sa text columns lang (hal. layout=);
+            # sa date / datetime, invalid input ito sa Postgres
+            if not value and parser is not str:
+                raise QueryError(f"{param} needs a value")
+            try:
+                parser(value)
+            except ValueError:
+                raise QueryError(f"Invalid {param}: {value!r}")
+        filters.append((param, sorted(set(values))))
+    return filters
+
+
+def parse_columns(raw):
+    if not raw:
+        return list(LIST_COLUMNS)
+    columns = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in columns if name not in MEMBER_COLUMNS]
+    if unknown:
+        raise QueryError(f"Unknown columns: {unknown}")
+    return columns
+
+
+def _apply_filters(query, filters):
+    for param, values in filters:
+        column, op, _ = FILTERS[param]
+        if op == 'card':
+            if values[0] == 'generated':
+                query = query.neq(column, '')
+            else:
+                # Constant na filter string (walang user value); '' = na-clear na card
+                query = query.or_(f'{column}.is.null,{column}.eq.""')
+        elif op == 'in':
+            query = query.eq(column, values[0]) if len(values) == 1 else query.in_(column, values)
+        else:
+            query = getattr(query, op)(column, values[0])
+    return query
+
+
+def _excludes_null(filters, column):
+    """May range / equality filter sa column = walang NULL na lalabas."""
+    return any(FILTERS[param][0] == column and FILTERS[param][1] != 'card' for param, _ in filters)
+
+
+def query_members(db, filters=(), columns=LIST_COLUMNS, sort='id', cursor=None, limit=QUERY_PAGE_SIZE):
+    """
+    Returns {'members', 'cursor', 'has_more'}. Ipasa ang `cursor` para sa susunod na page.
+    """
+    if sort not in SORTS:
+        raise QueryError(f"Unknown sort: {sort} (use one of {list(SORTS)})")
+    sort_column, nullable = SORTS[sort]
+    try:
+        limit = max(1, min(int(limit), QUERY_MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise QueryError(f"Invalid limit: {limit!r}")
+    selected = list(dict.fromkeys(['id', sort_column] + list(columns)))
+    after_value, after_id = decode_cursor(cursor)
+    in_nulls = cursor is not None and after_value is None and nullable
+
+    def base():
+        return _apply_filters(db.from_('members').select(', '.join(selected)), filters)
+
+    # Isang extra row para malaman kung may kasunod pa
+    want = limit + 1
+    rows = []
+    if cursor is not None and not in_nulls:
+        # A. Natitirang rows na kapareho ng sort value ng cursor
+        rows = base().eq(sort_column, after_value).gt('id', after_id) \
+            .order('id').limit(want).execute().data or []
+    if len(rows) < want and not in_nulls:
+        # B. Mas malaking sort value (unang page: lahat, NULLS LAST na by id)
+        query = base()
+        if cursor is not None:
+            query = query.gt(sort_column, after_value)
+        rows += query.order(sort_column).order('id').limit(want - len(rows)).execute().data or []
+    if len(rows) < want and nullable and cursor is not None and not _excludes_null(filters, sort_column):
+        # C. Walang value (NULLS LAST), by id - ang .gt() sa B ay hindi kasama ang NULL
+        query = base().is_(sort_column, 'null')
+        if in_nulls:
+            query = query.gt('id', after_id)
+        rows += query.order('id').limit(want - len(rows)).execute().data or []
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].get(sort_column), rows[-1]['id']) if has_more else None
+    return {
+        'members': [{name: row.get(name) for name in columns} for row in rows],
+        'cursor': next_cursor,
+        'has_more': has_more,
+    }
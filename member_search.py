@@ -0,0 +1,78 @@
+# ==============================
+# MEMBER SEARCH: Full-text + trigram search sa database (RPC)
+# ==============================
+# Dati: pitong `ilike` na pinagdugtong sa isang .or_() string (sira kapag may
+# comma o parenthesis ang hinahanap, at walang ranking). Ngayon, iisang RPC
+# (public.search_members sa supabase_setup.sql):
+#   - full-text match (websearch syntax) gamit ang GIN tsvector indexes
+#   - substring + fuzzy (pg_trgm) match para sa typo at contact numbers
+#   - ranked, paginated, at projected (walang photo_data kung hindi kailangan)
+#   - total count sa parehong query
+#
+# Parameterized ang input (RPC params), kaya hindi na kailangan ng sanitizing.
+#
+# Local Postgres test (kailangan ang optional `psycopg`):
+#   psql "$DSN" -f supabase_setup.sql
+#   python member_search.py --dsn "$DSN" --field name "juan dela"
+import os
+
+SEARCH_FUNCTION = 'search_members'
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "50"))
+SEARCH_MAX_PAGE_SIZE = 200
+
+# search_type ng form -> p_field ng RPC
+#   quick = name + pseudo_name + chapter (autocomplete ng add_member_form)
+FIELDS = ('all', 'name', 'chapter', 'designation', 'contact', 'quick')
+
+# Projection para sa search_results.html (walang photo_data / card columns)
+RESULT_COLUMNS = ('id', 'name', 'pseudo_name', 'chapter', 'designation', 'contact_no',
+                  'blood_type', 'home_address', 'birthdate', 'height', 'weight')
+
+
+class SearchError(ValueError):
+    pass
+
+
+def search(db, term, field='all', columns=RESULT_COLUMNS, limit=SEARCH_PAGE_SIZE, offset=0):
+    """
+    Returns (members, total). `columns=None` = buong row.
+    Walang term = walang resulta (ang "show all" ay hiwalay na path).
+    """
+    term = (term or '').strip()
+    if field not in FIELDS:
+        raise SearchError(f"Unknown search field: {field}")
+    if not term:
+        return [], 0
+    limit = max(1, min(int(limit), SEARCH_MAX_PAGE_SIZE))
+    rows = db.rpc(SEARCH_FUNCTION, {
+        'p_query': term,
+        'p_field': field,
+        'p_columns': list(columns) if columns else None,
+        'p_limit': limit,
+        'p_offset': max(0, int(offset)),
+    }).execute().data or []
+    total = rows[0]['total_count'] if rows else 0
+    return [row['member'] for row in rows], total
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Run public.search_members against a Postgres database.")
+    parser.add_argument('term')
+    parser.add_argument('--dsn', default=os.getenv("DATABASE_URL", "postgresql://localhost/postgres"))
+    parser.add_argument('--field', default='all', choices=FIELDS)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--offset', type=int, default=0)
+    args = parser.parse_args()
+
+    import psycopg  # optional dependency (local testing lang)
+
+    with psycopg.connect(args.dsn) as conn:
+        rows = conn.execute(
+            "SELECT member, rank, total_count FROM public.search_members(%s, %s, %s, %s, %s)",
+            (args.term, args.field, list(RESULT_COLUMNS), args.limit, args.offset)).fetchall()
+    for member, rank, _ in rows:
+        print(f"{rank:7.4f}  {json.dumps(member, default=str)}")
+    print(f"total: {rows[0][2] if rows else 0}")
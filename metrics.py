@@ -0,0 +1,342 @@
+# ==============================
+# METRICS: Per-route latency + Supabase call timing
+# ==============================
+# Maliit na in-process registry na naglalabas ng Prometheus text format.
+# Walang extra dependency (hindi kailangan ng prometheus_client).
+#
+# NOTE: Per-process ang counters. Sa gunicorn na maraming workers, bawat
+# worker ay may sariling numbers (makikita sa process_start_time_seconds{pid}).
+import os
+import time
+import threading
+from bisect import bisect_left
+
+from flask import g, request
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Mga path na hindi na kailangang i-measure (mabilis lang, o yung scraper mismo)
+SKIP_PREFIXES = ('/static', '/metrics')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = [f'{k}="{_escape(v)}"' for k, v in zip(labelnames, values)]
+    pairs.extend(f'{k}="{_escape(v)}"' for k, v in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    collect = Counter.collect
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts..., +Inf count], sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def collect(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1])) for key, state in self._values.items())
+        for key, (counts, total) in items:
+            running = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                running += count
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {running}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {running}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+PROCESS_START = REGISTRY.gauge('process_start_time_seconds', 'Unix time when this worker started.', ('pid',))
+PROCESS_START.set(time.time(), pid=os.getpid())
+
+HTTP_LATENCY = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Flask request latency by route.', ('method', 'route'))
+HTTP_REQUESTS = REGISTRY.counter(
+    'http_requests_total', 'Flask responses by route and status code.', ('method', 'route', 'status'))
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    'http_requests_in_flight', 'Requests currently being handled by this worker.', ('pid',))
+HTTP_REQUEST_SIZE = REGISTRY.histogram(
+    'http_request_size_bytes', 'Request body size by route.', ('method', 'route'), buckets=SIZE_BUCKETS)
+HTTP_RESPONSE_SIZE = REGISTRY.histogram(
+    'http_response_size_bytes', 'Response body size by route.', ('method', 'route'), buckets=SIZE_BUCKETS)
+
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    'supabase_call_duration_seconds', 'Supabase call latency by table/bucket and operation.',
+    ('service', 'target', 'operation'))
+UPSTREAM_ERRORS = REGISTRY.counter(
+    'supabase_call_errors_total', 'Supabase calls that raised an exception.',
+    ('service', 'target', 'operation'))
+
+
+def render_latest():
+    return REGISTRY.render()
+
+
+# ==============================
+# FLASK MIDDLEWARE
+# ==============================
+def _route_label():
+    # Gamitin ang URL rule (e.g. /delete_member/<int:member_id>) para hindi sumabog ang labels
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+def _before_request():
+    if request.path.startswith(SKIP_PREFIXES):
+        return
+    g._metrics_start = time.perf_counter()
+    g._metrics_in_flight = True
+    HTTP_IN_FLIGHT.inc(pid=os.getpid())
+
+
+def _after_request(response):
+    start = g.pop('_metrics_start', None)
+    if start is None:
+        return response
+
+    elapsed = time.perf_counter() - start
+    route = _route_label()
+    method = request.method
+    HTTP_LATENCY.observe(elapsed, method=method, route=route)
+    HTTP_REQUESTS.inc(method=method, route=route, status=response.status_code)
+
+    if request.content_length:
+        HTTP_REQUEST_SIZE.observe(request.content_length, method=method, route=route)
+    # Streamed / send_file responses walang alam na length - skip lang
+    # (calculate_content_length() ay bina-buffer ang generator, sisirain ang SSE)
+    if not response.direct_passthrough and not response.is_streamed:
+        size = response.calculate_content_length()
+        if size is not None:
+            HTTP_RESPONSE_SIZE.observe(size, method=method, route=route)
+    return response
+
+
+def _teardown_request(exc):
+    # Laging bawasan ang in-flight, kahit nag-crash yung route
+    if g.pop('_metrics_in_flight', False):
+        HTTP_IN_FLIGHT.dec(pid=os.getpid())
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+
+# ==============================
+# SUPABASE CLIENT INSTRUMENTATION
+# ==============================
+_QUERY_OPERATIONS = {'select', 'insert', 'update', 'delete', 'upsert'}
+# Walang network call ang mga ito, kaya hindi na tinatime
+_LOCAL_STORAGE_METHODS = {'get_public_url'}
+
+
+def _timed(service, target, operation, fn, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        UPSTREAM_ERRORS.inc(service=service, target=target, operation=operation)
+        raise
+    finally:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start,
+                                 service=service, target=target, operation=operation)
+
+
+class _QueryProxy:
+    """Wraps a postgrest request builder; times .execute() by table + operation."""
+
+    __slots__ = ('_builder', '_table', '_operation')
+
+    def __init__(self, builder, table, operation='unknown'):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+
+    def execute(self, *args, **kwargs):
+        return _timed('postgrest', self._table, self._operation, self._builder.execute, *args, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        operation = name if name in _QUERY_OPERATIONS else self._operation
+
+        if not callable(attr):
+            # e.g. `.not_` property - builder pa rin, kaya i-wrap ulit
+            return _QueryProxy(attr, self._table, operation) if hasattr(attr, 'execute') else attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                return _QueryProxy(result, self._table, operation)
+            return result
+        return call
+
+
+class _BucketProxy:
+    __slots__ = ('_bucket', '_name')
+
+    def __init__(self, bucket, name):
+        self._bucket = bucket
+        self._name = name
+
+    def __getattr__(self, name):
+        attr = getattr(self._bucket, name)
+        if not callable(attr) or name.startswith('_') or name in _LOCAL_STORAGE_METHODS:
+            return attr
+
+        def call(*args, **kwargs):
+            return _timed('storage', self._name, name, attr, *args, **kwargs)
+        return call
+
+
+class _StorageProxy:
+    __slots__ = ('_storage',)
+
+    def __init__(self, storage):
+        self._storage = storage
+
+    def from_(self, bucket):
+        return _BucketProxy(self._storage.from_(bucket), bucket)
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+
+class InstrumentedClient:
+    """
+    Drop-in wrapper ng Supabase Client.
+    Lahat ng db.from_(...).execute() at storage.from_(...).<method>() ay tinatime.
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def from_(self, table):
+        return _QueryProxy(self._client.from_(table), table)
+
+    table = from_
+
+    def rpc(self, fn, *args, **kwargs):
+        return _QueryProxy(self._client.rpc(fn, *args, **kwargs), f"rpc:{fn}", 'rpc')
+
+    @property
+    def storage(self):
+        return _StorageProxy(self._client.storage)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def instrument_client(client):
+    return InstrumentedClient(client)
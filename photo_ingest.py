@@ -0,0 +1,157 @@
+# ==============================
+# PHOTO INGEST: Decode -> orient -> crop -> downscale -> encode
+# ==============================
+# Dati, ang member photo ay base64 data URL ng kung anong ibinigay ng camera
+# o file picker (madalas multi-megapixel, ilang MB), at ganoon din itong
+# sine-save sa members row. Bawat basa ng row (search, sync, cards) ay dala iyon.
+#
+# Ngayon, bawat bagong photo ay dumadaan dito bago i-save:
+#   1. draft() - JPEG decoder na mismo ang nagre-reduce (1/2, 1/4, 1/8) habang
+#      nagde-decode, kaya hindi buong megapixel image ang nasa memory
+#   2. exif_transpose - tamang orientation (phone photos na naka-EXIF rotate)
+#   3. center crop sa aspect ratio ng photo box ng card (bahagyang pataas ang
+#      focus, kung saan karaniwang nasa mukha)
+#   4. resize sa PHOTO_SIZE, JPEG encode na pinapababa ang quality hanggang
+#      pumasok sa PHOTO_TARGET_BYTES
+#
+# Walang face detector dito (walang OpenCV sa requirements); PHOTO_FOCUS_Y ang
+# nag-a-adjust ng crop kung laging napuputol ang ulo.
+#
+# Backfill ng lumang inline photos (gamit ang SUPAB_URL / SUPAB_SERVICE_KEY):
+#   python photo_ingest.py --limit 200
+import io
+import os
+import base64
+import uuid
+from collections import namedtuple
+
+from PIL import Image, ImageOps
+
+PHOTO_BUCKET = 'public_id_cards'
+PHOTO_FOLDER = 'member_photos'
+
+# 5:6 = default na photo box ng layout editor (100x120)
+PHOTO_SIZE = tuple(int(v) for v in os.getenv("PHOTO_SIZE", "480x576").lower().split('x'))
+PHOTO_TARGET_BYTES = int(os.getenv("PHOTO_TARGET_BYTES", str(60 * 1024)))
+PHOTO_QUALITY = int(os.getenv("PHOTO_QUALITY", "85"))
+PHOTO_MIN_QUALITY = 55
+PHOTO_FOCUS_Y = float(os.getenv("PHOTO_FOCUS_Y", "0.4"))     # 0 = taas, 0.5 = gitna
+PHOTO_MAX_PIXELS = int(os.getenv("PHOTO_MAX_PIXELS", str(50_000_000)))
+
+Photo = namedtuple('Photo', 'data content_type width height source_bytes')
+
+
+class PhotoError(ValueError):
+    pass
+
+
+def _open(raw):
+    try:
+        img = Image.open(io.BytesIO(raw))
+    except Exception as e:
+        raise PhotoError(f"Not a readable image ({type(e).__name__})")
+    if img.width * img.height > PHOTO_MAX_PIXELS:
+        raise PhotoError(f"Image too large ({img.width}x{img.height})")
+    # Para sa JPEG: decode na naka-scale pababa, pero hindi mas maliit sa kailangan.
+    # max() dahil puwedeng ma-rotate pa ng EXIF ang width/height.
+    side = max(PHOTO_SIZE)
+    img.draft('RGB', (side, side))
+    return img
+
+
+def _crop_box(width, height):
+    target = PHOTO_SIZE[0] / PHOTO_SIZE[1]
+    if width / height > target:
+        # Masyadong malapad: putulin ang gilid (gitna)
+        new_w = round(height * target)
+        left = (width - new_w) // 2
+        return (left, 0, left + new_w, height)
+    new_h = round(width / target)
+    top = round((height - new_h) * PHOTO_FOCUS_Y)
+    return (0, top, width, top + new_h)
+
+
+def _encode(img):
+    quality = PHOTO_QUALITY
+    while True:
+        out = io.BytesIO()
+        img.save(out, 'JPEG', quality=quality, optimize=True, progressive=True)
+        if out.tell() <= PHOTO_TARGET_BYTES or quality <= PHOTO_MIN_QUALITY:
+            return out.getvalue()
+        quality -= 10
+
+
+def ingest(raw):
+    """Raw image bytes -> Photo (JPEG, PHOTO_SIZE)."""
+    if not raw:
+        raise PhotoError("Empty photo")
+    img = _open(raw)
+    try:
+        img = ImageOps.exif_transpose(img)
+        if img.mode != 'RGB':
+            # Transparent PNG -> puting background (hindi itim)
+            rgba = img.convert('RGBA')
+            img = Image.new('RGB', rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.getchannel('A'))
+        img = img.crop(_crop_box(*img.size))
+        if img.size != PHOTO_SIZE:
+            img = img.resize(PHOTO_SIZE, Image.LANCZOS, reducing_gap=3.0)
+        data = _encode(img)
+    except PhotoError:
+        raise
+    except Exception as e:
+        raise PhotoError(f"Could not process photo: {e}")
+    return Photo(data, 'image/jpeg', PHOTO_SIZE[0], PHOTO_SIZE[1], len(raw))
+
+
+def decode_data_url(data_url):
+    """'data:image/...;base64,...' -> bytes. None kung hindi data URL."""
+    if not data_url or not data_url.startswith('data:') or ',' not in data_url:
+        return None
+    try:
+        return base64.b64decode(data_url.split(',', 1)[1])
+    except Exception as e:
+        raise PhotoError(f"Invalid photo data: {e}")
+
+
+def to_data_url(photo):
+    return f"data:{photo.content_type};base64,{base64.b64encode(photo.data).decode()}"
+
+
+def store(storage, photo):
+    """Upload sa Storage (bagong pangalan bawat photo). Returns ang public URL."""
+    path = f"{PHOTO_FOLDER}/{uuid.uuid4().hex}.jpg"
+    bucket = storage.from_(PHOTO_BUCKET)
+    bucket.upload(path, photo.data, {'content-type': photo.content_type})
+    return bucket.get_public_url(path)
+
+
+if __name__ == '__main__':
+    import argparse
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    parser = argparse.ArgumentParser(description="Move inline member photos to Storage, downscaled.")
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    load_dotenv()
+    client = create_client(os.environ["SUPAB_URL"], os.environ["SUPAB_SERVICE_KEY"])
+    rows = client.from_('members').select('id, photo_data').like('photo_data', 'data:%') \
+        .limit(args.limit).execute().data or []
+
+    before = after = 0
+    for row in rows:
+        try:
+            photo = ingest(decode_data_url(row['photo_data']))
+        except PhotoError as e:
+            print(f"{row['id']}: skipped ({e})")
+            continue
+        before += len(row['photo_data'])
+        after += len(photo.data)
+        if not args.dry_run:
+            url = store(client.storage, photo)
+            client.from_('members').update({'photo_data': url}).eq('id', row['id']).execute()
+        print(f"{row['id']}: {len(row['photo_data'])} -> {len(photo.data)} bytes")
+    print(f"{len(rows)} rows, {before} -> {after} bytes{' (dry run)' if args.dry_run else ''}")
@@ -0,0 +1,369 @@
+# ==============================
+# PROFILING: Opt-in sampling profiler + tracemalloc diffs (admin lang)
+# ==============================
+# Kapag bumagal ang search_members / save_card_image sa production, wala
+# tayong makita kundi logs. Ito ang opt-in na paraan, walang redeploy:
+#
+# 1. Per request: header na `X-Profile: <signed token>`. Ang token ay galing
+#    sa POST /debug/profile/token (admin) at may expiry, kaya puwedeng ibigay
+#    sa browser / curl nang hindi ibinibigay ang ADMIN_TOKEN.
+# 2. Sampled: PROFILE_SAMPLE_RATE (0..1) ng requests sa PROFILE_ROUTES
+#    (endpoint names, hal. "search_members,save_card_image"; blangko = lahat).
+#
+# Ang sampler ay isang background thread na bawat PROFILE_INTERVAL_MS ay
+# kumukuha ng stack ng mga naka-profile na request threads
+# (sys._current_frames). Walang thread kapag walang naka-profile, kaya zero
+# ang gastos sa normal na traffic. Output sa PROFILE_DIR:
+#   *.collapsed         - "frame;frame;frame count" (flamegraph.pl / speedscope)
+#   *.speedscope.json   - diretsong buksan sa https://www.speedscope.app
+#
+# tracemalloc: start (baseline) -> diff (top allocations mula baseline) -> stop.
+#
+# Lahat ay per worker process (pid nasa response); ADMIN_TOKEN na walang laman
+# = naka-disable ang buong surface (404).
+import os
+import sys
+import time
+import json
+import hmac
+import base64
+import random
+import hashlib
+import tempfile
+import threading
+import tracemalloc
+from collections import Counter
+from functools import wraps
+
+from flask import g, request, jsonify
+
+import metrics
+import logging_setup
+
+log = logging_setup.get_logger('profiling')
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_HEADER = 'X-Profile'
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "idsystem-profiles"))
+PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "speedscope").lower()     # speedscope | collapsed
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_ROUTES = {name.strip() for name in os.getenv("PROFILE_ROUTES", "").split(',') if name.strip()}
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))
+PROFILE_TOKEN_TTL = int(os.getenv("PROFILE_TOKEN_TTL", "900"))
+PROFILE_MAX_DEPTH = 128
+
+# Hindi kailanman pino-profile (maingay / sarili nating endpoints)
+SKIP_PREFIXES = ('/static', '/health', '/metrics', '/debug')
+
+PROFILES_WRITTEN = metrics.REGISTRY.counter(
+    'profiles_written_total', 'Request profiles written by trigger (header, sampled).', ('trigger',))
+
+
+def enabled():
+    return bool(ADMIN_TOKEN)
+
+
+# ==============================
+# AUTH
+# ==============================
+def _b64(raw):
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _sign(body):
+    return _b64(hmac.new(ADMIN_TOKEN.encode(), f"profile:{body}".encode(), hashlib.sha256).digest())
+
+
+def issue_token(ttl=PROFILE_TOKEN_TTL):
+    """Value para sa X-Profile header: '<expires>.<signature>'."""
+    expires = int(time.time() + ttl)
+    return f"{expires}.{_sign(expires)}", expires
+
+
+def verify_token(token):
+    if not enabled() or not token or '.' not in token:
+        return False
+    expires, _, signature = token.partition('.')
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(expires))
+
+
+def is_admin():
+    supplied = request.headers.get('X-Admin-Token', '')
+    auth = request.headers.get('Authorization', '')
+    if auth.startswith('Bearer '):
+        supplied = auth[7:]
+    return enabled() and bool(supplied) and hmac.compare_digest(supplied.encode(), ADMIN_TOKEN.encode())
+
+
+def admin_required(view):
+    """ADMIN_TOKEN (X-Admin-Token o Authorization: Bearer). Naka-disable = 404."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not enabled():
+            return jsonify({'success': False, 'message': 'Not found'}), 404
+        if not is_admin():
+            return jsonify({'success': False, 'message': 'Admin token required'}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+
+# ==============================
+# SAMPLER
+# ==============================
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """Isang thread para sa lahat ng naka-profile na requests ng process."""
+
+    def __init__(self, interval=PROFILE_INTERVAL_MS / 1000.0):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._targets = {}       # thread id -> Counter(stack tuple -> samples)
+        self._thread = None
+
+    def start(self, thread_id):
+        counter = Counter()
+        with self._lock:
+            self._targets[thread_id] = counter
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+                self._thread.start()
+        return counter
+
+    def stop(self, thread_id):
+        with self._lock:
+            return self._targets.pop(thread_id, Counter())
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            with self._lock:
+                if not self._targets:
+                    self._thread = None
+                    return
+                targets = list(self._targets.items())
+            frames = sys._current_frames()
+            for thread_id, counter in targets:
+                frame = frames.get(thread_id)
+                if frame is None or thread_id == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < PROFILE_MAX_DEPTH:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                counter[tuple(reversed(stack))] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+sampler = Sampler()
+
+
+def collapsed(samples):
+    """Brendan Gregg collapsed stacks: 'root;child;leaf 12' bawat linya."""
+    return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in samples.most_common())
+
+
+def speedscope(samples, name, interval_ms=PROFILE_INTERVAL_MS):
+    frames, index = [], {}
+    stacks, weights = [], []
+    for stack, count in samples.most_common():
+        ids = []
+        for label in stack:
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({'name': label})
+            ids.append(index[label])
+        stacks.append(ids)
+        weights.append(round(count * interval_ms, 3))
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': name,
+        'exporter': 'idsystem-profiling',
+        'activeProfileIndex': 0,
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled', 'name': name, 'unit': 'milliseconds',
+            'startValue': 0, 'endValue': round(sum(weights), 3),
+            'samples': stacks, 'weights': weights,
+        }],
+    }
+
+
+# ==============================
+# STORAGE NG PROFILES
+# ==============================
+def _safe_name(name):
+    if not name or '/' in name or '\\' in name or name.startswith('.'):
+        return None
+    return name
+
+
+def list_profiles():
+    try:
+        names = sorted(os.listdir(PROFILE_DIR), reverse=True)
+    except FileNotFoundError:
+        return []
+    result = []
+    for name in names:
+        if name.startswith('.'):
+            continue    # sinusulat pa
+        path = os.path.join(PROFILE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        result.append({'name': name, 'bytes': stat.st_size, 'created_at': stat.st_mtime})
+    return result
+
+
+def profile_path(name):
+    name = _safe_name(name)
+    path = os.path.join(PROFILE_DIR, name) if name else None
+    return path if path and os.path.isfile(path) else None
+
+
+def _write(name, samples, elapsed):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    if PROFILE_FORMAT == 'collapsed':
+        filename, body = f"{name}.collapsed", collapsed(samples)
+    else:
+        filename = f"{name}.speedscope.json"
+        body = json.dumps(speedscope(samples, f"{name} ({elapsed * 1000:.0f}ms)"), separators=(',', ':'))
+    tmp = os.path.join(PROFILE_DIR, f".{filename}.tmp")
+    with open(tmp, 'w') as f:
+        f.write(body)
+    os.replace(tmp, os.path.join(PROFILE_DIR, filename))
+    # Bounded: ang pinakaluma ang binubura
+    for old in list_profiles()[PROFILE_KEEP:]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old['name']))
+        except FileNotFoundError:
+            pass
+    return filename
+
+
+# ==============================
+# FLASK MIDDLEWARE
+# ==============================
+def _trigger():
+    if not enabled() or request.path.startswith(SKIP_PREFIXES):
+        return None
+    if verify_token(request.headers.get(PROFILE_HEADER)):
+        return 'header'
+    if PROFILE_SAMPLE_RATE > 0 and (not PROFILE_ROUTES or request.endpoint in PROFILE_ROUTES) \
+            and random.random() < PROFILE_SAMPLE_RATE:
+        return 'sampled'
+    return None
+
+
+def _before_request():
+    trigger = _trigger()
+    if trigger is None:
+        return
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    request_id = g.get('request_id') or f"{time.time_ns():x}"
+    g._profile = {
+        'name': f"{stamp}-{request.endpoint or 'unmatched'}-{request_id[:12]}",
+        'trigger': trigger,
+        'thread': threading.get_ident(),
+        'start': time.perf_counter(),
+    }
+    sampler.start(g._profile['thread'])
+
+
+def _after_request(response):
+    profile = g.get('_profile')
+    if profile is not None:
+        response.headers['X-Profile-Id'] = profile['name']
+    return response
+
+
+def _teardown_request(exc):
+    profile = g.pop('_profile', None)
+    if profile is None:
+        return
+    samples = sampler.stop(profile['thread'])
+    elapsed = time.perf_counter() - profile['start']
+    if not samples:
+        return    # mas mabilis sa isang interval - walang makikita
+    try:
+        filename = _write(profile['name'], samples, elapsed)
+        PROFILES_WRITTEN.inc(trigger=profile['trigger'])
+        log.info(f"Profile written: {filename} ({sum(samples.values())} samples, {elapsed * 1000:.0f}ms)")
+    except OSError as e:
+        log.warning(f"Profile write failed for {profile['name']}: {e}")
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+
+# ==============================
+# TRACEMALLOC
+# ==============================
+_tracemalloc_lock = threading.Lock()
+_baseline = None
+
+
+def _snapshot():
+    # Huwag isama ang sariling allocations ng tracemalloc / import machinery
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ))
+
+
+def tracemalloc_start(frames=10):
+    """Simulan ang tracing at kunin ang baseline snapshot (pinapalitan ang luma)."""
+    global _baseline
+    with _tracemalloc_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, min(int(frames), 50)))
+        _baseline = _snapshot()
+        return tracemalloc_status()
+
+
+def tracemalloc_status():
+    current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    return {
+        'tracing': tracemalloc.is_tracing(),
+        'frames': tracemalloc.get_traceback_limit() if tracemalloc.is_tracing() else 0,
+        'has_baseline': _baseline is not None,
+        'traced_bytes': current,
+        'peak_bytes': peak,
+        'pid': os.getpid(),
+    }
+
+
+def tracemalloc_diff(top=25, key_type='lineno'):
+    """Top allocation changes mula sa baseline (current - baseline)."""
+    if key_type not in ('lineno', 'filename', 'traceback'):
+        raise ValueError(f"Invalid key type: {key_type}")
+    with _tracemalloc_lock:
+        if not tracemalloc.is_tracing() or _baseline is None:
+            raise ValueError("tracemalloc is not running (POST /debug/tracemalloc/start first)")
+        stats = _snapshot().compare_to(_baseline, key_type)
+    return dict(tracemalloc_status(), stats=[{
+        'size_diff': stat.size_diff,
+        'size': stat.size,
+        'count_diff': stat.count_diff,
+        'count': stat.count,
+        'traceback': [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+    } for stat in stats[:max(1, min(int(top), 200))]])
+
+
+def tracemalloc_stop():
+    global _baseline
+    with _tracemalloc_lock:
+        _baseline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return tracemalloc_status()
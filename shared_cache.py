@@ -0,0 +1,424 @@
+# ==============================
+# SHARED CACHE: Cross-worker cache para sa hot reads
+# ==============================
+# Ang per-process cache ay N beses nagwa-warm up (isa per gunicorn worker) at
+# hiwa-hiwalay na nagiging stale. Dito, iisang cache para sa buong host:
+#
+# Backends (CACHE_BACKEND):
+#   sqlite - shared file sa host (default; WAL, ligtas sa maraming workers)
+#   redis  - Redis-protocol server sa CACHE_REDIS_URL (optional `redis` package)
+#   local  - in-process LRU lang (dev / single worker)
+#
+# Namespaces ("settings", "layouts", "members", ...) ay may sariling version
+# counter. bump() = invalidate ng buong namespace sa lahat ng workers; ang
+# keys ng lumang version ay binubura rin agad (hindi na hinihintay ang TTL).
+# Ang version ay naka-cache sa bawat worker nang CACHE_VERSION_TTL seconds
+# (para hindi dalawang backend round trip ang bawat get). Ang worker na nag-bump
+# ay nakakakita agad ng bagong version; ang iba, sa loob ng CACHE_VERSION_TTL.
+#
+# May hangganan ang laki: ang value na lampas sa CACHE_MAX_VALUE_BYTES ay hindi
+# kina-cache, at ang SQLite file ay pinu-prune pababa sa CACHE_SQLITE_MAX_BYTES.
+# Huwag mag-cache ng base64 photos / pirma dito (projected columns lang).
+#
+# get_or_set() ay may stampede protection: isang thread per worker (single-flight)
+# at isang worker per host (backend lock) lang ang nagko-compute ng expired na
+# key; ang iba ay naghihintay sandali sa resulta.
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+
+import metrics
+import logging_setup
+from singleflight import Group
+
+try:
+    import redis  # optional dependency
+except ImportError:
+    redis = None
+
+log = logging_setup.get_logger('cache')
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite").lower()
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "idsystem-cache.sqlite3"))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_PREFIX = os.getenv("CACHE_PREFIX", "idsys")
+CACHE_DEFAULT_TTL = float(os.getenv("CACHE_DEFAULT_TTL", "60"))
+CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "1024"))
+CACHE_SQLITE_MAX_ENTRIES = int(os.getenv("CACHE_SQLITE_MAX_ENTRIES", "5000"))
+CACHE_SQLITE_MAX_BYTES = int(os.getenv("CACHE_SQLITE_MAX_MB", "64")) * 1024 * 1024
+CACHE_MAX_VALUE_BYTES = int(os.getenv("CACHE_MAX_VALUE_KB", "2048")) * 1024
+CACHE_VERSION_TTL = float(os.getenv("CACHE_VERSION_TTL", "1"))
+
+# Stampede protection
+LOCK_TTL_SECONDS = 30      # kung mamatay ang worker habang may hawak na lock
+LOCK_WAIT_SECONDS = 5      # gaano katagal maghihintay sa ibang worker bago mag-compute na rin
+LOCK_POLL_SECONDS = 0.05
+
+CACHE_REQUESTS = metrics.REGISTRY.counter(
+    'cache_requests_total', 'Shared cache lookups by namespace and result.', ('namespace', 'result'))
+
+
+def _prefix_range(prefix):
+    """'idsys:members:' -> ('idsys:members:', 'idsys:members;') para sa range scan."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+# ==============================
+# BACKENDS: get / set / add (set-if-absent) / delete / incr
+# ==============================
+class LocalBackend:
+    def __init__(self, max_entries=CACHE_LOCAL_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data = OrderedDict()   # key -> (expires_at or None, value)
+
+    def _live(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= now:
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key, time.time())
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key, value, ttl):
+        self._data[key] = (time.time() + ttl if ttl else None, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        with self._lock:
+            if self._live(key, time.time()) is not None:
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            entry = self._live(key, time.time())
+            value = int(entry[1]) + 1 if entry else 1
+            self._store(key, str(value).encode(), None)
+            return value
+
+    def delete_prefix(self, prefix, keep=None):
+        """Burahin ang keys na nagsisimula sa `prefix` maliban sa nagsisimula sa `keep`."""
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix) and not (keep and k.startswith(keep))]:
+                del self._data[key]
+
+
+class SQLiteBackend:
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache (
+        key        TEXT PRIMARY KEY,
+        value      BLOB NOT NULL,
+        expires_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS cache_expires_idx ON cache (expires_at);
+    """
+    PRUNE_EVERY = 200            # writes
+    PRUNE_INTERVAL_SECONDS = 30  # o ganito katagal mula sa huling prune (alinman ang mauna)
+
+    def __init__(self, path=CACHE_SQLITE_PATH, max_entries=CACHE_SQLITE_MAX_ENTRIES,
+                 max_bytes=CACHE_SQLITE_MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._pruned_at = time.monotonic()
+        self._conn().executescript(self._SCHEMA)
+
+    def _conn(self):
+        # Isa per thread; bago pagkatapos ng fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        conn = self._conn()
+        row = conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= time.time():
+            # Expired: burahin na agad, hindi na hintayin ang prune
+            conn.execute("DELETE FROM cache WHERE key = ? AND expires_at <= ?", (key, time.time()))
+            return None
+        return row[0]
+
+    def set(self, key, value, ttl=None):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl if ttl else None))
+        self._maybe_prune()
+
+    def add(self, key, value, ttl=None):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM cache WHERE key = ? AND expires_at IS NOT NULL AND expires_at <= ?", (key, now))
+            cursor = conn.execute("INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                                  (key, value, now + ttl if ttl else None))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def incr(self, key):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, '0', NULL)", (key,))
+            conn.execute("UPDATE cache SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT) WHERE key = ?", (key,))
+            value = conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return int(value)
+
+    def delete_prefix(self, prefix, keep=None):
+        """Burahin ang keys na nagsisimula sa `prefix` maliban sa nagsisimula sa `keep`."""
+        low, high = _prefix_range(prefix)
+        if keep:
+            keep_low, keep_high = _prefix_range(keep)
+            self._conn().execute(
+                "DELETE FROM cache WHERE key >= ? AND key < ? AND NOT (key >= ? AND key < ?)",
+                (low, high, keep_low, keep_high))
+        else:
+            self._conn().execute("DELETE FROM cache WHERE key >= ? AND key < ?", (low, high))
+
+    def _maybe_prune(self):
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY and time.monotonic() - self._pruned_at < self.PRUNE_INTERVAL_SECONDS:
+            return
+        self.prune()
+
+    def prune(self):
+        self._pruned_at = time.monotonic()
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        # Lampas sa max: tanggalin ang pinakamalapit nang mag-expire (hindi ang version counters)
+        conn.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache WHERE expires_at IS NOT NULL "
+            "ORDER BY expires_at LIMIT max(0, (SELECT COUNT(*) FROM cache) - ?))", (self.max_entries,))
+        # Lampas sa byte budget: parehong order, hanggang 90% ng max
+        total = conn.execute("SELECT COALESCE(SUM(length(value)), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target, victims = self.max_bytes * 0.9, []
+        for key, size in conn.execute(
+                "SELECT key, length(value) FROM cache WHERE expires_at IS NOT NULL ORDER BY expires_at"):
+            if total <= target:
+                break
+            victims.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+        log.info(f"Shared cache over budget: pruned {len(victims)} entries")
+
+
+class RedisBackend:
+    def __init__(self, url=CACHE_REDIS_URL):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self._client.set(key, value, nx=True, px=int(ttl * 1000) if ttl else None))
+
+    def delete(self, key):
+        self._client.delete(key)
+
+    def incr(self, key):
+        return int(self._client.incr(key))
+
+    def delete_prefix(self, prefix, keep=None):
+        stale = [key for key in self._client.scan_iter(match=prefix + '*', count=500)
+                 if not (keep and key.decode().startswith(keep))]
+        if stale:
+            self._client.delete(*stale)
+
+
+def create_backend(name=CACHE_BACKEND):
+    if name == 'redis':
+        return RedisBackend()
+    if name == 'sqlite':
+        try:
+            return SQLiteBackend()
+        except Exception as e:
+            # e.g. read-only filesystem: mas mabuti pang per-process cache kaysa bumagsak
+            log.warning(f"SQLite cache unavailable ({e}); falling back to in-process LRU")
+            return LocalBackend()
+    if name != 'local':
+        raise ValueError(f"Unknown CACHE_BACKEND: {name}")
+    return LocalBackend()
+
+
+# ==============================
+# NAMESPACES
+# ==============================
+_MISSING = object()
+
+
+class Namespace:
+    def __init__(self, backend, name, ttl=CACHE_DEFAULT_TTL, prefix=CACHE_PREFIX):
+        self.backend = backend
+        self.name = name
+        self.ttl = ttl
+        # Walang window: ang natapos na ay nasa backend na
+        self._flights = Group(f"cache:{name}", window=0)
+        self._version_key = f"{prefix}:ns:{name}"
+        self._prefix = f"{prefix}:{name}"
+        self._version = None           # (version, monotonic time na nakuha)
+        self._warned_too_large = False
+
+    def version(self):
+        cached = self._version
+        if cached is not None and time.monotonic() - cached[1] < CACHE_VERSION_TTL:
+            return cached[0]
+        raw = self.backend.get(self._version_key)
+        version = int(raw) if raw else 0
+        self._version = (version, time.monotonic())
+        return version
+
+    def bump(self):
+        """Invalidate ang lahat ng keys sa namespace (lahat ng workers)."""
+        try:
+            version = self.backend.incr(self._version_key)
+        except Exception as e:
+            self._version = None
+            log.warning(f"Cache bump failed for '{self.name}': {e}")
+            return None
+        self._version = (version, time.monotonic())
+        try:
+            # Hindi na mababasa ang lumang version - burahin na (hindi hintayin ang TTL)
+            self.backend.delete_prefix(f"{self._prefix}:", keep=f"{self._prefix}:{version}:")
+        except Exception as e:
+            log.warning(f"Cache prune after bump failed for '{self.name}': {e}")
+        return version
+
+    def _encode(self, key, value):
+        """JSON bytes, o None kung lampas sa CACHE_MAX_VALUE_BYTES (hindi kina-cache)."""
+        raw = json.dumps(value, default=str).encode()
+        if len(raw) > CACHE_MAX_VALUE_BYTES:
+            CACHE_REQUESTS.inc(namespace=self.name, result='too_large')
+            # Isang log lang per namespace; ang kasunod ay nasa cache_requests_total{result="too_large"}
+            if not self._warned_too_large:
+                self._warned_too_large = True
+                log.warning(f"Cache value too large for '{self.name}:{key}' ({len(raw)} bytes); not cached")
+            return None
+        return raw
+
+    def _key(self, key):
+        return f"{self._prefix}:{self.version()}:{key}"
+
+    def _read(self, full_key):
+        raw = self.backend.get(full_key)
+        return _MISSING if raw is None else json.loads(raw)
+
+    def get(self, key, default=None):
+        try:
+            value = self._read(self._key(key))
+        except Exception:
+            return default
+        return default if value is _MISSING else value
+
+    def set(self, key, value, ttl=None):
+        try:
+            raw = self._encode(key, value)
+            if raw is not None:
+                self.backend.set(self._key(key), raw, ttl or self.ttl)
+        except Exception as e:
+            log.warning(f"Cache set failed for '{self.name}:{key}': {e}")
+
+    def get_or_set(self, key, loader, ttl=None):
+        """
+        Cached value, o loader() kung wala. Ang exception ng loader ay hindi
+        kina-cache (lalabas pa rin sa caller). Kung sira ang cache backend,
+        diretso sa loader.
+        """
+        ttl = ttl or self.ttl
+        try:
+            full_key = self._key(key)
+            value = self._read(full_key)
+        except Exception as e:
+            CACHE_REQUESTS.inc(namespace=self.name, result='error')
+            log.warning(f"Cache read failed for '{self.name}:{key}': {e}")
+            return loader()
+        if value is not _MISSING:
+            CACHE_REQUESTS.inc(namespace=self.name, result='hit')
+            return value
+
+        CACHE_REQUESTS.inc(namespace=self.name, result='miss')
+        return self._flights.do(full_key, lambda: self._fill(full_key, loader, ttl))
+
+    def _fill(self, full_key, loader, ttl):
+        # Baka natapos na ang ibang flight habang papasok tayo
+        value = self._read(full_key)
+        if value is not _MISSING:
+            return value
+
+        lock_key = full_key + ':lock'
+        if not self.backend.add(lock_key, b'1', LOCK_TTL_SECONDS):
+            # Ibang worker ang nagko-compute: hintayin sandali
+            deadline = time.monotonic() + LOCK_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_SECONDS)
+                value = self._read(full_key)
+                if value is not _MISSING:
+                    return value
+            return loader()
+
+        try:
+            value = loader()
+            raw = self._encode(full_key, value)
+            if raw is None:
+                return json.loads(json.dumps(value, default=str))
+            self.backend.set(full_key, raw, ttl)
+            # Ibalik ang parehong anyo na makukuha ng ibang workers (JSON round trip)
+            return json.loads(raw)
+        finally:
+            self.backend.delete(lock_key)
+
+
+backend = create_backend()
+
+
+def namespace(name, ttl=CACHE_DEFAULT_TTL):
+    return Namespace(backend, name, ttl)
@@ -0,0 +1,139 @@
+# ==============================
+# SIGNATURE NORMALIZATION (trim -> scale -> palette quantize -> optional SVG)
+# ==============================
+# Ang signature_pad ay nagse-send ng buong canvas (karamihan transparent/puti).
+# Bago i-save, pinapaliit natin:
+#   1. Autocrop sa ink bounding box (+ konting padding)
+#   2. Scale pababa sa standard na taas (SIGNATURE_HEIGHT)
+#   3. Palette PNG: isang ink color + ilang alpha levels (2 levels = 1-bit)
+#   4. Optional: vectorize to SVG (SIGNATURE_FORMAT=svg)
+# Kung pumalya o walang ink, ibinabalik ang original para hindi masira ang save.
+import io
+import os
+import base64
+from statistics import median
+
+from PIL import Image
+
+SIGNATURE_HEIGHT = int(os.getenv("SIGNATURE_HEIGHT", "120"))
+SIGNATURE_LEVELS = int(os.getenv("SIGNATURE_LEVELS", "4"))        # incl. fully transparent
+SIGNATURE_PADDING = int(os.getenv("SIGNATURE_PADDING", "4"))
+SIGNATURE_FORMAT = os.getenv("SIGNATURE_FORMAT", "png").lower()    # png | svg
+
+# Pixel na mas mahina ang alpha dito ay itinuturing na background
+INK_THRESHOLD = 24
+
+
+def _decode(data):
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    payload = data.split(',', 1)[1] if data.startswith('data:') and ',' in data else data
+    return base64.b64decode(payload)
+
+
+def _ink_alpha(img):
+    """Alpha channel na ink = opaque. Kung walang transparency (puting background), galing sa luminance."""
+    rgba = img.convert('RGBA')
+    alpha = rgba.getchannel('A')
+    if alpha.getextrema()[0] == 255:
+        # Walang transparency: madilim = ink
+        alpha = rgba.convert('L').point(lambda v: 255 - v)
+    return rgba, alpha
+
+
+def _ink_color(rgba, alpha):
+    """Median color ng mga talagang ink na pixel (para hindi maging gray ang pirma)."""
+    solid = alpha.point(lambda a: 255 if a >= 200 else 0)
+    bbox = solid.getbbox()
+    if bbox is None:
+        return (0, 0, 0)
+    # tobytes sa halip na getdata (deprecated sa bagong Pillow): RGBA = 4 bytes per pixel
+    colors, mask = rgba.crop(bbox).tobytes(), solid.crop(bbox).tobytes()
+    pixels = [colors[i * 4:i * 4 + 3] for i, a in enumerate(mask) if a]
+    step = max(1, len(pixels) // 2000)
+    sample = pixels[::step]
+    return tuple(int(median(p[i] for p in sample)) for i in range(3))
+
+
+def _to_svg(mask, color):
+    """
+    Run-length rectangles per row (pinagsasama ang magkakaparehong run sa
+    sunod-sunod na rows) -> isang <path>. Simple pero walang dependency.
+    """
+    width, height = mask.size
+    data = mask.load()
+    commands = []
+    open_runs = {}    # (start, end) -> first row
+    for y in range(height + 1):
+        runs = set()
+        x = 0
+        while y < height and x < width:
+            if data[x, y]:
+                start = x
+                while x < width and data[x, y]:
+                    x += 1
+                runs.add((start, x))
+            else:
+                x += 1
+        for run in [r for r in open_runs if r not in runs]:
+            top = open_runs.pop(run)
+            commands.append(f"M{run[0]} {top}h{run[1] - run[0]}v{y - top}h-{run[1] - run[0]}z")
+        for run in runs:
+            open_runs.setdefault(run, y)
+    fill = '#%02x%02x%02x' % color
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}" shape-rendering="crispEdges">'
+            f'<path fill="{fill}" d="{"".join(commands)}"/></svg>').encode()
+
+
+def normalize_bytes(raw, height=SIGNATURE_HEIGHT, levels=SIGNATURE_LEVELS, fmt=SIGNATURE_FORMAT,
+                    padding=SIGNATURE_PADDING):
+    """
+    Returns (mimetype, bytes) ng normalized na pirma, o None kung walang ink / hindi image.
+    """
+    img = Image.open(io.BytesIO(raw))
+    img.load()
+    rgba, alpha = _ink_alpha(img)
+
+    bbox = alpha.point(lambda a: 255 if a > INK_THRESHOLD else 0).getbbox()
+    if bbox is None:
+        return None
+    left, top, right, bottom = bbox
+    bbox = (max(0, left - padding), max(0, top - padding),
+            min(img.width, right + padding), min(img.height, bottom + padding))
+    color = _ink_color(rgba.crop(bbox), alpha.crop(bbox))
+    alpha = alpha.crop(bbox)
+
+    # Pababa lang ang scaling; walang dagdag na detalye kung palalakihin
+    if height and alpha.height > height:
+        width = max(1, round(alpha.width * height / alpha.height))
+        alpha = alpha.resize((width, height), Image.LANCZOS)
+
+    if fmt == 'svg':
+        mask = alpha.point(lambda a: 1 if a >= 128 else 0, mode='1')
+        return 'image/svg+xml', _to_svg(mask, color)
+
+    # Palette: index 0 = transparent, 1..levels-1 = ink na pataas ang opacity
+    levels = max(2, min(levels, 16))
+    step = 255 / (levels - 1)
+    indexed = alpha.point(lambda a: min(levels - 1, int(a / step + 0.5)))
+    palette_img = Image.frombytes('P', indexed.size, indexed.tobytes())
+    palette_img.putpalette(list(color) * levels)
+    transparency = bytes(min(255, round(i * step)) for i in range(levels))
+
+    bits = 1 if levels <= 2 else 2 if levels <= 4 else 4
+    out = io.BytesIO()
+    palette_img.save(out, format='PNG', optimize=True, bits=bits, transparency=transparency)
+    return 'image/png', out.getvalue()
+
+
+def normalize_data_url(data_url, **options):
+    """Para sa base64 data URLs galing sa signature_pad. Original ang ibinabalik kung di ma-normalize."""
+    raw = _decode(data_url)
+    result = normalize_bytes(raw, **options)
+    if result is None:
+        return data_url
+    mimetype, payload = result
+    if len(payload) >= len(raw):
+        return data_url  # Mas maliit pa pala ang original
+    return f"data:{mimetype};base64,{base64.b64encode(payload).decode()}"
@@ -0,0 +1,205 @@
+# ==============================
+# SIGNATURE REGISTRY: Cached officer / company signature lookups
+# ==============================
+# Dati, bawat tawag sa get_officers_list / signaturetable ay buong table
+# (kasama ang base64 na pirma) ang kinukuha sa Supabase. Ngayon:
+#   - Name index: projected columns lang (walang pirma), naka-cache ng ilang segundo
+#   - Pirma: kinukuha lang kapag kailangan, by id, at naka-cache ng matagal (LRU)
+#   - Lahat ng save/update/delete routes ay tumatawag ng invalidate()
+#
+# `generation` ay tumataas bawat invalidate; ginagamit sa image URLs (?v=)
+# para hindi ma-stuck ang browser sa lumang pirma. Ang URLs na ito ay para sa
+# display lang: bago i-save ang layout, embed_images() ang nagbabalik ng
+# mismong data URL (gaya ng dati), kaya hindi naka-depende ang layout sa host,
+# sa generation, o sa officer row.
+#
+# Kung may `cache` (shared_cache namespace), doon naka-store ang name index at
+# ang generation = namespace version, kaya ang invalidate sa isang worker ay
+# kita agad ng lahat ng workers.
+import os
+import re
+import time
+import base64
+import threading
+from collections import OrderedDict
+
+from singleflight import Group
+
+INDEX_TTL_SECONDS = float(os.getenv("SIGNATURE_INDEX_TTL_SECONDS", "30"))
+IMAGE_TTL_SECONDS = float(os.getenv("SIGNATURE_IMAGE_TTL_SECONDS", "3600"))
+IMAGE_CACHE_SIZE = int(os.getenv("SIGNATURE_IMAGE_CACHE_SIZE", "256"))
+
+OFFICER = 'officer'
+COMPANY = 'company'
+
+# kind -> (table, projected index columns, signature column(s), order column, desc)
+# Company: 'signature' (save_signature) o 'man_signature' (save_signaturetable)
+_SOURCES = {
+    OFFICER: ('officer_list', 'id, name_officer, designation, text_signature, created_at',
+              ('man_signature',), 'created_at', True),
+    COMPANY: ('signaturetable', 'id, name',
+              ('signature', 'man_signature'), 'name', True),
+}
+
+# image_url(), relative o absolute (ang img.src ng browser ay absolute)
+_IMAGE_URL_RE = re.compile(r'^(?:https?://[^/?#]+)?/signature_image/(%s|%s)/(\d+)(?:\?v=\d+)?$' % (OFFICER, COMPANY))
+
+
+def parse_data_url(data_url):
+    """'data:image/png;base64,AAAA' -> (mimetype, bytes). Walang header = PNG."""
+    if not data_url:
+        return None, None
+    if data_url.startswith('data:') and ',' in data_url:
+        header, payload = data_url.split(',', 1)
+        mimetype = header[5:].split(';', 1)[0] or 'image/png'
+    else:
+        mimetype, payload = 'image/png', data_url
+    return mimetype, base64.b64decode(payload)
+
+
+class SignatureRegistry:
+    def __init__(self, get_db, index_ttl=INDEX_TTL_SECONDS, image_ttl=IMAGE_TTL_SECONDS,
+                 image_cache_size=IMAGE_CACHE_SIZE, cache=None):
+        self._get_db = get_db
+        self.index_ttl = index_ttl
+        self.image_ttl = image_ttl
+        self.image_cache_size = image_cache_size
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._indexes = {}             # kind -> (loaded_at, rows)
+        self._images = OrderedDict()   # (kind, id) -> (loaded_at, generation, data_url)
+        self._image_flights = Group('signature_image', window=0)
+        self._generation = 0
+
+    @property
+    def generation(self):
+        return self._cache.version() if self._cache is not None else self._generation
+
+    # ------------------------------
+    # NAME INDEX (projected, TTL)
+    # ------------------------------
+    def index(self, kind):
+        if self._cache is not None:
+            return self._cache.get_or_set(f"index:{kind}", lambda: self._load_index(kind), ttl=self.index_ttl)
+
+        with self._lock:
+            cached = self._indexes.get(kind)
+            if cached and time.monotonic() - cached[0] < self.index_ttl:
+                return cached[1]
+            generation = self._generation
+
+        rows = self._load_index(kind)
+
+        with self._lock:
+            # Huwag i-store kung may nag-invalidate habang nagfe-fetch tayo
+            if generation == self._generation:
+                self._indexes[kind] = (time.monotonic(), rows)
+        return rows
+
+    def _load_index(self, kind):
+        table, columns, signature_cols, order_col, desc = _SOURCES[kind]
+        try:
+            return self._get_db().from_(table).select(columns).order(order_col, desc=desc).execute().data or []
+        except Exception:
+            if kind != COMPANY:
+                raise
+        # Lumang signaturetable na 'Name' / 'NAME' ang column: select('*') gaya ng
+        # dati, i-standardize sa 'name', at tanggalin ang pirma sa index
+        rows = self._get_db().from_(table).select('*').execute().data or []
+        index = []
+        for item in rows:
+            row = {key: value for key, value in item.items()
+                   if key not in signature_cols and key not in ('Name', 'NAME')}
+            row['name'] = item.get('name') or item.get('Name') or item.get('NAME')
+            index.append(row)
+        index.sort(key=lambda row: row['name'] or '', reverse=desc)
+        return index
+
+    def officers(self):
+        return self.index(OFFICER)
+
+    def company_signatures(self):
+        return self.index(COMPANY)
+
+    def find_company_signature(self, name):
+        """Case-insensitive na hanap sa name index (gaya ng dating .ilike('name', name))."""
+        wanted = (name or '').strip().lower()
+        for row in self.company_signatures():
+            if (row.get('name') or '').strip().lower() == wanted:
+                return row
+        return None
+
+    # ------------------------------
+    # SIGNATURE IMAGES (lazy, LRU)
+    # ------------------------------
+    def image(self, kind, item_id):
+        """Returns the stored data URL of a signature, or None kung wala."""
+        key = (kind, int(item_id))
+        generation = self.generation
+        with self._lock:
+            cached = self._images.get(key)
+            if cached and cached[1] == generation and time.monotonic() - cached[0] < self.image_ttl:
+                self._images.move_to_end(key)
+                return cached[2]
+
+        # Sabay-sabay na <img> requests para sa parehong pirma = isang query
+        data_url = self._image_flights.do((kind, key[1], generation), lambda: self._load_image(kind, key[1]))
+
+        with self._lock:
+            if data_url:
+                self._images[key] = (time.monotonic(), generation, data_url)
+                self._images.move_to_end(key)
+                while len(self._images) > self.image_cache_size:
+                    self._images.popitem(last=False)
+        return data_url
+
+    def _load_image(self, kind, item_id):
+        table, _, sig_columns, _, _ = _SOURCES[kind]
+        # Isang column bawat query: ang lumang table na kulang ng isa sa mga
+        # column ay hindi dapat pumalya (gaya ng Name/NAME fallback sa index)
+        for index, column in enumerate(sig_columns):
+            try:
+                response = self._get_db().from_(table).select(column).eq('id', item_id).limit(1).execute()
+            except Exception:
+                if index == len(sig_columns) - 1:
+                    raise
+                continue
+            if not response.data:
+                return None
+            if response.data[0].get(column):
+                return response.data[0][column]
+        return None
+
+    def image_url(self, kind, item_id):
+        return f"/signature_image/{kind}/{item_id}?v={self.generation}"
+
+    def embed_images(self, value):
+        """
+        Kopya ng `value` (layout JSON) kung saan ang bawat image_url() ay
+        pinalitan ng mismong data URL. Wala na ang pirma = iniiwan ang URL.
+        """
+        if isinstance(value, dict):
+            return {key: self.embed_images(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.embed_images(item) for item in value]
+        if isinstance(value, str):
+            match = _IMAGE_URL_RE.match(value)
+            if match:
+                return self.image(match.group(1), int(match.group(2))) or value
+        return value
+
+    # ------------------------------
+    # INVALIDATION
+    # ------------------------------
+    def invalidate(self, kind, item_id=None):
+        """Tawagin pagkatapos ng save/update/delete. item_id=None -> buong kind."""
+        if self._cache is not None:
+            self._cache.bump()
+        with self._lock:
+            self._generation += 1
+            self._indexes.pop(kind, None)
+            if item_id is None:
+                for key in [k for k in self._images if k[0] == kind]:
+                    del self._images[key]
+            else:
+                self._images.pop((kind, int(item_id)), None)
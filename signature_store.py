@@ -0,0 +1,203 @@
+# ==============================
+# LOCAL SIGNATURE STORE (signatures/ + SQLite index)
+# ==============================
+# Dati: bawat DELETE /signature ay nag-li-list at nag-i-stat ng buong
+# signatures/ folder para hanapin ang pinakabago, at ang /upload ay
+# gumagamit ng per-second na filename (nagbabanggaan kapag sabay).
+# Ngayon:
+#   - Bawat entry ay may unique id (uuid) + row sa index.sqlite3
+#   - "Latest" = pinakamataas na seq (rowid) -> isang index lookup lang
+#   - Atomic write (tmp file + os.replace) bago i-insert sa index
+#   - WAL + busy_timeout para ligtas ang sabay-sabay na gunicorn workers
+#   - Retention: SIGNATURE_STORE_KEEP na pinakabago + SIGNATURE_STORE_MAX_AGE_DAYS
+#   - compact(): tinatanggal ang orphan files / rows (at ina-adopt ang
+#     lumang files na wala pa sa index, para sa unang run)
+import os
+import time
+import uuid
+import sqlite3
+import threading
+
+STORE_KEEP = int(os.getenv("SIGNATURE_STORE_KEEP", "200"))
+STORE_MAX_AGE_DAYS = float(os.getenv("SIGNATURE_STORE_MAX_AGE_DAYS", "0"))   # 0 = walang age limit
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# Files na mas bata dito ay hindi ina-adopt ng compact() (baka nasa gitna pa ng add() ng ibang worker)
+ADOPT_MIN_AGE_SECONDS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    id         TEXT NOT NULL UNIQUE,
+    filename   TEXT NOT NULL UNIQUE,
+    mimetype   TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS signatures_created_at_idx ON signatures (created_at);
+"""
+
+
+class SignatureStore:
+    def __init__(self, directory, keep=STORE_KEEP, max_age_days=STORE_MAX_AGE_DAYS, index_name='index.sqlite3'):
+        self.directory = directory
+        self.keep = keep
+        self.max_age_days = max_age_days
+        self.db_path = os.path.join(directory, index_name)
+        self._local = threading.local()
+        os.makedirs(directory, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+        self.compact()
+
+    # ------------------------------
+    # CONNECTION (isa per thread, bago pagkatapos ng fork)
+    # ------------------------------
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    class _Tx:
+        def __init__(self, conn):
+            self.conn = conn
+
+        def __enter__(self):
+            # IMMEDIATE: kunin agad ang write lock para walang lost update sa ibang worker
+            self.conn.execute("BEGIN IMMEDIATE")
+            return self.conn
+
+        def __exit__(self, exc_type, exc, tb):
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+            return False
+
+    def _transaction(self):
+        return self._Tx(self._conn())
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------
+    # WRITE / READ
+    # ------------------------------
+    def add(self, data, mimetype='image/png'):
+        """I-save ang image bytes. Returns ang entry dict (id, filename, size, created_at)."""
+        entry_id = uuid.uuid4().hex
+        ext = '.jpg' if mimetype == 'image/jpeg' else '.png'
+        created_at = time.time()
+        filename = f"signature_{time.strftime('%Y%m%d_%H%M%S', time.gmtime(created_at))}_{entry_id[:12]}{ext}"
+        final_path = self._path(filename)
+        tmp_path = final_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, final_path)
+
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "INSERT INTO signatures (id, filename, mimetype, size, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (entry_id, filename, mimetype, len(data), created_at))
+        except Exception:
+            self._unlink(final_path)
+            raise
+        self.apply_retention()
+        return {'id': entry_id, 'filename': filename, 'mimetype': mimetype,
+                'size': len(data), 'created_at': created_at}
+
+    def latest(self):
+        row = self._conn().execute("SELECT * FROM signatures ORDER BY seq DESC LIMIT 1").fetchone()
+        return dict(row) if row else None
+
+    def get(self, entry_id):
+        row = self._conn().execute("SELECT * FROM signatures WHERE id = ?", (entry_id,)).fetchone()
+        return dict(row) if row else None
+
+    def path_of(self, entry):
+        return self._path(entry['filename'])
+
+    def delete(self, entry_id):
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM signatures WHERE id = ?", (entry_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM signatures WHERE seq = ?", (row['seq'],))
+        self._unlink(self._path(row['filename']))
+        return dict(row)
+
+    def delete_latest(self):
+        """Atomic 'pop': walang dalawang worker na magde-delete ng parehong entry."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM signatures ORDER BY seq DESC LIMIT 1").fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM signatures WHERE seq = ?", (row['seq'],))
+        self._unlink(self._path(row['filename']))
+        return dict(row)
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    # ------------------------------
+    # RETENTION / COMPACTION
+    # ------------------------------
+    def apply_retention(self):
+        """Tanggalin ang lampas sa `keep` na pinakabago at ang mas luma sa max_age_days."""
+        with self._transaction() as conn:
+            expired = []
+            if self.keep:
+                expired += conn.execute(
+                    "SELECT seq, filename FROM signatures ORDER BY seq DESC LIMIT -1 OFFSET ?",
+                    (self.keep,)).fetchall()
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                expired += conn.execute(
+                    "SELECT seq, filename FROM signatures WHERE created_at < ?", (cutoff,)).fetchall()
+            seqs = {row['seq'] for row in expired}
+            conn.executemany("DELETE FROM signatures WHERE seq = ?", [(s,) for s in seqs])
+        for row in expired:
+            self._unlink(self._path(row['filename']))
+        return len(seqs)
+
+    def compact(self):
+        """
+        Ayusin ang index laban sa laman ng folder:
+          - row na wala nang file -> tanggalin
+          - lumang image file na wala sa index -> i-adopt (by mtime)
+          - naiwang *.tmp -> tanggalin
+        """
+        with self._transaction() as conn:
+            # Sa loob ng write lock: walang ibang add() na makakapag-insert habang nagli-list tayo
+            on_disk = set(os.listdir(self.directory))
+            stale_before = time.time() - ADOPT_MIN_AGE_SECONDS
+            indexed = {row['filename']: row['seq'] for row in conn.execute("SELECT seq, filename FROM signatures")}
+            missing = [seq for name, seq in indexed.items() if name not in on_disk]
+            conn.executemany("DELETE FROM signatures WHERE seq = ?", [(s,) for s in missing])
+
+            orphans = [n for n in on_disk if n.lower().endswith(IMAGE_EXTENSIONS) and n not in indexed
+                       and os.path.getmtime(self._path(n)) < stale_before]
+            orphans.sort(key=lambda n: os.path.getmtime(self._path(n)))
+            for name in orphans:
+                stat = os.stat(self._path(name))
+                mimetype = 'image/png' if name.lower().endswith('.png') else 'image/jpeg'
+                conn.execute(
+                    "INSERT INTO signatures (id, filename, mimetype, size, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (uuid.uuid4().hex, name, mimetype, stat.st_size, stat.st_mtime))
+
+        for name in on_disk:
+            if name.endswith('.tmp') and os.path.getmtime(self._path(name)) < stale_before:
+                self._unlink(self._path(name))
+        self.apply_retention()
+        return {'removed_rows': len(missing), 'adopted_files': len(orphans)}
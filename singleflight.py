@@ -0,0 +1,102 @@
+# ==============================
+# SINGLE-FLIGHT: Isang upstream call lang para sa sabay-sabay na parehong read
+# ==============================
+# Pagsimula ng chapter event, dose-dosenang phones ang sabay na tumatawag ng
+# /api/storage/list-all, at ang encoders ay sabay na naglo-load ng layout at
+# officers. Dati, bawat request = sariling Supabase call.
+#
+# Group.do(key, fn):
+#   - kung may in-flight na call para sa key, hintayin at gamitin ang resulta nito
+#   - kung natapos ito sa loob ng `window` seconds, ibalik na rin ang resulta
+#     (para sa mga dumating ilang millisecond lang pagkatapos). Ang resultang
+#     ito ay puwedeng nabasa BAGO ang isang write, kaya window=0 para sa reads
+#     na sumusunod sa writes (sync, cache fills, ...)
+#   - ang exception ay ipinapasa sa lahat ng naghihintay, pero hindi itinatago
+#
+# Per-process lang ito (threads ng isang worker). Sa pagitan ng workers, ang
+# shared_cache.get_or_set ang may lock.
+#
+# PAALALA: iisang object ang natatanggap ng lahat ng callers - huwag i-mutate.
+import os
+import time
+import threading
+
+import metrics
+
+SINGLEFLIGHT_WINDOW_SECONDS = float(os.getenv("SINGLEFLIGHT_WINDOW_SECONDS", "0.25"))
+MAX_REMEMBERED_KEYS = 1024
+
+SINGLEFLIGHT_CALLS = metrics.REGISTRY.counter(
+    'singleflight_calls_total', 'Coalesced reads: leader = upstream call, shared = reused result.',
+    ('group', 'result'))
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'finished_at')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished_at = None
+
+
+class Group:
+    def __init__(self, name, window=SINGLEFLIGHT_WINDOW_SECONDS):
+        self.name = name
+        self.window = window
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def _fresh(self, call, now, window):
+        return not call.done.is_set() or (call.error is None and now - call.finished_at <= window)
+
+    def do(self, key, fn, window=None):
+        window = self.window if window is None else window
+        now = time.monotonic()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None or not self._fresh(call, now, window)
+            if leader:
+                if len(self._calls) >= MAX_REMEMBERED_KEYS:
+                    self._prune(now, window)
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            SINGLEFLIGHT_CALLS.inc(group=self.name, result='shared')
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        SINGLEFLIGHT_CALLS.inc(group=self.name, result='leader')
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.finished_at = time.monotonic()
+            call.done.set()
+            if call.error is not None or window <= 0:
+                self._discard(key, call)
+
+    def _discard(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def _prune(self, now, window):
+        # Tinatawag na hawak ang lock
+        for key in [k for k, c in self._calls.items() if not self._fresh(c, now, window)]:
+            del self._calls[key]
+
+    def forget(self, key=None):
+        """Pagkatapos ng write: huwag nang ibalik ang natapos na resulta (in-flight ay tuloy)."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._calls)
+            for k in keys:
+                call = self._calls.get(k)
+                if call is not None and call.done.is_set():
+                    del self._calls[k]
@@ -0,0 +1,119 @@
+# ==============================
+# STARTUP: Lazy init + cold boot timing
+# ==============================
+# Sa autoscaled instances, ang cold start ay dama ng unang user. Kaya:
+#   - LazyProxy: ang Supabase client at signature store ay ginagawa sa unang
+#     gamit, hindi sa import
+#   - lazy_module: ang bihirang gamitin (PIL via signature_normalize, zipfile)
+#     ay ini-import lang kapag kailangan
+#   - mark()/timed()/report(): gaano katagal ang bawat bahagi ng startup
+#     (log line + startup_phase_seconds sa /metrics)
+#
+# Gunicorn na may --preload (shared memory, copy-on-write):
+#   gunicorn --preload -w 4 'app:warm_app()'
+# Ang warm_app() ay warm-up lang (hindi factory): nag-i-import ng lazy modules sa
+# master process, pero ang Supabase client (may sockets) ay ginagawa pa rin per
+# worker pagkatapos ng fork.
+import os
+import time
+
+_T0 = time.perf_counter()   # bago pa ang mabibigat na imports (flask via metrics)
+
+import importlib
+import threading
+from contextlib import contextmanager
+
+import metrics
+import logging_setup
+
+log = logging_setup.get_logger('startup')
+
+STARTUP_PHASE = metrics.REGISTRY.gauge(
+    'startup_phase_seconds', 'Time spent in each startup phase (including lazy first use).', ('phase', 'pid'))
+
+_lock = threading.Lock()
+_phases = {}          # phase -> seconds
+_last_mark = _T0
+
+
+def mark(phase):
+    """Itala ang oras mula sa huling mark() bilang `phase`."""
+    global _last_mark
+    now = time.perf_counter()
+    with _lock:
+        elapsed, _last_mark = now - _last_mark, now
+    _record(phase, elapsed)
+    return elapsed
+
+
+def _record(phase, seconds):
+    with _lock:
+        _phases[phase] = _phases.get(phase, 0.0) + seconds
+    STARTUP_PHASE.set(round(_phases[phase], 6), phase=phase, pid=os.getpid())
+
+
+@contextmanager
+def timed(phase):
+    """with timed('preload'): ... - hiwalay sa mark() sequence."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(phase, time.perf_counter() - start)
+
+
+def report(label='startup'):
+    """Log + return ng phases (ms) at total mula sa import ng module na ito."""
+    total = time.perf_counter() - _T0
+    with _lock:
+        phases = {name: round(seconds * 1000, 1) for name, seconds in _phases.items()}
+    STARTUP_PHASE.set(round(total, 6), phase='total', pid=os.getpid())
+    summary = ', '.join(f"{name}={ms}ms" for name, ms in phases.items())
+    log.info(f"{label} complete in {total * 1000:.1f}ms ({summary})")
+    return {'total_ms': round(total * 1000, 1), 'phases_ms': phases}
+
+
+class LazyProxy:
+    """Ginagawa ang object sa unang attribute access (thread-safe)."""
+
+    def __init__(self, factory, phase):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_phase', phase)
+        object.__setattr__(self, '_target', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _resolve(self):
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    start = time.perf_counter()
+                    target = self._factory()
+                    object.__setattr__(self, '_target', target)
+                    _record(f"lazy:{self._phase}", time.perf_counter() - start)
+        return target
+
+    @property
+    def initialized(self):
+        return self._target is not None
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __repr__(self):
+        return f"<LazyProxy {self._phase} {'ready' if self.initialized else 'pending'}>"
+
+
+def lazy_module(name):
+    """`zipfile = lazy_module('zipfile')` - import sa unang zipfile.X."""
+    return LazyProxy(lambda: importlib.import_module(name), name)
+
+
+def preload(*proxies):
+    """Para sa --preload: i-resolve na ngayon ang mga lazy module (hindi clients)."""
+    for proxy in proxies:
+        proxy._resolve()
@@ -0,0 +1,121 @@
+// ==============================
+// DELTA SYNC CLIENT (IndexedDB copy + /api/sync/<resource>)
+// ==============================
+// Usage:
+//   const members = await DeltaSync.sync('members');   // lahat ng rows (local copy)
+//   const full = await DeltaSync.withMedia(members.filter(...));   // + photo / pirma / QR
+//
+// Unang load: full snapshot. Sunod na loads: mga nagbago lang mula sa huling
+// cursor (upserts + deleted ids). Kung walang IndexedDB (private mode, luma na
+// browser), full fetch na lang bawat tawag.
+// Ang 'members' ay walang photo_data / signature / qr_code (mabigat); withMedia()
+// ang kumukuha nito para sa mga napiling rows lang, at hindi ito sine-save.
+(function (global) {
+    const DB_NAME = 'idsystem-sync';
+    const DB_VERSION = 1;
+    const RESOURCES = ['members', 'officers', 'cards'];
+    const META = '_meta';
+    const MEDIA_BATCH = 200;   // = SYNC_MEDIA_MAX_IDS sa delta_sync.py
+
+    let dbPromise = null;
+
+    function openDb() {
+        if (!global.indexedDB) return Promise.reject(new Error('IndexedDB not available'));
+        if (dbPromise) return dbPromise;
+        dbPromise = new Promise((resolve, reject) => {
+            const req = global.indexedDB.open(DB_NAME, DB_VERSION);
+            req.onupgradeneeded = () => {
+                const db = req.result;
+                RESOURCES.forEach(name => {
+                    if (!db.objectStoreNames.contains(name)) db.createObjectStore(name, { keyPath: 'id' });
+                });
+                if (!db.objectStoreNames.contains(META)) db.createObjectStore(META, { keyPath: 'resource' });
+            };
+            req.onsuccess = () => resolve(req.result);
+            req.onerror = () => { dbPromise = null; reject(req.error); };
+        });
+        return dbPromise;
+    }
+
+    function done(tx) {
+        return new Promise((resolve, reject) => {
+            tx.oncomplete = () => resolve();
+            tx.onerror = () => reject(tx.error);
+            tx.onabort = () => reject(tx.error);
+        });
+    }
+
+    function request(req) {
+        return new Promise((resolve, reject) => {
+            req.onsuccess = () => resolve(req.result);
+            req.onerror = () => reject(req.error);
+        });
+    }
+
+    async function fetchPage(apiUrl, resource, cursor) {
+        const qs = cursor ? `?since=${encodeURIComponent(cursor)}` : '';
+        const res = await fetch(`${apiUrl}/api/sync/${resource}${qs}`);
+        if (!res.ok) throw new Error(`Sync failed (${res.status})`);
+        return res.json();
+    }
+
+    async function fullFetch(apiUrl, resource) {
+        let rows = new Map(), cursor = null, page;
+        do {
+            page = await fetchPage(apiUrl, resource, cursor);
+            page.changes.forEach(r => rows.set(r.id, r));
+            page.deleted.forEach(id => rows.delete(id));
+            cursor = page.cursor;
+        } while (page.has_more);
+        return Array.from(rows.values());
+    }
+
+    async function sync(resource, apiUrl = '') {
+        if (!RESOURCES.includes(resource)) throw new Error(`Unknown resource: ${resource}`);
+
+        let db;
+        try {
+            db = await openDb();
+        } catch (e) {
+            return fullFetch(apiUrl, resource);
+        }
+
+        const meta = await request(db.transaction(META).objectStore(META).get(resource));
+        let cursor = meta ? meta.cursor : null;
+        let page;
+        do {
+            page = await fetchPage(apiUrl, resource, cursor);
+            const tx = db.transaction([resource, META], 'readwrite');
+            const store = tx.objectStore(resource);
+            if (page.reset) store.clear();
+            page.changes.forEach(row => store.put(row));
+            page.deleted.forEach(id => store.delete(id));
+            tx.objectStore(META).put({ resource, cursor: page.cursor, synced_at: Date.now() });
+            await done(tx);
+            cursor = page.cursor;
+        } while (page.has_more);
+
+        return request(db.transaction(resource).objectStore(resource).getAll());
+    }
+
+    async function clear(resource) {
+        const db = await openDb();
+        const tx = db.transaction([resource, META], 'readwrite');
+        tx.objectStore(resource).clear();
+        tx.objectStore(META).delete(resource);
+        return done(tx);
+    }
+
+    async function withMedia(members, apiUrl = '') {
+        const media = new Map();
+        for (let i = 0; i < members.length; i += MEDIA_BATCH) {
+            const ids = members.slice(i, i + MEDIA_BATCH).map(m => m.id).join(',');
+            const res = await fetch(`${apiUrl}/api/members/media?ids=${ids}`);
+            if (!res.ok) throw new Error(`Media fetch failed (${res.status})`);
+            (await res.json()).forEach(row => media.set(row.id, row));
+        }
+        return members.map(m => Object.assign({}, m, media.get(m.id) || {}));
+    }
+
+    global.DeltaSync = { sync, clear, withMedia };
+})(window);
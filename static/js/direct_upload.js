@@ -0,0 +1,70 @@
+// ==============================
+// DIRECT UPLOAD CLIENT (signed URL -> Supabase Storage, see direct_upload.py)
+// ==============================
+// Usage:
+//   const r = await DirectUpload.upload('card', blob, { memberId, clientSlug, apiUrl });
+//   // r.url = public URL, r.fresh = true kung walang nagbago (hindi na nag-upload)
+//
+// Binary ang PUT (walang base64), at diretso sa Storage: hindi na dumadaan
+// sa Flask worker ang image bytes. Kapag pumalya, ang caller ang bahala sa
+// fallback (hal. lumang /save_card_image).
+(function (global) {
+    const MAX_ATTEMPTS = 4;
+
+    // 429/503 = server busy (admission control): hintayin ang Retry-After, ulitin
+    async function postJson(url, body, onBusy) {
+        let response;
+        for (let attempt = 0; attempt < MAX_ATTEMPTS; attempt++) {
+            response = await fetch(url, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(body)
+            });
+            if (response.status !== 429 && response.status !== 503) break;
+            const waitSec = parseInt(response.headers.get('Retry-After') || '2', 10);
+            if (onBusy) onBusy(waitSec);
+            await new Promise(r => setTimeout(r, waitSec * 1000));
+        }
+        const result = await response.json().catch(() => ({}));
+        if (!response.ok || result.success === false) {
+            throw new Error(result.message || `Request failed (${response.status})`);
+        }
+        return result;
+    }
+
+    async function upload(kind, blob, options) {
+        const opts = options || {};
+        const apiUrl = opts.apiUrl || '';
+        const contentType = blob.type || (kind === 'card' ? 'image/png' : 'image/jpeg');
+
+        const signed = await postJson(`${apiUrl}/api/uploads/sign`, {
+            kind,
+            member_id: opts.memberId,
+            client_slug: opts.clientSlug,
+            content_type: contentType
+        }, opts.onBusy);
+        if (signed.fresh) return { url: signed.url, fresh: true };
+
+        const put = await fetch(signed.upload_url, {
+            method: 'PUT',
+            headers: { 'Content-Type': signed.content_type, 'x-upsert': 'true' },
+            body: blob
+        });
+        if (!put.ok) throw new Error(`Storage upload failed (${put.status})`);
+
+        const confirmed = await postJson(`${apiUrl}/api/uploads/confirm`, { ticket: signed.ticket }, opts.onBusy);
+        return { url: confirmed.url, fresh: false, bytes: confirmed.bytes };
+    }
+
+    function canvasToBlob(canvas, type, quality) {
+        return new Promise((resolve, reject) => {
+            canvas.toBlob(b => b ? resolve(b) : reject(new Error('Canvas export failed')), type || 'image/png', quality);
+        });
+    }
+
+    async function dataUrlToBlob(dataUrl) {
+        return (await fetch(dataUrl)).blob();
+    }
+
+    global.DirectUpload = { upload, canvasToBlob, dataUrlToBlob };
+})(window);
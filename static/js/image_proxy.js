@@ -0,0 +1,38 @@
+// ==============================
+// IMAGE PROXY URLS (/img/..., see image_proxy.py)
+// ==============================
+// Usage:
+//   img.src = ImageProxy.url(member.generated_card_image, { w: 480, fmt: 'webp' });
+//
+// Supabase public URL ng public_id_cards -> /img/<folder>/<file>?w=&fmt=
+// (resized, naka-cache sa server). Ibang URL (data:, blob:, ibang host) = as is.
+(function (global) {
+    const MARKER = '/object/public/public_id_cards/';
+
+    let webp = null;
+    function supportsWebp() {
+        if (webp === null) {
+            try {
+                const c = document.createElement('canvas');
+                c.width = c.height = 1;
+                webp = c.toDataURL('image/webp').startsWith('data:image/webp');
+            } catch (e) {
+                webp = false;
+            }
+        }
+        return webp;
+    }
+
+    function url(src, options) {
+        const opts = options || {};
+        if (!src || src.indexOf(MARKER) === -1) return src;
+        const key = src.split(MARKER)[1].split('?')[0];
+        const params = new URLSearchParams();
+        if (opts.w) params.set('w', Math.round(opts.w * (opts.dpr === false ? 1 : (global.devicePixelRatio || 1))));
+        if (opts.fmt === 'webp' ? supportsWebp() : opts.fmt) params.set('fmt', opts.fmt);
+        const qs = params.toString();
+        return `${opts.apiUrl || ''}/img/${key}${qs ? '?' + qs : ''}`;
+    }
+
+    global.ImageProxy = { url, supportsWebp };
+})(window);
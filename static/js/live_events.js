@@ -0,0 +1,68 @@
+// ==============================
+// LIVE EVENTS CLIENT (Server-Sent Events mula sa /api/events)
+// ==============================
+// Usage:
+//   LiveEvents.on(['card.saved', 'card.deleted'], () => refreshCards());
+//   LiveEvents.on('resync', () => refreshEverything());
+//
+// Iisang EventSource lang per page. Kusang nagre-reconnect ang browser
+// (dala ang Last-Event-ID). Ang mga sunod-sunod na event ay pinagsasama
+// (debounce) para isang refresh lang kahit maraming card ang na-save.
+// Kapag puno ang server (503), isinasara ng browser ang EventSource: kami na
+// ang magbubukas ulit pagkatapos ng REOPEN_MS, saka 'resync'.
+(function (global) {
+    const DEBOUNCE_MS = 400;
+    const REOPEN_MS = 30000;
+    const handlers = {};   // type -> [{ fn, timer }]
+    let source = null;
+    let apiBase = '';
+
+    function dispatch(type, data) {
+        (handlers[type] || []).forEach(h => {
+            h.pending.push(data);
+            clearTimeout(h.timer);
+            h.timer = setTimeout(() => {
+                const batch = h.pending.splice(0);
+                try { h.fn(batch, type); } catch (e) { console.error('LiveEvents handler error:', e); }
+            }, DEBOUNCE_MS);
+        });
+    }
+
+    function listen(type) {
+        source.addEventListener(type, e => {
+            let data = {};
+            try { data = JSON.parse(e.data || '{}'); } catch (err) { /* ignore */ }
+            dispatch(type, data);
+        });
+    }
+
+    function open() {
+        source = new EventSource(`${apiBase}/api/events`);
+        Object.keys(handlers).forEach(listen);
+        source.onerror = () => {
+            // CONNECTING = browser na ang bahala; CLOSED = tinanggihan (hal. 503)
+            if (source.readyState !== EventSource.CLOSED) return;
+            setTimeout(() => { open(); dispatch('resync', {}); }, REOPEN_MS);
+        };
+    }
+
+    function ensureSource(apiUrl) {
+        if (source || !global.EventSource) return;
+        apiBase = apiUrl;
+        open();
+    }
+
+    function on(types, fn, apiUrl = '') {
+        ensureSource(apiUrl);
+        if (!source) return;
+        (Array.isArray(types) ? types : [types]).forEach(type => {
+            if (!handlers[type]) {
+                handlers[type] = [];
+                listen(type);
+            }
+            handlers[type].push({ fn, timer: null, pending: [] });
+        });
+    }
+
+    global.LiveEvents = { on };
+})(window);
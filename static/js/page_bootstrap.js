@@ -0,0 +1,45 @@
+// ==============================
+// PAGE BOOTSTRAP CLIENT (/api/bootstrap/<page>, see bootstrap.py)
+// ==============================
+// Usage:
+//   await PageBootstrap.load('admin', { client_slug }, API_URL);   // isang request
+//   const forms = PageBootstrap.take('admin_forms');               // undefined = wala / luma na
+//
+// take() ay isang beses lang nagbibigay ng bawat section (at hanggang
+// MAX_AGE_MS lang); ang sunod na tawag ng page (hal. refresh pagkatapos ng
+// add/delete) ay dapat sa sariling route na, para hindi luma ang data.
+(function (global) {
+    const MAX_AGE_MS = 30000;
+
+    let loadedAt = 0;
+    let sections = {};
+
+    async function load(page, params, apiUrl) {
+        const qs = new URLSearchParams();
+        Object.entries(params || {}).forEach(([k, v]) => { if (v) qs.set(k, v); });
+        try {
+            const res = await fetch(`${apiUrl || ''}/api/bootstrap/${page}${qs.toString() ? '?' + qs : ''}`);
+            if (!res.ok) throw new Error(`Bootstrap failed (${res.status})`);
+            const body = await res.json();
+            sections = {};
+            Object.entries(body.data || {}).forEach(([name, value]) => {
+                // Pumalyang section = hayaang mag-fetch ang page gaya ng dati
+                if (!(body.errors || {})[name]) sections[name] = value;
+            });
+            loadedAt = Date.now();
+        } catch (e) {
+            console.warn("Bootstrap unavailable, pages will fetch individually:", e);
+            sections = {};
+        }
+        return sections;
+    }
+
+    function take(name, maxAgeMs) {
+        if (!(name in sections) || Date.now() - loadedAt > (maxAgeMs || MAX_AGE_MS)) return undefined;
+        const value = sections[name];
+        delete sections[name];
+        return value;
+    }
+
+    global.PageBootstrap = { load, take };
+})(window);
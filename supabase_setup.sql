@@ -1,5 +1,10 @@
 -- Supabase table creation script for UGB RoMove members
 -- Run this in your Supabase SQL Editor
+--
+-- NOTE: Ligtas i-run ulit. Walang row na binubura: bago idagdag ang UNIQUE
+-- constraints sa UPSERTS section, ang duplicate na layouts / idgenerate /
+-- signaturetable rows ay inililipat sa layouts_duplicates,
+-- idgenerate_duplicates at signaturetable_duplicates (i-check, saka i-DROP).
 
 -- Create members table
 CREATE TABLE IF NOT EXISTS public.members (
@@ -86,4 +91,276 @@ SELECT
         COALESCE(blood_type, '') || ' ' || 
         COALESCE(home_address, '')
     ) as search_vector
-FROM public.members;
\ No newline at end of file
+FROM public.members;
+
+-- ==============================
+-- CARD CACHE (see card_cache.py)
+-- ==============================
+-- Fingerprint ng member fields + layout version na ginamit sa generated card.
+-- Ang card ay buburahin lang kapag nagbago ang fingerprint (o LRU eviction
+-- kapag lampas na sa CARD_STORAGE_BUDGET_MB), hindi na every 24 hours.
+ALTER TABLE public.members ADD COLUMN IF NOT EXISTS generated_card_image TEXT;
+ALTER TABLE public.members ADD COLUMN IF NOT EXISTS generated_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE public.members ADD COLUMN IF NOT EXISTS card_fingerprint TEXT;
+ALTER TABLE public.members ADD COLUMN IF NOT EXISTS card_layout TEXT;
+ALTER TABLE public.members ADD COLUMN IF NOT EXISTS card_bytes BIGINT;
+ALTER TABLE public.members ADD COLUMN IF NOT EXISTS card_last_used_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS members_card_layout_idx ON public.members (card_layout)
+    WHERE generated_card_image IS NOT NULL;
+CREATE INDEX IF NOT EXISTS members_card_last_used_idx ON public.members (card_last_used_at NULLS FIRST)
+    WHERE generated_card_image IS NOT NULL;
+
+-- Ang card_last_used_at ay bina-bump tuwing nagagamit ang card (CardCache.touch).
+-- Hindi ito pagbabago ng member: huwag galawin ang updated_at, kung hindi ay
+-- masisira ang ETag / 304, delta sync at facet snapshot.
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF to_jsonb(NEW) - 'card_last_used_at' - 'updated_at'
+       = to_jsonb(OLD) - 'card_last_used_at' - 'updated_at' THEN
+        NEW.updated_at = OLD.updated_at;
+        RETURN NEW;
+    END IF;
+    NEW.updated_at = TIMEZONE('utc'::text, NOW());
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- ==============================
+-- DELTA SYNC (see delta_sync.py)
+-- ==============================
+-- /api/sync/<resource>?since=<updated_at|id> -> rows na nagbago + tombstones.
+CREATE INDEX IF NOT EXISTS members_updated_at_id_idx ON public.members (updated_at, id);
+
+-- officer_list: kailangan din ng updated_at + trigger para sa 'officers' feed
+ALTER TABLE IF EXISTS public.officer_list
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL;
+CREATE INDEX IF NOT EXISTS officer_list_updated_at_id_idx ON public.officer_list (updated_at, id);
+DROP TRIGGER IF EXISTS update_officer_list_updated_at ON public.officer_list;
+CREATE TRIGGER update_officer_list_updated_at
+    BEFORE UPDATE ON public.officer_list
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Tombstones para sa deletes (purged ng app after SYNC_TOMBSTONE_RETENTION_DAYS)
+CREATE TABLE IF NOT EXISTS public.sync_tombstones (
+    id BIGSERIAL PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    row_id BIGINT NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sync_tombstones_table_deleted_idx ON public.sync_tombstones (table_name, deleted_at);
+
+CREATE OR REPLACE FUNCTION record_sync_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO public.sync_tombstones (table_name, row_id) VALUES (TG_TABLE_NAME, OLD.id);
+    RETURN OLD;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS members_sync_tombstone ON public.members;
+CREATE TRIGGER members_sync_tombstone
+    AFTER DELETE ON public.members
+    FOR EACH ROW
+    EXECUTE FUNCTION record_sync_tombstone();
+
+DROP TRIGGER IF EXISTS officer_list_sync_tombstone ON public.officer_list;
+CREATE TRIGGER officer_list_sync_tombstone
+    AFTER DELETE ON public.officer_list
+    FOR EACH ROW
+    EXECUTE FUNCTION record_sync_tombstone();
+
+-- ==============================
+-- UPSERTS (see upserts.py)
+-- ==============================
+-- Isang statement bawat save: ON CONFLICT sa mga unique key na ito.
+-- Bago ang constraint, ang duplicates (lahat maliban sa pinakabagong row) ay
+-- INILILIPAT sa <table>_duplicates, hindi basta binubura. Walang duplicates
+-- (o naka-constraint na) = walang nagagalaw, kaya ligtas i-run ulit.
+-- Pagkatapos i-check ang mga nailipat:  DROP TABLE public.<table>_duplicates;
+CREATE TABLE IF NOT EXISTS public.layouts_duplicates (LIKE public.layouts);
+ALTER TABLE public.layouts_duplicates ADD COLUMN IF NOT EXISTS moved_at TIMESTAMPTZ DEFAULT NOW();
+WITH moved AS (
+    DELETE FROM public.layouts a USING public.layouts b
+        WHERE a.client_slug IS NOT NULL AND a.client_slug = b.client_slug AND a.id < b.id
+        RETURNING a.*
+)
+INSERT INTO public.layouts_duplicates SELECT * FROM moved;
+
+CREATE TABLE IF NOT EXISTS public.idgenerate_duplicates (LIKE public.idgenerate);
+ALTER TABLE public.idgenerate_duplicates ADD COLUMN IF NOT EXISTS moved_at TIMESTAMPTZ DEFAULT NOW();
+WITH moved AS (
+    DELETE FROM public.idgenerate a USING public.idgenerate b
+        WHERE a.client_slug IS NOT NULL AND a.client_slug = b.client_slug AND a.id < b.id
+        RETURNING a.*
+)
+INSERT INTO public.idgenerate_duplicates SELECT * FROM moved;
+
+CREATE TABLE IF NOT EXISTS public.signaturetable_duplicates (LIKE public.signaturetable);
+ALTER TABLE public.signaturetable_duplicates ADD COLUMN IF NOT EXISTS moved_at TIMESTAMPTZ DEFAULT NOW();
+WITH moved AS (
+    DELETE FROM public.signaturetable a USING public.signaturetable b
+        WHERE a.name = b.name AND a.id < b.id
+        RETURNING a.*
+)
+INSERT INTO public.signaturetable_duplicates SELECT * FROM moved;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'layouts_client_slug_key') THEN
+        ALTER TABLE public.layouts ADD CONSTRAINT layouts_client_slug_key UNIQUE (client_slug);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'idgenerate_client_slug_key') THEN
+        ALTER TABLE public.idgenerate ADD CONSTRAINT idgenerate_client_slug_key UNIQUE (client_slug);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'signaturetable_name_key') THEN
+        ALTER TABLE public.signaturetable ADD CONSTRAINT signaturetable_name_key UNIQUE (name);
+    END IF;
+END $$;
+
+-- save_layout: may slug = upsert sa client_slug; walang slug = update ng
+-- pinakabagong layout (o insert kung wala pa). Returns ang lumang config_json
+-- para malaman ng app kung kailangang i-invalidate ang cards.
+CREATE OR REPLACE FUNCTION public.save_layout(p_client_slug TEXT, p_config JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    previous JSONB;
+    target_id BIGINT;
+BEGIN
+    IF p_client_slug IS NULL OR p_client_slug = '' THEN
+        -- Serialize ang generic saves (walang unique key na masasandalan)
+        PERFORM pg_advisory_xact_lock(hashtext('layouts:generic'));
+        SELECT id, config_json INTO target_id, previous
+            FROM public.layouts ORDER BY created_at DESC LIMIT 1 FOR UPDATE;
+        IF target_id IS NULL THEN
+            INSERT INTO public.layouts (config_json) VALUES (p_config);
+        ELSE
+            UPDATE public.layouts SET config_json = p_config WHERE id = target_id;
+        END IF;
+        RETURN previous;
+    END IF;
+
+    SELECT config_json INTO previous FROM public.layouts WHERE client_slug = p_client_slug FOR UPDATE;
+    INSERT INTO public.layouts (client_slug, config_json) VALUES (p_client_slug, p_config)
+        ON CONFLICT (client_slug) DO UPDATE SET config_json = EXCLUDED.config_json;
+    RETURN previous;
+END;
+$$ LANGUAGE plpgsql;
+
+-- save_current_id: update ng pinakabagong idgenerate row (o insert kung wala)
+CREATE OR REPLACE FUNCTION public.save_current_id(p_idnumber TEXT)
+RETURNS VOID AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('idgenerate:latest'));
+    UPDATE public.idgenerate SET idnumber = p_idnumber
+        WHERE id = (SELECT max(id) FROM public.idgenerate);
+    IF NOT FOUND THEN
+        INSERT INTO public.idgenerate (idnumber) VALUES (p_idnumber);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==============================
+-- MEMBER SEARCH (see member_search.py)
+-- ==============================
+-- Full-text (tsvector GIN indexes sa taas) + pg_trgm (substring at fuzzy match).
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE public.members ADD COLUMN IF NOT EXISTS pseudo_name TEXT;
+
+CREATE INDEX IF NOT EXISTS members_name_trgm_idx ON public.members USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS members_pseudo_name_trgm_idx ON public.members USING gin (pseudo_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS members_chapter_trgm_idx ON public.members USING gin (chapter gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS members_designation_trgm_idx ON public.members USING gin (designation gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS members_contact_trgm_idx ON public.members USING gin (contact_no gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS members_blood_type_trgm_idx ON public.members USING gin (blood_type gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS members_home_address_trgm_idx ON public.members USING gin (home_address gin_trgm_ops);
+
+-- p_field: all | name | chapter | designation | contact | quick (name + pseudo_name + chapter)
+-- p_columns: projection ng `member` jsonb (NULL = buong row)
+-- Returns ranked rows + total_count (bago ang LIMIT) sa iisang query.
+CREATE OR REPLACE FUNCTION public.search_members(
+    p_query TEXT,
+    p_field TEXT DEFAULT 'all',
+    p_columns TEXT[] DEFAULT NULL,
+    p_limit INT DEFAULT 50,
+    p_offset INT DEFAULT 0
+)
+RETURNS TABLE (member JSONB, rank REAL, total_count BIGINT)
+LANGUAGE sql STABLE
+AS $$
+    WITH hits AS (
+        SELECT m.*, (
+            CASE WHEN p_field IN ('all', 'name', 'quick') THEN
+                ts_rank(to_tsvector('english', m.name), websearch_to_tsquery('english', p_query)) * 2
+                + greatest(similarity(m.name, lower(trim(p_query))),
+                           similarity(coalesce(m.pseudo_name, ''), lower(trim(p_query)))) * 2
+            ELSE 0 END
+            + CASE WHEN p_field IN ('all', 'chapter', 'quick') THEN
+                ts_rank(to_tsvector('english', m.chapter), websearch_to_tsquery('english', p_query))
+                + similarity(m.chapter, lower(trim(p_query)))
+            ELSE 0 END
+            + CASE WHEN p_field IN ('all', 'designation') THEN
+                ts_rank(to_tsvector('english', m.designation), websearch_to_tsquery('english', p_query))
+                + similarity(m.designation, lower(trim(p_query)))
+            ELSE 0 END
+            + CASE WHEN p_field IN ('all', 'contact') AND strpos(m.contact_no, trim(p_query)) > 0 THEN 1 ELSE 0 END
+            -- Bonus kapag nagsisimula ang pangalan sa hinahanap
+            + CASE WHEN lower(m.name) LIKE lower(trim(p_query)) || '%' THEN 1 ELSE 0 END
+        )::REAL AS score
+        FROM public.members m
+        WHERE (p_field IN ('all', 'name', 'quick') AND (
+                  to_tsvector('english', m.name) @@ websearch_to_tsquery('english', p_query)
+                  OR m.name ILIKE '%' || trim(p_query) || '%'
+                  OR m.pseudo_name ILIKE '%' || trim(p_query) || '%'
+                  OR m.name % lower(trim(p_query))
+                  OR m.pseudo_name % lower(trim(p_query))))
+           OR (p_field IN ('all', 'chapter', 'quick') AND (
+                  to_tsvector('english', m.chapter) @@ websearch_to_tsquery('english', p_query)
+                  OR m.chapter ILIKE '%' || trim(p_query) || '%'))
+           OR (p_field IN ('all', 'designation') AND (
+                  to_tsvector('english', m.designation) @@ websearch_to_tsquery('english', p_query)
+                  OR m.designation ILIKE '%' || trim(p_query) || '%'))
+           OR (p_field IN ('all', 'contact') AND m.contact_no ILIKE '%' || trim(p_query) || '%')
+           OR (p_field = 'all' AND (m.blood_type ILIKE '%' || trim(p_query) || '%'
+                                    OR m.home_address ILIKE '%' || trim(p_query) || '%'))
+    )
+    SELECT
+        CASE WHEN p_columns IS NULL THEN to_jsonb(h) - 'score'
+             ELSE (SELECT jsonb_object_agg(e.key, e.value) FROM jsonb_each(to_jsonb(h)) e
+                   WHERE e.key = ANY (p_columns))
+        END,
+        h.score,
+        count(*) OVER ()
+    FROM hits h
+    ORDER BY h.score DESC, h.name, h.id
+    LIMIT greatest(p_limit, 1) OFFSET greatest(p_offset, 0);
+$$;
+
+-- ==============================
+-- MEMBER QUERY (see member_query.py)
+-- ==============================
+-- /api/members/query: filters + keyset pagination (sort value, id). Bawat
+-- sort ay may btree na (column, id) para ang "WHERE col > x ORDER BY col, id
+-- LIMIT n" ay index range scan, hindi sort ng buong table.
+ALTER TABLE public.members ADD COLUMN IF NOT EXISTS date_of_membership DATE;
+ALTER TABLE public.members ADD COLUMN IF NOT EXISTS membership_type TEXT;
+
+-- sort=date + date / date_from / date_to (at /api/members/by-date)
+CREATE INDEX IF NOT EXISTS members_date_of_membership_id_idx ON public.members (date_of_membership, id);
+-- sort=name
+CREATE INDEX IF NOT EXISTS members_name_id_idx ON public.members (name, id);
+-- chapter / membership_type equality (ang GIN indexes sa taas ay para sa full-text lang)
+CREATE INDEX IF NOT EXISTS members_chapter_date_idx ON public.members (chapter, date_of_membership, id);
+CREATE INDEX IF NOT EXISTS members_membership_type_date_idx ON public.members (membership_type, date_of_membership, id);
+-- sort=generated, generated_from / generated_to, at ang LRU sweep (fallback sa generated_at)
+CREATE INDEX IF NOT EXISTS members_generated_at_id_idx ON public.members (generated_at, id)
+    WHERE generated_card_image IS NOT NULL;
+-- Per-layout (client_slug) na cards: layout=<slug> + generated range
+CREATE INDEX IF NOT EXISTS members_card_layout_generated_idx ON public.members (card_layout, generated_at, id)
+    WHERE generated_card_image IS NOT NULL;
+-- card=missing (NULL, o '' kapag na-clear ang card)
+CREATE INDEX IF NOT EXISTS members_card_missing_idx ON public.members (date_of_membership, id)
+    WHERE generated_card_image IS NULL OR generated_card_image = '';
@@ -0,0 +1,53 @@
+# ==============================
+# PYTEST FIXTURES (naka-FakeSupabase, walang network)
+# ==============================
+#   python -m pytest -q
+#
+# Bawat test ay may sariling FakeSupabase (see bench/fake_supabase.py) na
+# naka-seed ng maliit na data, at malinis na shared cache.
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Dapat naka-set bago i-import ang app (load_dotenv ay hindi nag-o-override)
+_TMP = tempfile.mkdtemp(prefix='idsystem-tests-')
+os.environ.update({
+    'SUPAB_URL': 'http://fake-supabase.local',
+    'SUPAB_SERVICE_KEY': 'tests.fake.key',
+    'SECRET_KEY': 'tests-secret-key',
+    'UPLOAD_TICKET_SECRET': 'tests-upload-secret',
+    'CACHE_BACKEND': 'local',
+    'ARCHIVE_CACHE_DIR': os.path.join(_TMP, 'archives'),
+    'IMAGE_CACHE_DIR': os.path.join(_TMP, 'images'),
+    'PROFILE_DIR': os.path.join(_TMP, 'profiles'),
+    'SINGLEFLIGHT_WINDOW_SECONDS': '0',
+    'ADMISSION_ENABLED': '0',
+    'LOG_LEVEL': 'WARNING',
+})
+
+import pytest  # noqa: E402
+
+import app as app_module  # noqa: E402
+import metrics  # noqa: E402
+import shared_cache  # noqa: E402
+from bench import seed  # noqa: E402
+from bench.fake_supabase import FakeSupabase  # noqa: E402
+
+TEST_MEMBERS = 40
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    client = FakeSupabase()
+    seed.seed(client, members=TEST_MEMBERS, card_fraction=0.5, layouts=2, officers=3, signatures=2)
+    monkeypatch.setattr(app_module, 'supabase', metrics.instrument_client(client))
+    shared_cache.backend._data.clear()
+    return client
+
+
+@pytest.fixture
+def client(fake):
+    return app_module.app.test_client()
@@ -0,0 +1,57 @@
+import pytest
+from flask import Flask, Response
+
+import admission
+
+
+def test_token_bucket_refills_over_time():
+    bucket = admission.TokenBucket(rate=1.0, burst=2)
+    now = bucket.updated
+    assert bucket.take(now)[0]
+    assert bucket.take(now)[0]
+    ok, retry_after = bucket.take(now)
+    assert not ok and retry_after == pytest.approx(1.0)
+    assert bucket.take(now + 1.0)[0]
+
+
+def test_parse_rate_and_env_overrides(monkeypatch):
+    assert admission.parse_rate('10/60') == (10 / 60, 10.0)
+    assert admission.parse_rate('10/60:20') == (10 / 60, 20.0)
+    monkeypatch.setenv('ADMISSION_TEST_POLICY', 'concurrency=1,queue=0')
+    policy = admission.Policy('test_policy', concurrency=5, queue=3)
+    assert policy.concurrency == 1 and policy.queue == 0
+
+
+@pytest.fixture
+def small_app(monkeypatch):
+    monkeypatch.setattr(admission, 'ADMISSION_ENABLED', True)
+    app = Flask(__name__)
+
+    @app.route('/limited')
+    @admission.admission_policy('test_limited', client='2/60')
+    def limited():
+        return 'ok'
+
+    @app.route('/stream')
+    @admission.admission_policy('test_stream', concurrency=1, queue=0, wait=7, streaming=True)
+    def stream():
+        return Response(iter(['a', 'b']), mimetype='text/plain')
+    return app
+
+
+def test_rate_limit_returns_429_with_retry_after(small_app):
+    client = small_app.test_client()
+    assert [client.get('/limited').status_code for _ in range(2)] == [200, 200]
+    response = client.get('/limited')
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_streaming_policy_holds_slot_until_response_closes(small_app):
+    client = small_app.test_client()
+    held = client.get('/stream', buffered=False)
+    busy = client.get('/stream')
+    assert busy.status_code == 503
+    assert busy.headers['Retry-After'] == '7'
+    held.close()
+    assert client.get('/stream').status_code == 200
@@ -0,0 +1,104 @@
+import io
+import os
+import time
+import zipfile
+import threading
+
+import pytest
+
+import app as app_module
+import archive_cache
+from disk_cache import DiskCache
+
+
+def _archives(fake, tmp_path):
+    cache = DiskCache('archives', str(tmp_path), 10 * 1024 * 1024, 3600, key_path=archive_cache._key_path)
+    return archive_cache.ArchiveCache(lambda: fake.storage, lambda: fake, cache=cache)
+
+
+def test_same_selection_is_served_from_cache(fake, tmp_path):
+    archives = _archives(fake, tmp_path)
+    first = archives.get_or_build(['2.png', '1.png'])
+    assert first.cached and not first.temporary
+    with zipfile.ZipFile(first.entry.path) as zf:
+        assert zf.namelist() == ['1.png', '2.png']
+
+    again = archives.get_or_build(['1.png', '2.png', '1.png'])
+    assert again.key == first.key
+    assert again.entry.path == first.entry.path
+
+
+def test_changed_card_gets_a_new_key(fake, tmp_path):
+    archives = _archives(fake, tmp_path)
+    before = archives.get_or_build(['1.png']).key
+    fake.rows('members')[0]['generated_at'] = '2030-01-01T00:00:00+00:00'
+    assert archives.get_or_build(['1.png']).key != before
+
+
+def test_selection_without_card_is_temporary(fake, tmp_path):
+    # Members 21-40 ay walang generated card (card_fraction=0.5)
+    archives = _archives(fake, tmp_path)
+    archive = archives.get_or_build(['1.png', '30.png'])
+    assert archive.temporary and not archive.cached
+    assert archive.missing == ['30.png']
+    assert archives.get_or_build(['1.png', '30.png'], temporary=False) is None
+
+
+def test_invalidate_removes_archives_with_card(fake, tmp_path):
+    archives = _archives(fake, tmp_path)
+    key = archives.get_or_build(['1.png', '2.png']).key
+    other = archives.get_or_build(['3.png']).key
+    assert archives.invalidate('guardian_ids/2.png') == 1
+    assert archives.get(key) is None
+    assert archives.get(other) is not None
+
+
+def test_bad_input_is_rejected(fake, tmp_path):
+    archives = _archives(fake, tmp_path)
+    for filenames in ([], ['../1.png'], ['.env']):
+        with pytest.raises(archive_cache.ArchiveError):
+            archives.get_or_build(filenames)
+    with pytest.raises(archive_cache.ArchiveError):
+        archives.get('not-a-key')
+
+
+def test_link_mode_route(client):
+    app_module.archives.clear()
+    linked = client.post('/api/storage/download-zip?mode=link', json={'filenames': ['1.png', '2.png']}).get_json()
+    assert linked['files'] == 2
+    download = client.get(linked['url'])
+    assert download.status_code == 200
+    assert sorted(zipfile.ZipFile(io.BytesIO(download.data)).namelist()) == ['1.png', '2.png']
+
+    uncached = client.post('/api/storage/download-zip?mode=link', json={'filenames': ['30.png']}).get_json()
+    assert uncached['url'] is None
+    assert client.get('/api/storage/archives/' + '0' * 64 + '.zip').status_code == 404
+
+
+def test_direct_download_route(client):
+    response = client.post('/api/storage/download-zip', json={'filenames': ['1.png', '30.png']})
+    assert response.status_code == 200
+    assert zipfile.ZipFile(io.BytesIO(response.data)).namelist() == ['1.png']
+
+
+def test_failed_download_gives_each_caller_its_own_file(fake, tmp_path):
+    # May card record pero wala sa storage: hindi kina-cache, at hindi shared ang temp file
+    del fake.bucket('public_id_cards')['guardian_ids/1.png']
+    archives = _archives(fake, tmp_path)
+    download = archives._download
+    archives._download = lambda name: time.sleep(0.1) or download(name)
+
+    results = [None] * 3
+    def build(i):
+        results[i] = archives.get_or_build(['1.png', '2.png'])
+    threads = [threading.Thread(target=build, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(archive.temporary and archive.missing == ['1.png'] for archive in results)
+    assert len({archive.entry.path for archive in results}) == 3
+    os.remove(results[0].entry.path)
+    assert os.path.exists(results[1].entry.path)
+    assert archives.get_or_build(['1.png', '2.png'], temporary=False) is None
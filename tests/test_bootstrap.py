@@ -0,0 +1,71 @@
+import pytest
+
+import app as app_module
+import bootstrap
+import member_query
+import shared_cache
+
+
+def _bootstrap(loader):
+    cache = shared_cache.Namespace(shared_cache.LocalBackend(), 'bootstrap-test', ttl=60)
+    source = shared_cache.Namespace(shared_cache.LocalBackend(), 'source-test', ttl=60)
+    boot = bootstrap.Bootstrap(cache)
+    boot.section('ok', lambda p: p.get('x'), namespaces=[source], params=['x'])
+    boot.section('flaky', loader)
+    boot.page('page', 'ok', 'flaky')
+    return boot, source
+
+
+def test_failed_section_is_reported_and_not_cached():
+    calls = []
+
+    def flaky(params):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('db down')
+        return 'ok'
+
+    boot, _ = _bootstrap(flaky)
+    first = boot.build('page', {'x': 1})
+    assert first['data'] == {'ok': 1, 'flaky': None}
+    assert 'flaky' in first['errors']
+
+    second = boot.build('page', {'x': 1})
+    assert not second['cached'] and not second['errors']
+    assert boot.build('page', {'x': 1})['cached']
+
+
+def test_namespace_bump_invalidates_page():
+    boot, source = _bootstrap(lambda p: 'ok')
+    boot.build('page', {'x': 1})
+    assert boot.build('page', {'x': 1})['cached']
+    assert not boot.build('page', {'x': 2})['cached']
+    source.bump()
+    assert not boot.build('page', {'x': 1})['cached']
+
+
+def test_unknown_sections_and_pages():
+    boot, _ = _bootstrap(lambda p: 'ok')
+    with pytest.raises(bootstrap.BootstrapError):
+        boot.page('other', 'missing')
+    with pytest.raises(bootstrap.BootstrapError):
+        boot.build('missing', {})
+
+
+def test_admin_route_members_are_projected(client, fake):
+    selected = fake.rows('members')[0]['date_of_membership']
+    body = client.get('/api/bootstrap/admin', query_string={'date': selected}).get_json()
+    assert not body['errors']
+    assert set(body['data']) == {'admin_forms', 'officers', 'layout', 'client_slugs', 'members'}
+    members = body['data']['members']
+    assert members and all(set(m) == set(member_query.LIST_COLUMNS) for m in members)
+    assert all(m['date_of_membership'] == selected for m in members)
+
+    assert client.get('/api/bootstrap/admin', query_string={'date': selected}).get_json()['cached']
+    assert client.get('/api/bootstrap/signature').get_json()['data'].get('members') is None
+
+
+def test_unknown_page_is_404(client):
+    response = client.get('/api/bootstrap/nope')
+    assert response.status_code == 404
+    assert 'admin' in response.get_json()['pages']
@@ -0,0 +1,51 @@
+from card_cache import CardCache, card_path
+
+
+def _record(cards, fake, member_id):
+    fresh, fp, _ = cards.check(member_id)
+    assert not fresh
+    url = fake.storage.from_('public_id_cards').get_public_url(card_path(member_id))
+    cards.record(member_id, url, 1000, fp)
+
+
+def test_card_stays_fresh_until_a_card_field_changes(fake):
+    cards = CardCache(lambda: fake)
+    _record(cards, fake, 1)
+    assert cards.check(1)[0]
+
+    # Field na wala sa card: fresh pa rin
+    fake.from_('members').update({'email': 'new@example.com'}).eq('id', 1).execute()
+    assert not cards.invalidate_member(1, fake.storage)
+    assert cards.check(1)[0]
+
+    fake.from_('members').update({'name': 'Bagong Pangalan'}).eq('id', 1).execute()
+    assert cards.invalidate_member(1, fake.storage)
+    assert fake.rows('members')[0]['generated_card_image'] is None
+
+
+def test_status_splits_fresh_and_stale(fake):
+    cards = CardCache(lambda: fake)
+    _record(cards, fake, 2)
+    assert cards.status([2, 3]) == {'fresh': [2], 'stale': [3], 'layout_version': cards.layout_version_for()}
+
+
+def test_touch_does_not_change_updated_at(fake):
+    cards = CardCache(lambda: fake)
+    row = fake.rows('members')[0]
+    row['updated_at'] = 'before-touch'
+    cards.touch([row['id']])
+    assert row['card_last_used_at']
+    assert row['updated_at'] == 'before-touch'
+
+
+def test_eviction_removes_least_recently_used_first(fake):
+    for row in fake.rows('members'):
+        if row.get('generated_card_image'):
+            row['card_bytes'] = 100
+    with_cards = [row for row in fake.rows('members') if row.get('generated_card_image')]
+    with_cards[0]['card_last_used_at'] = '2000-01-01T00:00:00+00:00'
+
+    cards = CardCache(lambda: fake, storage_budget_bytes=100 * (len(with_cards) - 1))
+    assert cards.evict_over_budget(fake.storage) == 1
+    assert with_cards[0]['generated_card_image'] is None
+    assert all(row['generated_card_image'] for row in with_cards[1:])
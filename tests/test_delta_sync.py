@@ -0,0 +1,96 @@
+import pytest
+
+import delta_sync
+from bench.fake_supabase import FakeSupabase
+
+T0 = '2026-10-01T00:00:00+00:00'
+T1 = '2026-10-01T00:00:01+00:00'
+T2 = '2026-10-01T00:00:02+00:00'
+
+
+def _db(stamps):
+    db = FakeSupabase()
+    for i, stamp in enumerate(stamps, 1):
+        db.insert_row('members', {'id': i, 'name': f"Member {i}", 'updated_at': stamp})
+    return db
+
+
+def _sync_all(db, cursor=None, limit=2):
+    seen, deleted = [], []
+    while True:
+        page = delta_sync.changes(db, 'cards', cursor, limit)
+        seen += [row['id'] for row in page['changes']]
+        deleted += page['deleted']
+        cursor = page['cursor']
+        if not page['has_more']:
+            return seen, deleted, cursor
+
+
+def test_pages_through_rows_sharing_one_timestamp():
+    # Bulk UPDATE: iisang NOW() para sa 5 rows, mas malaki sa limit
+    db = _db([T1] * 5)
+    seen, _, cursor = _sync_all(db)
+    assert seen == [1, 2, 3, 4, 5]
+    assert cursor == f"{T1}|5"
+
+
+def test_only_changes_after_cursor_are_returned():
+    db = _db([T0, T1, T1])
+    page = delta_sync.changes(db, 'cards', f"{T1}|2")
+    assert [row['id'] for row in page['changes']] == [3]
+    assert not page['reset']
+
+
+def test_tombstones_are_split_by_page_window():
+    db = _db([T0, T1, T2, T2])
+    db.insert_row('sync_tombstones', {'table_name': 'members', 'row_id': 10, 'deleted_at': T1})
+    db.insert_row('sync_tombstones', {'table_name': 'members', 'row_id': 11,
+                                      'deleted_at': '2026-10-01T00:00:03+00:00'})
+
+    first = delta_sync.changes(db, 'cards', f"{T0}|1", limit=1)
+    assert first['has_more'] and first['deleted'] == [10]
+    _, deleted, cursor = _sync_all(db, first['cursor'], limit=1)
+    # Walang doble: ang row 10 ay nasa unang window lang
+    assert deleted == [11]
+    # Ang cursor ay umusad lampas sa huling tombstone
+    assert cursor == '2026-10-01T00:00:03+00:00|0'
+    assert delta_sync.changes(db, 'cards', cursor)['deleted'] == []
+
+
+def test_expired_cursor_resets_to_full_snapshot():
+    db = _db([T0, T1])
+    page = delta_sync.changes(db, 'cards', '2000-01-01T00:00:00+00:00|1')
+    assert page['reset']
+    assert [row['id'] for row in page['changes']] == [1, 2]
+
+
+def test_bad_cursor_and_resource():
+    with pytest.raises(delta_sync.SyncError):
+        delta_sync.changes(FakeSupabase(), 'cards', 'not-a-date|1')
+    with pytest.raises(delta_sync.SyncError):
+        delta_sync.changes(FakeSupabase(), 'secrets')
+
+
+def test_sync_route_returns_deletes(client, fake):
+    cursor = client.get('/api/sync/members').get_json()['cursor']
+    fake.from_('members').delete().eq('id', 3).execute()
+    body = client.get('/api/sync/members', query_string={'since': cursor}).get_json()
+    assert body['deleted'] == [3]
+
+
+def test_bad_limit_is_a_400(client):
+    with pytest.raises(delta_sync.SyncError):
+        delta_sync.changes(FakeSupabase(), 'cards', limit='lots')
+    assert client.get('/api/sync/cards', query_string={'limit': 'lots'}).status_code == 400
+
+
+def test_members_sync_has_no_media_and_media_is_on_demand(client):
+    rows = client.get('/api/sync/members').get_json()['changes']
+    assert rows and not any(column in row for row in rows for column in ('photo_data', 'signature', 'qr_code'))
+
+    media = client.get('/api/members/media', query_string={'ids': '1,2'}).get_json()
+    assert sorted(row['id'] for row in media) == [1, 2]
+    assert all(row['photo_data'] for row in media)
+    assert client.get('/api/members/media', query_string={'ids': 'x'}).status_code == 400
+    too_many = ','.join(str(i) for i in range(delta_sync.SYNC_MEDIA_MAX_IDS + 1))
+    assert client.get('/api/members/media', query_string={'ids': too_many}).status_code == 400
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+import app as app_module
+import direct_upload
+
+SECRET = 'tests-upload-secret'
+
+
+def _bucket(fake):
+    return fake.bucket(direct_upload.UPLOAD_BUCKET)
+
+
+def test_read_ticket_rejects_tampering_and_expiry():
+    ticket = direct_upload.make_ticket(SECRET, {'k': 'photo', 'exp': int(time.time()) + 60})
+    assert direct_upload.read_ticket(SECRET, ticket)['k'] == 'photo'
+
+    with pytest.raises(direct_upload.UploadError, match='Invalid'):
+        direct_upload.read_ticket('other-secret', ticket)
+    signature = ticket.split('.')[1]
+    forged = direct_upload._b64(b'{"k":"card","exp":9999999999}')
+    with pytest.raises(direct_upload.UploadError, match='Invalid'):
+        direct_upload.read_ticket(SECRET, f"{forged}.{signature}")
+
+    expired = direct_upload.make_ticket(SECRET, {'k': 'photo', 'exp': int(time.time()) - 1})
+    with pytest.raises(direct_upload.UploadError, match='expired'):
+        direct_upload.read_ticket(SECRET, expired)
+
+
+def test_path_must_match_ticket_kind():
+    assert direct_upload.path_matches('guardian_ids/5.png', 'card', 5, 'image/png')
+    assert not direct_upload.path_matches('guardian_ids/6.png', 'card', 5, 'image/png')
+    photo = direct_upload.object_path('photo', None, 'image/jpeg')
+    assert direct_upload.path_matches(photo, 'photo', None, 'image/jpeg')
+    assert not direct_upload.path_matches(photo, 'photo', None, 'image/png')
+    assert not direct_upload.path_matches('guardian_ids/5.png', 'photo', None, 'image/png')
+
+
+def test_photo_sign_put_confirm(client, fake):
+    signed = client.post('/api/uploads/sign', json={'kind': 'photo', 'content_type': 'image/jpeg'}).get_json()
+    fake.put_object(direct_upload.UPLOAD_BUCKET, signed['path'], b'\xff\xd8jpeg', 'image/jpeg')
+    confirmed = client.post('/api/uploads/confirm', json={'ticket': signed['ticket']}).get_json()
+    assert confirmed['success']
+    assert confirmed['bytes'] == 6
+    assert confirmed['url'].endswith(signed['path'])
+
+
+def test_confirm_removes_object_with_wrong_type(client, fake):
+    signed = client.post('/api/uploads/sign', json={'kind': 'photo', 'content_type': 'image/png'}).get_json()
+    fake.put_object(direct_upload.UPLOAD_BUCKET, signed['path'], b'<html>', 'text/html')
+    response = client.post('/api/uploads/confirm', json={'ticket': signed['ticket']})
+    assert response.status_code == 400
+    assert signed['path'] not in _bucket(fake)
+
+
+def test_confirm_rejects_forged_path(client, fake):
+    ticket = direct_upload.make_ticket(SECRET, {'k': 'photo', 'p': 'guardian_ids/1.png', 'm': None,
+                                                'ct': 'image/png', 'exp': int(time.time()) + 60})
+    response = client.post('/api/uploads/confirm', json={'ticket': ticket})
+    assert response.status_code == 400
+    assert 'guardian_ids/1.png' in _bucket(fake)
+
+
+def test_routes_are_disabled_without_secret(client, monkeypatch):
+    monkeypatch.setattr(app_module, 'UPLOAD_TICKET_SECRET', None)
+    assert client.post('/api/uploads/sign', json={'kind': 'photo'}).status_code == 404
+    assert client.post('/api/uploads/confirm', json={'ticket': 'x'}).status_code == 404
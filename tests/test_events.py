@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+import admission
+import events
+import app as app_module
+
+
+def test_replay_after_last_event_id():
+    broker = events.LocalBroker(replay_size=3)
+    sent = [events.make_event('card.saved', {'member_id': i}) for i in range(4)]
+    for event in sent:
+        broker.publish(event)
+    assert broker.replay_after(sent[1]['id']) == sent[2:]
+    # Wala na sa buffer -> None (client ay magre-resync)
+    assert broker.replay_after(sent[0]['id']) is None
+
+
+def test_slow_subscriber_is_flagged_for_resync(monkeypatch):
+    monkeypatch.setattr(events, 'EVENTS_SUBSCRIBER_QUEUE', 1)
+    broker = events.LocalBroker()
+    sub = broker.subscribe()
+    broker.publish(events.make_event('a', {}))
+    broker.publish(events.make_event('b', {}))
+    assert sub.overflowed
+    sub.close()
+    assert not broker._subscribers
+
+
+@pytest.fixture
+def threaded(monkeypatch):
+    # Gaya ng ine-export ng gunicorn.conf.py (gthread, 16 threads)
+    monkeypatch.setenv('SERVER_WORKER_CLASS', 'gthread')
+    monkeypatch.setenv('SERVER_THREADS', '16')
+    monkeypatch.setenv('SERVER_TIMEOUT', '120')
+
+
+def test_events_need_a_streaming_worker(client, monkeypatch):
+    assert client.get('/api/events').status_code == 404
+    monkeypatch.setenv('SERVER_WORKER_CLASS', 'gthread')
+    monkeypatch.setenv('SERVER_THREADS', '1')
+    assert not app_module.events_enabled()
+    monkeypatch.setenv('SERVER_WORKER_CLASS', 'gevent')
+    assert app_module.events_enabled()
+    monkeypatch.setenv('EVENTS_ENABLED', '0')
+    assert not app_module.events_enabled()
+
+
+def test_stream_lifetime_stays_below_timeout(threaded, monkeypatch):
+    assert app_module.events_stream_seconds() == app_module.EVENTS_STREAM_MAX_SECONDS
+    monkeypatch.setenv('SERVER_TIMEOUT', '30')
+    assert app_module.events_stream_seconds() == 15
+
+
+def test_stream_replays_and_releases_subscription(client, threaded, monkeypatch):
+    broker = events.LocalBroker()
+    monkeypatch.setattr(events, 'broker', broker)
+    first = events.make_event('member.saved', {'member_id': 1})
+    second = events.make_event('card.saved', {'member_id': 1})
+    broker.publish(first)
+    broker.publish(second)
+
+    response = client.get('/api/events', headers={'Last-Event-ID': first['id']}, buffered=False)
+    chunks = iter(response.response)
+    assert next(chunks) == b'retry: 3000\n\n'
+    replayed = next(chunks).decode()
+    assert f"id: {second['id']}" in replayed
+    assert json.loads(replayed.split('data: ', 1)[1])['member_id'] == 1
+    assert len(broker._subscribers) == 1
+    response.close()
+    assert not broker._subscribers
+
+
+def test_streams_over_the_cap_get_503(client, threaded, monkeypatch):
+    monkeypatch.setattr(events, 'broker', events.LocalBroker())
+    monkeypatch.setattr(admission, 'ADMISSION_ENABLED', True)
+    policy = app_module.api_events._admission_policy
+    held = [client.get('/api/events', buffered=False) for _ in range(policy.concurrency)]
+    try:
+        rejected = client.get('/api/events')
+        assert rejected.status_code == 503
+        assert int(rejected.headers['Retry-After']) > 0
+    finally:
+        for response in held:
+            response.close()
+    again = client.get('/api/events', buffered=False)
+    assert again.status_code == 200
+    again.close()
@@ -0,0 +1,42 @@
+from bench.fake_supabase import FakeSupabase
+
+
+def _db():
+    db = FakeSupabase()
+    for i, (name, chapter) in enumerate([('Ana', 'Manila'), ('Ben', 'Cebu'), ('Cora', 'Manila'), ('Dan', None)], 1):
+        db.insert_row('members', {'id': i, 'name': name, 'chapter': chapter})
+    return db
+
+
+def test_filters_order_and_count():
+    db = _db()
+    response = db.from_('members').select('id, name', count='exact') \
+        .eq('chapter', 'Manila').order('name', desc=True).limit(1).execute()
+    assert response.data == [{'id': 3, 'name': 'Cora'}]
+    assert response.count == 2
+
+    rows = db.from_('members').select('id').or_('name.eq.Ben,chapter.is.null').order('id').execute().data
+    assert [row['id'] for row in rows] == [2, 4]
+
+
+def test_delete_records_tombstone_and_update_stamps_updated_at():
+    db = _db()
+    db.rows('members')[0]['updated_at'] = 'old'
+    db.from_('members').update({'name': 'Anna'}).eq('id', 1).execute()
+    assert db.rows('members')[0]['updated_at'] != 'old'
+
+    db.from_('members').delete().eq('id', 2).execute()
+    assert [row['id'] for row in db.rows('members')] == [1, 3, 4]
+    assert db.rows('sync_tombstones')[0]['row_id'] == 2
+
+
+def test_storage_round_trip():
+    db = FakeSupabase()
+    bucket = db.storage.from_('public_id_cards')
+    bucket.upload('guardian_ids/1.png', b'png-bytes', {'content-type': 'image/png'})
+    assert bucket.download('guardian_ids/1.png') == b'png-bytes'
+    assert [entry['name'] for entry in bucket.list('guardian_ids')] == ['1.png']
+    assert bucket.get_public_url('guardian_ids/1.png').endswith('/public_id_cards/guardian_ids/1.png')
+
+    bucket.remove(['guardian_ids/1.png'])
+    assert bucket.list('guardian_ids') == []
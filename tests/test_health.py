@@ -0,0 +1,42 @@
+import app as app_module
+import health
+
+
+def test_liveness_does_not_touch_supabase(client, monkeypatch):
+    monkeypatch.setattr(app_module, 'supabase', None)
+    response = client.get('/health/live')
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'healthy'
+
+
+def test_readiness_reports_each_dependency(client, monkeypatch):
+    monkeypatch.setattr(app_module.readiness, '_result', None)
+    response = client.get('/health/ready')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'ready'
+    assert set(body['checks']) == {'members_table', 'public_id_cards_bucket'}
+
+
+def test_failing_or_slow_probe_makes_service_unready():
+    def broken():
+        raise RuntimeError('connection refused')
+
+    checker = health.ReadinessChecker([
+        health.DependencyProbe('ok', lambda: None, 1000),
+        health.DependencyProbe('broken', broken, 1000),
+        health.DependencyProbe('slow', lambda: None, -1),
+    ])
+    result = checker.check()
+    assert result['status'] == 'unready'
+    assert result['checks']['ok']['ok']
+    assert result['checks']['broken']['error'] == 'connection refused'
+    assert 'above threshold' in result['checks']['slow']['error']
+
+
+def test_probes_are_cached_for_ttl():
+    calls = []
+    checker = health.ReadinessChecker([health.DependencyProbe('db', lambda: calls.append(1), 1000)], ttl=60)
+    first = checker.check()
+    assert checker.check() is first
+    assert len(calls) == 1
@@ -0,0 +1,44 @@
+import gzip
+
+import app as app_module
+
+
+def test_json_is_gzipped_when_accepted(client):
+    response = client.get('/api/members/json', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(gzip.decompress(response.data)) > len(response.data)
+
+
+def test_version_etag_answers_304_without_querying_rows(client, fake, monkeypatch):
+    first = client.get('/api/members/json')
+    etag = first.headers['ETag']
+
+    def fail():
+        raise AssertionError('members list should not be loaded for a matching ETag')
+    monkeypatch.setattr(app_module, '_all_members', fail)
+    second = client.get('/api/members/json', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.data == b''
+
+
+def test_etag_changes_after_member_write(client, fake):
+    etag = client.get('/api/members/json').headers['ETag']
+    fake.from_('members').update({'name': 'Renamed'}).eq('id', 1).execute()
+    app_module.member_cache.bump()
+    response = client.get('/api/members/json', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_no_store_routes_get_no_etag(client):
+    response = client.get('/health/live')
+    assert response.headers['Cache-Control'] == 'no-store'
+    assert 'ETag' not in response.headers
+
+
+def test_form_post_gets_no_cache_policy(client):
+    response = client.post('/add_member', data={'name': 'Posted Member'})
+    assert 'public' not in response.headers.get('Cache-Control', '')
+    assert 'ETag' not in response.headers
@@ -0,0 +1,57 @@
+import os
+import time
+
+import pytest
+
+import app as app_module
+import image_proxy
+from disk_cache import DiskCache
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache('test', str(tmp_path), max_bytes=2500, ttl=3600)
+    first = cache.put('a', 'orig', b'1' * 1000, 'png')
+    cache.put('b', 'orig', b'2' * 1000, 'png')
+    old = time.time() - 60
+    os.utime(first.path, (old, old))
+    cache.put('c', 'orig', b'3' * 1000, 'png')
+
+    assert cache.get('a', 'orig') is None
+    assert cache.get('b', 'orig') is not None
+    assert cache.get('c', 'orig') is not None
+
+
+def test_disk_cache_ttl_and_replaced_variant(tmp_path):
+    cache = DiskCache('test', str(tmp_path), max_bytes=10_000, ttl=3600)
+    old = cache.put('a', 'orig', b'old', 'png')
+    new = cache.put('a', 'orig', b'new', 'png')
+    assert not os.path.exists(old.path)
+    assert cache.get('a', 'orig').etag == new.etag
+
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get('a', 'orig') is None
+
+
+def test_keys_and_variants_are_validated():
+    with pytest.raises(image_proxy.ImageNotFound):
+        image_proxy.validate_key('../etc/passwd')
+    with pytest.raises(image_proxy.ImageNotFound):
+        image_proxy.validate_key('guardian_ids/sub/1.png')
+    assert image_proxy.variant_for(300, 'webp') == ('w320.webp', 320, 'webp')
+    assert image_proxy.variant_for() == ('orig', None, None)
+    with pytest.raises(image_proxy.ImageError):
+        image_proxy.variant_for('abc')
+
+
+def test_proxy_route_resizes_and_revalidates(client):
+    app_module.images.clear()
+    response = client.get('/img/guardian_ids/1.png', query_string={'w': 480, 'fmt': 'webp'})
+    assert response.status_code == 200
+    assert response.mimetype == 'image/webp'
+    etag = response.headers['ETag']
+
+    again = client.get('/img/guardian_ids/1.png', query_string={'w': 480, 'fmt': 'webp'},
+                       headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert client.get('/img/guardian_ids/999.png').status_code == 404
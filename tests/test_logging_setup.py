@@ -0,0 +1,36 @@
+import json
+import logging
+
+import logging_setup
+
+
+def _record(level=logging.INFO, msg='hello', **extra):
+    record = logging.makeLogRecord({'name': 'idsystem.test', 'levelno': level,
+                                    'levelname': logging.getLevelName(level), 'msg': msg})
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    line = logging_setup.JsonFormatter().format(_record(member_id=12, request_id='abc', route='/x'))
+    payload = json.loads(line)
+    assert payload['msg'] == 'hello'
+    assert payload['level'] == 'INFO'
+    assert payload['member_id'] == 12
+    assert payload['request_id'] == 'abc'
+    assert payload['route'] == '/x'
+
+
+def test_sampling_never_drops_warnings():
+    sampler = logging_setup.SamplingFilter(0.0)
+    assert sampler.filter(_record(logging.WARNING))
+    assert not sampler.filter(_record(logging.INFO))
+
+
+def test_request_id_is_echoed_or_generated(client):
+    response = client.get('/health/live', headers={'X-Request-ID': 'abc-123'})
+    assert response.headers['X-Request-ID'] == 'abc-123'
+
+    response = client.get('/health/live', headers={'X-Request-ID': 'bad id "quoted"'})
+    generated = response.headers['X-Request-ID']
+    assert len(generated) == 32 and generated.isalnum()
@@ -0,0 +1,66 @@
+import pytest
+
+import app as app_module
+import member_facets
+
+
+def _counts(summary):
+    return {item['value']: item['count'] for item in summary}
+
+
+def test_column_swap_remove_keeps_counts():
+    column = member_facets._Column()
+    for value in ['a', 'b', 'a', 'c']:
+        column.append(value)
+    column.remove(0)
+    assert [column.values[code] for code in column.codes] == ['c', 'b', 'a']
+    column.assign(1, 'a')
+    assert _counts(column.summary()) == {'a': 2, 'c': 1}
+
+
+def test_snapshot_upsert_remove_and_filter():
+    snapshot = member_facets.MemberSnapshot(lambda: None)
+    snapshot._loaded, snapshot._synced_at, snapshot.max_age = True, float('inf'), float('inf')
+    snapshot.upsert({'id': 1, 'chapter': 'Manila', 'blood_type': 'O+', 'date_of_membership': '2024-01-05'})
+    snapshot.upsert({'id': 2, 'chapter': 'Cebu', 'blood_type': 'O+', 'generated_card_image': 'x.png'})
+    snapshot.upsert({'id': 3, 'chapter': 'Manila', 'blood_type': 'A+'})
+    snapshot.upsert({'id': 3, 'chapter': 'Cebu', 'blood_type': 'A+'})
+    snapshot.remove(1)
+    snapshot.remove(99)
+
+    result = snapshot.facets(['chapter', 'card', 'month'])
+    assert result['total'] == 2
+    assert _counts(result['facets']['chapter']) == {'Cebu': 2}
+    assert _counts(result['facets']['card']) == {'generated': 1, 'missing': 1}
+    assert _counts(result['facets']['month']) == {None: 2}
+
+    filtered = snapshot.facets(['blood_type'], {'card': 'missing'})
+    assert filtered['total'] == 1
+    assert _counts(filtered['facets']['blood_type']) == {'A+': 1}
+    assert snapshot.facets(['chapter'], {'chapter': 'Davao'})['total'] == 0
+    with pytest.raises(member_facets.FacetError):
+        snapshot.facets(['photo_data'])
+
+
+def test_snapshot_syncs_incrementally(fake):
+    version = [0]
+    snapshot = member_facets.MemberSnapshot(lambda: fake, version=lambda: version[0])
+    assert snapshot.facets(['card'])['total'] == 40
+    assert _counts(snapshot.facets(['card'])['facets']['card']) == {'generated': 20, 'missing': 20}
+
+    fake.from_('members').update({'generated_card_image': 'guardian_ids/30.png'}).eq('id', 30).execute()
+    fake.from_('members').delete().eq('id', 1).execute()
+    assert not snapshot.is_stale()
+    version[0] += 1
+    result = snapshot.facets(['card'])
+    assert result['total'] == 39
+    assert _counts(result['facets']['card']) == {'generated': 20, 'missing': 19}
+
+
+def test_facets_route(client, fake, monkeypatch):
+    # Sariling snapshot: ang cursor ng global ay galing sa ibang FakeSupabase
+    monkeypatch.setattr(app_module, 'member_snapshot', member_facets.MemberSnapshot(lambda: fake))
+    body = client.get('/api/members/facets', query_string={'facets': 'card'}).get_json()
+    assert body['total'] == 40
+    assert body['total'] == sum(item['count'] for item in body['facets']['card'])
+    assert client.get('/api/members/facets', query_string={'facets': 'photo_data'}).status_code == 400
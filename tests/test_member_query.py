@@ -0,0 +1,87 @@
+import pytest
+from werkzeug.datastructures import MultiDict
+
+import member_query
+from bench.fake_supabase import FakeSupabase
+
+
+def _db():
+    db = FakeSupabase()
+    dates = ['2024-01-02', None, '2024-01-01', '2024-01-02', None, '2024-01-02', '2024-01-03']
+    for i, joined in enumerate(dates, 1):
+        db.insert_row('members', {'id': i, 'name': f"Member {i}", 'chapter': 'Manila' if i % 2 else 'Cebu',
+                                  'date_of_membership': joined, 'photo_data': 'data:...'})
+    return db
+
+
+def _all_pages(db, limit, **kwargs):
+    ids, cursor = [], None
+    while True:
+        page = member_query.query_members(db, cursor=cursor, limit=limit, **kwargs)
+        ids += [row['id'] for row in page['members']]
+        if not page['has_more']:
+            return ids
+        cursor = page['cursor']
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 10])
+def test_date_sort_pages_through_ties_and_nulls(limit):
+    # NULLS LAST, tapos by id; walang nawawala o nadodoble sa page boundaries
+    assert _all_pages(_db(), limit, sort='date', columns=('id',)) == [3, 1, 4, 6, 7, 2, 5]
+
+
+def test_filters_and_projection():
+    db = _db()
+    filters = member_query.parse_filters(MultiDict([('chapter', 'Manila'), ('date_from', '2024-01-02')]))
+    page = member_query.query_members(db, filters, columns=('id', 'name'), sort='date')
+    assert [row['id'] for row in page['members']] == [1, 7]
+    assert all(set(row) == {'id', 'name'} for row in page['members'])
+    assert _all_pages(db, 1, filters=filters, sort='date') == [1, 7]
+
+
+def test_invalid_input_is_rejected():
+    with pytest.raises(member_query.QueryError):
+        member_query.parse_columns('id,password')
+    with pytest.raises(member_query.QueryError):
+        member_query.parse_filters(MultiDict([('date_from', 'yesterday')]))
+    with pytest.raises(member_query.QueryError):
+        member_query.parse_filters(MultiDict([('card', 'maybe')]))
+    with pytest.raises(member_query.QueryError):
+        member_query.decode_cursor('not-a-cursor')
+    with pytest.raises(member_query.QueryError):
+        member_query.query_members(_db(), sort='photo_data')
+
+
+def test_cursor_round_trip():
+    cursor = member_query.encode_cursor('2024-01-02', 6)
+    assert member_query.decode_cursor(cursor) == ('2024-01-02', 6)
+    assert member_query.decode_cursor(None) == (None, None)
+
+
+def test_query_route(client, fake):
+    first = client.get('/api/members/query', query_string={'card': 'missing', 'limit': 15}).get_json()
+    assert first['has_more']
+    assert set(first['members'][0]) == set(member_query.LIST_COLUMNS)
+    second = client.get('/api/members/query',
+                        query_string={'card': 'missing', 'limit': 15, 'cursor': first['cursor']}).get_json()
+    ids = [row['id'] for row in first['members'] + second['members']]
+    assert ids == list(range(21, 41))
+    assert client.get('/api/members/query', query_string={'columns': 'nope'}).status_code == 400
+
+
+def test_empty_values_only_for_text_filters():
+    with pytest.raises(member_query.QueryError):
+        member_query.parse_filters(MultiDict([('date', '')]))
+    with pytest.raises(member_query.QueryError):
+        member_query.parse_filters(MultiDict([('generated_from', '')]))
+    assert member_query.parse_filters(MultiDict([('layout', '')])) == [('layout', [''])]
+
+
+def test_cleared_card_counts_as_missing():
+    db = _db()
+    db.rows('members')[0]['generated_card_image'] = ''
+    db.rows('members')[1]['generated_card_image'] = 'guardian_ids/2.png'
+    missing = member_query.parse_filters(MultiDict([('card', 'missing')]))
+    generated = member_query.parse_filters(MultiDict([('card', 'generated')]))
+    assert 1 in _all_pages(db, 10, filters=missing)
+    assert _all_pages(db, 10, filters=generated) == [2]
@@ -0,0 +1,38 @@
+import pytest
+
+import member_search
+from bench.fake_supabase import FakeSupabase
+
+
+def _db():
+    db = FakeSupabase()
+    for name, chapter in [('Juan Dela Cruz', 'Manila Chapter'), ('Maria Santos', 'Cebu Chapter'),
+                          ('Juana Reyes', 'Manila Chapter')]:
+        db.insert_row('members', {'name': name, 'chapter': chapter, 'photo_data': 'data:...'})
+    return db
+
+
+def test_search_is_projected_and_counted():
+    members, total = member_search.search(_db(), 'juan', 'name', columns=('id', 'name'))
+    assert total == 2
+    assert {member['name'] for member in members} == {'Juan Dela Cruz', 'Juana Reyes'}
+    assert all(set(member) == {'id', 'name'} for member in members)
+
+
+def test_search_input_is_not_a_filter_string():
+    # Dati, sinisira ng comma / parenthesis ang .or_() string
+    members, total = member_search.search(_db(), 'dela, cruz)', 'all')
+    assert total == len(members)
+
+
+def test_empty_term_and_unknown_field():
+    assert member_search.search(_db(), '   ') == ([], 0)
+    with pytest.raises(member_search.SearchError):
+        member_search.search(_db(), 'juan', 'photo_data')
+
+
+def test_autocomplete_route_adds_media(client, fake):
+    name = fake.rows('members')[0]['name']
+    results = client.get('/api/members/search', query_string={'q': name}).get_json()
+    assert results[0]['name'] == name
+    assert results[0]['photo_data']
@@ -0,0 +1,28 @@
+import metrics
+
+
+def test_metrics_endpoint_reports_routes_and_supabase_calls(client):
+    assert client.get('/api/members/json').status_code == 200
+
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'http_requests_total{method="GET",route="/api/members/json",status="200"}' in body
+    assert 'supabase_call_duration_seconds_count{service="postgrest",target="members",operation="select"}' in body
+
+
+def test_metrics_route_is_not_measured(client):
+    client.get('/metrics')
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'route="/metrics"' not in body
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = metrics.Registry()
+    latency = registry.histogram('test_latency_seconds', 'Test.', ('route',), buckets=(0.1, 1.0))
+    latency.observe(0.05, route='/x')
+    latency.observe(0.5, route='/x')
+
+    body = registry.render()
+    assert 'test_latency_seconds_bucket{route="/x",le="0.1"} 1' in body
+    assert 'test_latency_seconds_bucket{route="/x",le="1"} 2' in body
+    assert 'test_latency_seconds_bucket{route="/x",le="+Inf"} 2' in body
+    assert 'test_latency_seconds_count{route="/x"} 2' in body
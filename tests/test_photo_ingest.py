@@ -0,0 +1,55 @@
+import io
+import base64
+
+import pytest
+from PIL import Image
+
+import app as app_module
+import photo_ingest
+
+
+def _image(size, fmt='JPEG', mode='RGB'):
+    out = io.BytesIO()
+    Image.effect_noise(size, 64).convert(mode).save(out, format=fmt)
+    return out.getvalue()
+
+
+def test_ingest_crops_and_downscales_to_photo_size():
+    photo = photo_ingest.ingest(_image((2000, 1500)))
+    assert (photo.width, photo.height) == photo_ingest.PHOTO_SIZE
+    assert photo.content_type == 'image/jpeg'
+    assert Image.open(io.BytesIO(photo.data)).size == photo_ingest.PHOTO_SIZE
+
+
+def test_transparent_png_gets_white_background():
+    out = io.BytesIO()
+    Image.new('RGBA', (600, 720), (0, 0, 0, 0)).save(out, format='PNG')
+    photo = photo_ingest.ingest(out.getvalue())
+    corner = Image.open(io.BytesIO(photo.data)).getpixel((0, 0))
+    assert min(corner) > 240
+
+
+def test_garbage_is_rejected():
+    with pytest.raises(photo_ingest.PhotoError):
+        photo_ingest.ingest(b'not an image')
+    with pytest.raises(photo_ingest.PhotoError):
+        photo_ingest.ingest(b'')
+
+
+def test_photo_route_stores_binary_upload(client, fake):
+    response = client.post('/api/photos', data={'photo': (io.BytesIO(_image((1200, 1600))), 'me.jpg')},
+                           content_type='multipart/form-data')
+    body = response.get_json()
+    assert body['success']
+    path = body['url'].split('/public_id_cards/')[1]
+    assert path.startswith('member_photos/')
+    assert path in fake.bucket('public_id_cards')
+
+
+def test_large_inline_photo_fits_form_limit(client):
+    # Lumang add_member form: base64 photo bilang text field (mas malaki sa 4 MB)
+    raw = b'\x00' * (5 * 1024 * 1024)
+    data_url = 'data:image/png;base64,' + base64.b64encode(raw).decode()
+    assert len(data_url) < app_module.app.config['MAX_CONTENT_LENGTH']
+    response = client.post('/add_member', data={'name': 'Inline Photo', 'photo_data': data_url})
+    assert response.status_code != 413
@@ -0,0 +1,81 @@
+import time
+import threading
+from collections import Counter
+
+import pytest
+
+import profiling
+
+ADMIN = 'tests-admin-token'
+
+
+@pytest.fixture
+def admin(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, 'ADMIN_TOKEN', ADMIN)
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    return {'X-Admin-Token': ADMIN}
+
+
+def test_debug_routes_need_admin_token(client, admin, monkeypatch):
+    assert client.get('/debug/profiles').status_code == 401
+    assert client.get('/debug/profiles', headers={'X-Admin-Token': 'wrong'}).status_code == 401
+    assert client.get('/debug/profiles', headers={'Authorization': f"Bearer {ADMIN}"}).status_code == 200
+    monkeypatch.setattr(profiling, 'ADMIN_TOKEN', '')
+    assert client.get('/debug/profiles', headers=admin).status_code == 404
+
+
+def test_profile_token_expires_and_is_signed(admin):
+    token, _ = profiling.issue_token(60)
+    assert profiling.verify_token(token)
+    expires = token.split('.')[0]
+    assert not profiling.verify_token(f"{int(expires) + 1}.{token.split('.')[1]}")
+    assert not profiling.verify_token(profiling.issue_token(-1)[0])
+
+
+def test_header_profiles_request(client, admin):
+    token = client.post('/debug/profile/token', headers=admin).get_json()['token']
+    response = client.get('/api/members/query', headers={profiling.PROFILE_HEADER: token})
+    assert response.headers['X-Profile-Id']
+    assert 'X-Profile-Id' not in client.get('/api/members/query').headers
+
+
+def test_sampler_collects_stacks_and_writes_profile(admin):
+    done = threading.Event()
+    worker = threading.Thread(target=lambda: done.wait(2))
+    worker.start()
+    sampler = profiling.Sampler(interval=0.001)
+    sampler.start(worker.ident)
+    time.sleep(0.05)
+    samples = sampler.stop(worker.ident)
+    done.set()
+    worker.join()
+    assert samples and any('wait' in ' '.join(stack) for stack in samples)
+
+    filename = profiling._write('test-profile', samples, 0.05)
+    listed = [entry['name'] for entry in profiling.list_profiles()]
+    assert listed == [filename]
+    assert profiling.profile_path('../' + filename) is None
+
+
+def test_write_keeps_newest_profiles(admin, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_KEEP', 2)
+    monkeypatch.setattr(profiling, 'PROFILE_FORMAT', 'collapsed')
+    for stamp in ('20260101-000001', '20260101-000002', '20260101-000003'):
+        profiling._write(stamp, Counter({('main', 'leaf'): 3}), 0.01)
+    names = [entry['name'] for entry in profiling.list_profiles()]
+    assert names == ['20260101-000003.collapsed', '20260101-000002.collapsed']
+
+
+def test_tracemalloc_endpoints(client, admin):
+    assert client.get('/debug/tracemalloc/diff', headers=admin).status_code == 400
+    try:
+        assert client.post('/debug/tracemalloc/start', headers=admin).get_json()['has_baseline']
+        held = [bytes(1024) for _ in range(200)]
+        diff = client.get('/debug/tracemalloc/diff', query_string={'top': 5}, headers=admin).get_json()
+        assert len(diff['stats']) == 5
+        assert client.get('/debug/tracemalloc/diff', query_string={'key': 'bad'}, headers=admin).status_code == 400
+        del held
+    finally:
+        stopped = client.post('/debug/tracemalloc/stop', headers=admin).get_json()
+    assert not stopped['tracing']
+    assert client.get('/debug/tracemalloc/start', headers=admin).status_code == 404
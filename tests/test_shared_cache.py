@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+import app as app_module
+import shared_cache
+
+
+@pytest.fixture(params=['local', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'local':
+        return shared_cache.LocalBackend()
+    return shared_cache.SQLiteBackend(str(tmp_path / 'cache.sqlite3'))
+
+
+def test_get_or_set_caches_until_bump(backend):
+    ns = shared_cache.Namespace(backend, 'members', ttl=60)
+    calls = []
+    assert ns.get_or_set('k', lambda: calls.append(1) or {'n': 1}) == {'n': 1}
+    assert ns.get_or_set('k', lambda: calls.append(1) or {'n': 2}) == {'n': 1}
+    assert len(calls) == 1
+
+    ns.bump()
+    assert ns.get_or_set('k', lambda: {'n': 3}) == {'n': 3}
+
+
+def test_entries_expire(backend):
+    ns = shared_cache.Namespace(backend, 'members')
+    ns.set('k', 'v', ttl=0.05)
+    assert ns.get('k') == 'v'
+    time.sleep(0.1)
+    assert ns.get('k') is None
+
+
+def test_bump_deletes_old_version_keys(backend):
+    ns = shared_cache.Namespace(backend, 'members', ttl=60)
+    other = shared_cache.Namespace(backend, 'layouts', ttl=60)
+    ns.set('a', 1)
+    other.set('a', 2)
+    old_key = ns._key('a')
+    ns.bump()
+    assert backend.get(old_key) is None
+    assert other.get('a') == 2
+
+
+def test_sqlite_expired_row_is_deleted_on_read(tmp_path):
+    backend = shared_cache.SQLiteBackend(str(tmp_path / 'cache.sqlite3'))
+    backend.set('idsys:x', b'1', ttl=0.01)
+    time.sleep(0.05)
+    assert backend.get('idsys:x') is None
+    assert backend._conn().execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 0
+
+
+def test_sqlite_prune_enforces_byte_budget(tmp_path):
+    backend = shared_cache.SQLiteBackend(str(tmp_path / 'cache.sqlite3'), max_bytes=10_000)
+    for i in range(30):
+        backend.set(f"idsys:t:{i}", b'x' * 1000, ttl=60 + i)
+    backend.prune()
+    total = backend._conn().execute("SELECT SUM(length(value)) FROM cache").fetchone()[0]
+    assert total <= 9000
+    # Ang pinakamalapit nang mag-expire ang unang natanggal
+    assert backend.get('idsys:t:0') is None
+    assert backend.get('idsys:t:29') == b'x' * 1000
+
+
+def test_oversized_values_are_not_stored(monkeypatch):
+    monkeypatch.setattr(shared_cache, 'CACHE_MAX_VALUE_BYTES', 100)
+    ns = shared_cache.Namespace(shared_cache.LocalBackend(), 'members')
+    assert ns.get_or_set('big', lambda: 'x' * 500) == 'x' * 500
+    assert ns.get('big') is None
+
+
+def test_member_cache_holds_no_media(client, fake):
+    assert client.get('/api/members/json').status_code == 200
+    date = fake.rows('members')[0]['date_of_membership']
+    rows = client.get('/api/members/by-date', query_string={'date': date}).get_json()
+    assert rows and rows[0]['photo_data']
+
+    for key, (_, raw) in shared_cache.backend._data.items():
+        if key.startswith('idsys:members:'):
+            assert b'photo_data' not in raw
+
+
+def test_card_writes_do_not_invalidate_member_entries(client):
+    before = app_module.member_cache.version()
+    app_module.cards_changed()
+    assert app_module.member_cache.version() == before
+
+
+def test_version_is_cached_per_worker(monkeypatch):
+    monkeypatch.setattr(shared_cache, 'CACHE_VERSION_TTL', 0.05)
+    backend = shared_cache.LocalBackend()
+    ns = shared_cache.Namespace(backend, 'members')
+    other_worker = shared_cache.Namespace(backend, 'members')
+    reads = []
+    get = backend.get
+    backend.get = lambda key: reads.append(key) or get(key)
+
+    ns.set('k', 1)
+    ns.get('k')
+    ns.get('k')
+    assert reads.count(ns._version_key) <= 1
+
+    other_worker.version()
+    ns.bump()
+    assert ns.get('k') is None            # ang nag-bump: agad
+    assert other_worker.version() == 0    # ibang worker: hanggang CACHE_VERSION_TTL
+    time.sleep(0.06)
+    assert other_worker.version() == 1
+
+
+def test_oversize_warning_is_logged_once(monkeypatch):
+    monkeypatch.setattr(shared_cache, 'CACHE_MAX_VALUE_BYTES', 100)
+    warnings = []
+    monkeypatch.setattr(shared_cache.log, 'warning', warnings.append)
+    ns = shared_cache.Namespace(shared_cache.LocalBackend(), 'members')
+    for i in range(3):
+        ns.get_or_set(f"big:{i}", lambda: 'x' * 500)
+    assert len(warnings) == 1
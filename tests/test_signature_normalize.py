@@ -0,0 +1,33 @@
+import io
+import base64
+
+from PIL import Image
+
+import signature_normalize
+from bench import seed
+
+
+def test_signature_is_trimmed_scaled_and_palettized():
+    raw = seed.sample_signature()
+    mimetype, payload = signature_normalize.normalize_bytes(raw, height=60, levels=4, fmt='png')
+    assert mimetype == 'image/png'
+    assert len(payload) < len(raw)
+
+    img = Image.open(io.BytesIO(payload))
+    assert img.mode == 'P'
+    assert img.height == 60
+    assert img.width < 700
+
+
+def test_blank_canvas_is_kept_as_is():
+    out = io.BytesIO()
+    Image.new('RGBA', (300, 100), (0, 0, 0, 0)).save(out, format='PNG')
+    data_url = f"data:image/png;base64,{base64.b64encode(out.getvalue()).decode()}"
+    assert signature_normalize.normalize_bytes(out.getvalue()) is None
+    assert signature_normalize.normalize_data_url(data_url) == data_url
+
+
+def test_svg_output():
+    mimetype, payload = signature_normalize.normalize_bytes(seed.sample_signature(), fmt='svg')
+    assert mimetype == 'image/svg+xml'
+    assert payload.startswith(b'<svg')
@@ -0,0 +1,99 @@
+from bench.fake_supabase import FakeSupabase
+from signature_registry import SignatureRegistry, OFFICER, COMPANY
+
+
+class CountingDB:
+    """FakeSupabase na binibilang ang queries; `missing` = columns na 'wala' sa table."""
+
+    def __init__(self, db, missing=()):
+        self.db = db
+        self.missing = set(missing)
+        self.queries = []
+
+    def from_(self, table):
+        outer = self
+
+        class Query:
+            def select(self, columns, **kw):
+                outer.queries.append((table, columns))
+                wanted = {c.strip() for c in columns.split(',')}
+                if wanted & outer.missing:
+                    raise Exception(f"column {table}.{sorted(wanted & outer.missing)[0]} does not exist")
+                return outer.db.from_(table).select(columns, **kw)
+        return Query()
+
+
+def _db():
+    db = FakeSupabase()
+    db.insert_row('officer_list', {'name_officer': 'Officer 1', 'designation': 'President',
+                                   'man_signature': 'data:image/png;base64,AAAA', 'created_at': '2024-01-01'})
+    db.insert_row('signaturetable', {'name': 'Acme', 'signature': 'data:image/png;base64,BBBB'})
+    return db
+
+
+def test_index_is_projected_and_cached():
+    db = CountingDB(_db())
+    registry = SignatureRegistry(lambda: db)
+    officers = registry.officers()
+    assert officers[0]['name_officer'] == 'Officer 1'
+    assert 'man_signature' not in officers[0]
+    registry.officers()
+    assert len(db.queries) == 1
+
+
+def test_image_is_loaded_by_id_and_invalidate_bumps_generation():
+    db = CountingDB(_db())
+    registry = SignatureRegistry(lambda: db)
+    assert registry.image(OFFICER, 1) == 'data:image/png;base64,AAAA'
+    registry.image(OFFICER, 1)
+    assert db.queries == [('officer_list', 'man_signature')]
+
+    before = registry.image_url(OFFICER, 1)
+    registry.invalidate(OFFICER, 1)
+    assert registry.image_url(OFFICER, 1) != before
+    registry.image(OFFICER, 1)
+    assert len(db.queries) == 2
+
+
+def test_company_index_falls_back_to_name_column_case():
+    raw = FakeSupabase()
+    raw.insert_row('signaturetable', {'Name': 'Beta', 'signature': 'x'})
+    raw.insert_row('signaturetable', {'NAME': 'Acme', 'signature': 'y'})
+    registry = SignatureRegistry(lambda: CountingDB(raw, missing={'name'}))
+
+    rows = registry.company_signatures()
+    assert [(row['id'], row['name']) for row in rows] == [(1, 'Beta'), (2, 'Acme')]
+    assert not any('signature' in row or 'Name' in row for row in rows)
+    assert registry.find_company_signature('acme')['id'] == 2
+
+
+def test_company_image_tolerates_missing_signature_column():
+    raw = FakeSupabase()
+    raw.insert_row('signaturetable', {'name': 'Old', 'man_signature': 'data:image/png;base64,CCCC'})
+    db = CountingDB(raw, missing={'signature'})
+    assert SignatureRegistry(lambda: db).image(COMPANY, 1) == 'data:image/png;base64,CCCC'
+    assert db.queries == [('signaturetable', 'signature'), ('signaturetable', 'man_signature')]
+
+
+def test_embed_images_restores_data_urls():
+    registry = SignatureRegistry(lambda: _db())
+    layout = {'fields': [{'imgSrc': 'https://old-host.example' + registry.image_url(OFFICER, 1)},
+                         {'imgSrc': '/signature_image/officer/99?v=3'},
+                         {'text': 'keep me'}]}
+    embedded = registry.embed_images(layout)
+    assert embedded['fields'][0]['imgSrc'] == 'data:image/png;base64,AAAA'
+    assert embedded['fields'][1]['imgSrc'] == '/signature_image/officer/99?v=3'
+    assert embedded['fields'][2] == {'text': 'keep me'}
+
+
+def test_saved_layout_embeds_officer_signature(client, fake):
+    officer = client.get('/get_officers_list').get_json()[0]
+    payload = {'client_slug': 'client-sig', 'fields': [{'imgSrc': 'http://localhost' + officer['man_signature']}]}
+    assert client.post('/save_layout', json=payload).status_code == 200
+    saved = next(row for row in fake.rows('layouts') if row.get('client_slug') == 'client-sig')
+    assert saved['config_json']['fields'][0]['imgSrc'].startswith('data:image/png;base64,')
+
+
+def test_signaturetable_route_lists_names(client):
+    response = client.get('/api/signaturetable/json')
+    assert response.get_json() == [{'name': 'Signatory 2'}, {'name': 'Signatory 1'}]
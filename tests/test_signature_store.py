@@ -0,0 +1,40 @@
+import os
+import time
+
+from signature_store import SignatureStore
+
+
+def test_latest_and_delete_latest(tmp_path):
+    store = SignatureStore(str(tmp_path))
+    first = store.add(b'one')
+    second = store.add(b'two', 'image/jpeg')
+    assert store.latest()['id'] == second['id']
+    assert second['filename'].endswith('.jpg')
+
+    assert store.delete_latest()['id'] == second['id']
+    assert not os.path.exists(tmp_path / second['filename'])
+    assert store.latest()['id'] == first['id']
+
+
+def test_retention_keeps_newest(tmp_path):
+    store = SignatureStore(str(tmp_path), keep=2)
+    entries = [store.add(bytes([i])) for i in range(4)]
+    assert store.count() == 2
+    assert not os.path.exists(tmp_path / entries[0]['filename'])
+    assert store.latest()['id'] == entries[-1]['id']
+
+
+def test_compact_drops_missing_files_and_adopts_old_orphans(tmp_path):
+    store = SignatureStore(str(tmp_path))
+    gone = store.add(b'gone')
+    os.remove(tmp_path / gone['filename'])
+
+    legacy = tmp_path / 'signature_legacy.png'
+    legacy.write_bytes(b'legacy')
+    old = time.time() - 3600
+    os.utime(legacy, (old, old))
+
+    store.compact()
+    assert store.get(gone['id']) is None
+    assert store.count() == 1
+    assert store.latest()['filename'] == 'signature_legacy.png'
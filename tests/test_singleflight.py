@@ -0,0 +1,63 @@
+import time
+import threading
+
+import pytest
+
+from singleflight import Group
+
+
+def test_concurrent_callers_share_one_call():
+    group = Group('test', window=0)
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    leader = threading.Thread(target=lambda: results.append(group.do('k', slow)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(group.do('k', slow))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.1)   # hayaang makapasok sa do() ang followers habang tumatakbo pa ang leader
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ['value'] * 4
+
+
+def test_window_reuses_result_until_forget():
+    group = Group('test', window=60)
+    calls = []
+    assert group.do('k', lambda: calls.append(1) or len(calls)) == 1
+    assert group.do('k', lambda: calls.append(1) or len(calls)) == 1
+    group.forget('k')
+    assert group.do('k', lambda: calls.append(1) or len(calls)) == 2
+
+
+def test_errors_are_not_reused():
+    group = Group('test', window=60)
+
+    def boom():
+        raise RuntimeError('upstream down')
+    with pytest.raises(RuntimeError):
+        group.do('k', boom)
+    assert group.do('k', lambda: 'ok') == 'ok'
+
+
+def test_sync_after_write_is_a_fresh_read(client, fake):
+    # Walang window ang sync (kahit hindi 0 ang SINGLEFLIGHT_WINDOW_SECONDS):
+    # parehong cursor pagkatapos ng write = bagong query
+    import app as app_module
+    assert app_module.sync_flights.window == 0
+    cursor = client.get('/api/sync/cards').get_json()['cursor']
+    assert client.get('/api/sync/cards', query_string={'since': cursor}).get_json()['changes'] == []
+    fake.from_('members').update({'generated_card_image': 'guardian_ids/30.png'}).eq('id', 30).execute()
+    body = client.get('/api/sync/cards', query_string={'since': cursor}).get_json()
+    assert [row['id'] for row in body['changes']] == [30]
@@ -0,0 +1,51 @@
+import sys
+import threading
+
+import startup
+
+
+def test_lazy_proxy_builds_once_on_first_use():
+    built = []
+
+    class Client:
+        name = 'client'
+
+    proxy = startup.LazyProxy(lambda: built.append(1) or Client(), 'test_client')
+    assert not proxy.initialized
+    threads = [threading.Thread(target=lambda: proxy.name) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert proxy.initialized
+    assert built == [1]
+
+
+def test_lazy_module_imports_on_attribute_access(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'colorsys', raising=False)
+    colorsys = startup.lazy_module('colorsys')
+    assert 'colorsys' not in sys.modules
+    assert colorsys.rgb_to_hsv(1, 0, 0)[0] == 0
+    assert 'colorsys' in sys.modules
+
+
+def test_report_includes_recorded_phases():
+    with startup.timed('test_phase'):
+        pass
+    result = startup.report('test')
+    assert 'test_phase' in result['phases_ms']
+    assert result['total_ms'] > 0
+
+
+def test_app_import_does_not_create_heavy_services():
+    import app as app_module
+    # Ginagawa lang sa unang gamit (hindi sa import)
+    assert isinstance(app_module.archives, startup.LazyProxy)
+    assert isinstance(app_module.signature_store, startup.LazyProxy)
+
+
+def test_warm_app_returns_the_module_app():
+    import app as app_module
+    # Warm-up lang: parehong `app` (ginawa sa import), may 'preload' sa timing
+    assert app_module.warm_app(preload=True) is app_module.app
+    assert 'preload' in startup.report('test')['phases_ms']
@@ -0,0 +1,37 @@
+import pytest
+
+import upserts
+from bench.fake_supabase import FakeSupabase
+
+
+def test_upsert_updates_existing_row_by_unique_key():
+    db = FakeSupabase()
+    upserts.upsert(db, 'signaturetable', {'name': 'Acme', 'signature': 'old'})
+    saved = upserts.upsert(db, 'signaturetable', {'name': 'Acme', 'signature': 'new'})
+    assert saved['signature'] == 'new'
+    assert len(db.rows('signaturetable')) == 1
+
+
+def test_upsert_requires_conflict_key():
+    with pytest.raises(ValueError):
+        upserts.upsert(FakeSupabase(), 'layouts', {'config_json': {}})
+
+
+def test_save_layout_route_is_one_round_trip(client, fake):
+    calls = []
+    original = fake.rpc
+    fake.rpc = lambda fn, params=None, **kw: calls.append(fn) or original(fn, params, **kw)
+    payload = {'client_slug': 'client-9', 'front': {}}
+    assert client.post('/save_layout', json=payload).status_code == 200
+    assert client.post('/save_layout', json=dict(payload, front={'x': 1})).status_code == 200
+
+    assert calls == [upserts.SAVE_LAYOUT, upserts.SAVE_LAYOUT]
+    rows = [row for row in fake.rows('layouts') if row.get('client_slug') == 'client-9']
+    assert len(rows) == 1
+    assert rows[0]['config_json']['front'] == {'x': 1}
+
+
+def test_save_current_id_updates_latest_row(client, fake):
+    assert client.post('/save_id_to_db', json={'id_value': 'UGB-000123'}).status_code == 200
+    assert len(fake.rows('idgenerate')) == 1
+    assert fake.rows('idgenerate')[0]['idnumber'] == 'UGB-000123'
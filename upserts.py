@@ -0,0 +1,39 @@
+# ==============================
+# UPSERTS: Isang round trip para sa "select, tapos update o insert" na saves
+# ==============================
+# Dati, bawat save (layout, ID format, company signature) ay SELECT muna para
+# malaman kung may existing, saka UPDATE o INSERT: dalawang round trip, at may
+# race kapag sabay ang dalawang save (dalawang INSERT = duplicate rows).
+#
+# Ngayon:
+#   upsert()  - INSERT ... ON CONFLICT (<unique key>) DO UPDATE via PostgREST.
+#               Kailangan ang UNIQUE constraints sa supabase_setup.sql.
+#   call()    - RPC para sa saves na hindi kaya ng plain upsert (kailangan ang
+#               lumang value, o "pinakabagong row" ang tina-target).
+#
+# Parehong iisang statement = atomic sa database.
+
+# table -> unique key na ginagamit ng on_conflict (see supabase_setup.sql)
+CONFLICT_KEYS = {
+    'layouts': 'client_slug',
+    'idgenerate': 'client_slug',
+    'signaturetable': 'name',
+}
+
+# RPCs (see supabase_setup.sql)
+SAVE_LAYOUT = 'save_layout'            # (p_client_slug, p_config) -> previous config_json
+SAVE_CURRENT_ID = 'save_current_id'    # (p_idnumber) -> void
+
+
+def upsert(db, table, row, on_conflict=None):
+    """Insert o update ng `row` ayon sa unique key ng table. Returns ang saved row."""
+    on_conflict = on_conflict or CONFLICT_KEYS[table]
+    if not row.get(on_conflict):
+        raise ValueError(f"upsert into {table} requires '{on_conflict}'")
+    response = db.from_(table).upsert(row, on_conflict=on_conflict).execute()
+    return response.data[0] if response.data else None
+
+
+def call(db, fn, **params):
+    """RPC sa isang round trip. Returns ang ibinalik ng function (o None)."""
+    return db.rpc(fn, params).execute().data